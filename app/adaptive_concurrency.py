@@ -0,0 +1,261 @@
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+
+def host_load() -> Dict[str, Optional[float]]:
+    """
+    Current host CPU and memory use as fractions (0-1)
+
+    Uses psutil when it's installed, otherwise the load average and
+    /proc/meminfo; a value is None when it can't be measured here.
+    """
+    if PSUTIL_AVAILABLE:
+        return {"cpu": psutil.cpu_percent(interval=None) / 100, "memory": psutil.virtual_memory().percent / 100}
+
+    cpu = None
+    try:
+        cpu = os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        pass
+
+    memory = None
+    try:
+        info = {}
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                info[key] = int(value.split()[0])
+        memory = 1 - info["MemAvailable"] / info["MemTotal"]
+    except (OSError, KeyError, ValueError, IndexError, ZeroDivisionError):
+        pass
+
+    return {"cpu": cpu, "memory": memory}
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit for one pipeline stage (page fetches, model queries).
+
+    Work runs through call() (or inside slot()), and at most `limit` calls run
+    at once. After every `window` completed calls the limit is reviewed: it is
+    halved, never below the floor, when too many calls failed, when median
+    latency has climbed well above the best seen, or when the host is short of
+    CPU or memory. Otherwise, if calls were queueing for a slot, it grows by
+    one, never above the ceiling. Every change is printed and kept for metrics.
+    """
+
+    def __init__(self, name: str, floor: int = 1, ceiling: int = 4, initial: Optional[int] = None,
+                 window: int = 10, latency_tolerance: float = 2.0, max_error_rate: float = 0.3,
+                 cpu_limit: float = 0.85, memory_limit: float = 0.85,
+                 load_probe: Callable[[], Dict[str, Optional[float]]] = host_load):
+        """
+        Initialise the limiter
+
+        Args:
+            name (str): Stage name used in log messages
+            floor (int): Lowest concurrency the limit may drop to
+            ceiling (int): Highest concurrency the limit may grow to
+            initial (int): Starting limit, defaults to the floor
+            window (int): Completed calls between reviews of the limit
+            latency_tolerance (float): Back off when median latency exceeds the best median by this factor
+            max_error_rate (float): Back off when more than this fraction of calls failed
+            cpu_limit (float): Back off when host CPU use reaches this fraction
+            memory_limit (float): Back off when host memory use reaches this fraction
+            load_probe: Returns {"cpu": fraction, "memory": fraction}
+        """
+        self.name = name
+        self.floor = max(1, floor)
+        self.ceiling = max(self.floor, ceiling)
+        self.limit = min(self.ceiling, max(self.floor, initial or self.floor))
+        self.window = max(1, window)
+        self.latency_tolerance = latency_tolerance
+        self.max_error_rate = max_error_rate
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+        self.load_probe = load_probe
+        self.baseline: Optional[float] = None  # best median latency seen, drifting up slowly
+        self.in_flight = 0
+        self.decisions = deque(maxlen=50)
+        self._samples: List[Tuple[float, bool]] = []
+        self._saturated = False  # whether the limit was reached since the last review
+        self._generation = 0  # bumped on every change so calls started under the old limit are ignored
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None):
+        """
+        Hold one of the stage's slots, waiting for one to free up if needed
+
+        Only a call that actually has to wait marks the stage as saturated,
+        which is what lets the limit grow.
+
+        Raises:
+            TimeoutError: If no slot frees up within timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._saturated = True
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    raise TimeoutError(f"no {self.name} slot free within {timeout:.0f}s")
+                self._condition.wait(left)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+
+    def call(self, fn: Callable[[], Any], is_error: Optional[Callable[[Any], bool]] = None,
+             wait_timeout: Optional[float] = None) -> Any:
+        """
+        Run fn in a slot, recording its latency and outcome
+
+        The slot is held until fn returns or raises, so fn should give up on
+        work it abandons (e.g. by running it under CompanyBudget.run) rather
+        than hold the slot for it.
+
+        Args:
+            fn: Zero-argument callable doing the work
+            is_error: Predicate marking a returned result as a failure
+            wait_timeout (float): Longest wait for a slot, unbounded if None
+
+        Returns:
+            The result of fn
+
+        Raises:
+            TimeoutError: If no slot frees up within wait_timeout seconds
+        """
+        with self.slot(wait_timeout):
+            generation = self._generation
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception:
+                self.record(time.monotonic() - started, False, generation)
+                raise
+        self.record(time.monotonic() - started, not (is_error and is_error(result)), generation)
+        return result
+
+    def record(self, latency: float, ok: bool, generation: Optional[int] = None) -> None:
+        """Add one completed call, reviewing the limit once a window is full"""
+        with self._condition:
+            if generation is not None and generation != self._generation:
+                return  # started before the last change, so it says little about the new limit
+            self._samples.append((latency, ok))
+            if len(self._samples) < self.window:
+                return
+            samples, self._samples = self._samples, []
+            saturated, self._saturated = self._saturated, False
+            old = self.limit
+            new, reason = self._decide(samples, saturated)
+            if new != old:
+                self.limit = new
+                self._generation += 1
+                self.decisions.append({
+                    "time": datetime.now().isoformat(timespec="seconds"),
+                    "from": old,
+                    "to": new,
+                    "reason": reason
+                })
+            self._condition.notify_all()
+
+        if new != old:
+            print(f"Concurrency [{self.name}]: {old} -> {new} ({reason})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current limit, bounds and recent decisions"""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "floor": self.floor,
+                "ceiling": self.ceiling,
+                "in_flight": self.in_flight,
+                "baseline_latency": round(self.baseline, 2) if self.baseline is not None else None,
+                "decisions": list(self.decisions)[-10:]
+            }
+
+    def _decide(self, samples: List[Tuple[float, bool]], saturated: bool) -> Tuple[int, str]:
+        """New limit and the reason for it; the caller holds the lock"""
+        error_rate = sum(1 for _, ok in samples if not ok) / len(samples)
+        latencies = sorted(latency for latency, ok in samples if ok)
+        median = latencies[len(latencies) // 2] if latencies else None
+
+        previous_baseline = self.baseline
+        if median is not None:
+            # Let the baseline drift up a little so a permanently slower workload is re-learnt
+            self.baseline = median if self.baseline is None else min(self.baseline * 1.05, median)
+
+        load = self.load_probe() or {}
+        cpu, memory = load.get("cpu"), load.get("memory")
+
+        reason = None
+        if error_rate > self.max_error_rate:
+            reason = f"error rate {error_rate:.0%}"
+        elif cpu is not None and cpu >= self.cpu_limit:
+            reason = f"CPU at {cpu:.0%}"
+        elif memory is not None and memory >= self.memory_limit:
+            reason = f"memory at {memory:.0%}"
+        elif median is not None and previous_baseline and median > previous_baseline * self.latency_tolerance:
+            reason = f"median latency {median:.2f}s vs best {previous_baseline:.2f}s"
+
+        if reason:
+            return max(self.floor, self.limit // 2), reason
+        if saturated and self.limit < self.ceiling:
+            latency = f"median {median:.2f}s, " if median is not None else ""
+            return self.limit + 1, f"healthy: {latency}{error_rate:.0%} errors"
+        return self.limit, ""
+
+
+_shared_limiters: Dict[str, AdaptiveLimiter] = {}
+_shared_lock = threading.Lock()
+
+# Default bounds per stage: (floor, ceiling)
+STAGE_BOUNDS = {"fetch": (1, 4), "model": (1, 2)}
+
+
+def get_concurrency_limiter(stage: str, config_manager=None) -> AdaptiveLimiter:
+    """
+    Return the process-wide limiter for a stage ("fetch" or "model"), creating it from config on first use
+
+    With adaptive_concurrency disabled the limit is fixed at the stage's floor.
+    """
+    with _shared_lock:
+        if stage not in _shared_limiters:
+            get = config_manager.get if config_manager else (lambda key, default=None: default)
+            floor, ceiling = STAGE_BOUNDS.get(stage, (1, 1))
+            floor = get(f"{stage}_concurrency_min", floor)
+            ceiling = get(f"{stage}_concurrency_max", ceiling)
+            if not get("adaptive_concurrency", True):
+                ceiling = floor
+            _shared_limiters[stage] = AdaptiveLimiter(
+                stage,
+                floor=floor,
+                ceiling=ceiling,
+                window=get("concurrency_window", 10),
+                latency_tolerance=get("concurrency_latency_tolerance", 2.0),
+                max_error_rate=get("concurrency_max_error_rate", 0.3),
+                cpu_limit=get("concurrency_cpu_limit", 0.85),
+                memory_limit=get("concurrency_memory_limit", 0.85)
+            )
+        return _shared_limiters[stage]
+
+
+def concurrency_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every stage's limiter"""
+    with _shared_lock:
+        limiters = dict(_shared_limiters)
+    return {stage: limiter.snapshot() for stage, limiter in limiters.items()}
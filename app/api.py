@@ -23,6 +23,9 @@ from bulk_contact_finder import BulkContactFinder
 from contact_evaluator import ContactEvaluator
 
 from config_manager import ConfigManager
+from search_backends import get_search_cooldowns
+from singleflight import singleflight_stats
+from adaptive_concurrency import concurrency_stats
 temp_config = ConfigManager(config_path)
 
 # Get the model provider and force evaluator provider to match
@@ -60,7 +63,9 @@ def api_find_contact():
         
         response_data = {
             'text': result,
-            'urls': urls
+            'urls': urls,
+            # True when search results alone met the completeness bar, so no page scraping is needed
+            'serp_complete': contact_finder.serp_complete(query)
         }
         
         # AUTOMATIC EVALUATION - Always evaluate results
@@ -196,6 +201,50 @@ def api_bulk_search():
         print(f"Error setting up bulk search: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/api/bulk/refresh', methods=['POST'])
+def api_bulk_refresh():
+    """Refresh a previous bulk results file, re-processing only stale or changed companies"""
+    data = request.json
+    previous = data.get('previous', '')
+    ttl_days = data.get('ttlDays')
+    
+    # Bare filenames refer to the bulk results directory
+    if previous and not os.path.isabs(previous) and not os.path.exists(previous):
+        previous = os.path.join(bulk_finder.output_dir, previous)
+    if not previous or not os.path.exists(previous):
+        return jsonify({'success': False, 'error': f"Previous results file not found: {previous}"})
+    
+    request_id = str(int(time.time()))
+    progress_queues[request_id] = queue.Queue()
+    
+    def progress_callback(company_name):
+        progress_queues[request_id].put({'companyName': company_name})
+    
+    def run_refresh():
+        try:
+            filename = bulk_finder.refresh_bulk_results(
+                previous,
+                ttl_days,
+                prowler=evaluator,
+                progress_callback=progress_callback
+            )
+            progress_queues[request_id].put({'filename': os.path.basename(filename)})
+            print(f"Bulk refresh completed, file saved at: {filename}")
+        except Exception as e:
+            print(f"Error in bulk refresh thread: {str(e)}")
+            progress_queues[request_id].put({'error': str(e)})
+        progress_queues[request_id].put("DONE")
+    
+    thread = threading.Thread(target=run_refresh)
+    thread.daemon = True
+    thread.start()
+    
+    return jsonify({
+        'success': True,
+        'message': "Bulk refresh started. Connect to progress stream for updates.",
+        'requestId': request_id
+    })
+
 @app.route('/api/evaluate', methods=['POST'])
 def api_evaluate_result():
     data = request.json
@@ -299,6 +348,25 @@ def direct_download(filename):
         print(f"Error in direct_download: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Fetch-layer health: retries, per-domain circuit breakers and connection reuse"""
+    try:
+        metrics = {
+            'resilience': contact_finder.resilience.metrics(),
+            'robots': contact_finder.robots.stats(),
+            'hedging': bulk_finder.hedged_fetcher.stats(),
+            'search_cooldowns': get_search_cooldowns().snapshot(),
+            'coalescing': singleflight_stats(),
+            'negative_cache': contact_finder.negative_cache.stats(),
+            'concurrency': concurrency_stats()
+        }
+        if hasattr(contact_finder.web_scraper, 'connection_stats'):
+            metrics['connections'] = contact_finder.web_scraper.connection_stats()
+        return jsonify({'success': True, 'metrics': metrics})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/setup-models', methods=['POST'])
 def setup_models():
     try:
@@ -0,0 +1,404 @@
+import time
+import asyncio
+import threading
+import concurrent.futures
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+from content_extractors import body_to_page, classify_content, decode_body
+from resilience import get_resilience_layer
+from robots_policy import get_robots_policy
+from search_backends import SearchManager, BingBackend, DuckDuckGoBackend
+from singleflight import get_singleflight
+
+# The async engine needs httpx; the rest of the app works without it
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+class AsyncWebScraper:
+    """
+    Asyncio-based HTTP fetch engine with the same result shape as WebScraper.
+
+    A single event loop keeps hundreds of fetches in flight. Each host still
+    gets the configured politeness interval, every request has its own
+    deadline, and all in-flight work can be cancelled at once. Fetches go
+    through the same retries and per-domain circuit breakers as WebScraper.
+    """
+
+    def __init__(self, user_agent: str = "Mozilla/5.0", timeout: float = 30, delay: float = 1,
+                 max_in_flight: int = 200, per_host_connections: int = 4, http2: bool = True,
+                 max_bytes: int = 2000000, robots=None, resilience=None):
+        """
+        Initialise the engine (the httpx client is created lazily inside the running loop)
+
+        Args:
+            user_agent (str): User agent header
+            timeout (float): Default per-request deadline in seconds
+            delay (float): Minimum seconds between request starts on the same host
+            max_in_flight (int): Maximum concurrent requests across all hosts
+            per_host_connections (int): Maximum concurrent requests per host
+            http2 (bool): Negotiate HTTP/2 where available
+            max_bytes (int): Stop reading a response body after this many bytes
+            robots: RobotsPolicy to consult (defaults to the shared one)
+            resilience: ResilienceLayer for retries and breakers (defaults to the shared one)
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("The async fetch engine requires httpx (pip install \"httpx[http2,brotli]\")")
+
+        self.headers = {"User-Agent": user_agent}
+        self.timeout = timeout
+        self.delay = delay
+        self.max_in_flight = max_in_flight
+        self.per_host_connections = per_host_connections
+        self.http2 = http2
+        self.max_bytes = max_bytes
+        self.robots = robots or get_robots_policy()
+        self.resilience = resilience or get_resilience_layer()
+
+        # Connection reuse counters, only touched on the event loop
+        self._requests = 0
+        self._connections_opened = 0
+        self._http_versions: Dict[str, int] = {}
+
+        self._client = None
+        self._in_flight = None
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._tasks = set()
+
+    async def scrape_url(self, url: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fetch and parse a URL
+
+        Args:
+            url (str): URL to fetch
+            deadline (float): Seconds allowed for this request, including politeness waits
+
+        Returns:
+            dict: {"url", "title", "content"} or {"url", "error", "content": ""}
+        """
+        if not await self._robots_allowed(url):
+            print(f"Skipping URL {url}: disallowed by robots.txt")
+            return {"url": url, "error": "Disallowed by robots.txt", "content": "", "skipped": True}
+
+        try:
+            _, content_type, body, truncated = await self._fetch(
+                url, deadline, allowed=lambda content_type: classify_content(content_type, url) != "binary"
+            )
+            return body_to_page(url, body, content_type, truncated)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"Error scraping URL {url}: deadline exceeded")
+            return {"url": url, "error": "Deadline exceeded", "content": ""}
+        except Exception as e:
+            print(f"Error scraping URL {url}: {e}")
+            return {"url": url, "error": str(e), "content": ""}
+
+    async def fetch_html(self, url: str, deadline: Optional[float] = None, check_robots: bool = True):
+        """Fetch raw HTML, returning (final_url, html) or (url, "") on failure or non-HTML content"""
+        return await self._fetch_raw(url, ("html",), deadline, check_robots)
+
+    async def fetch_text(self, url: str, deadline: Optional[float] = None, check_robots: bool = True):
+        """Fetch a textual document such as a sitemap, returning (final_url, text) or (url, "") on failure or binary content"""
+        return await self._fetch_raw(url, ("html", "text"), deadline, check_robots)
+
+    async def _fetch_raw(self, url: str, kinds, deadline: Optional[float] = None, check_robots: bool = True):
+        """Fetch and decode a URL whose content is one of the given kinds (see classify_content)"""
+        if check_robots and not await self._robots_allowed(url):
+            return url, ""
+
+        try:
+            final_url, content_type, body, _ = await self._fetch(
+                url, deadline, allowed=lambda content_type: classify_content(content_type, url) in kinds
+            )
+            return final_url, decode_body(body, content_type)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error fetching URL {url}: {e}")
+            return url, ""
+
+    async def probe_url(self, url: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Cheap HEAD check with the same result shape as WebScraper.probe_url"""
+        result = {"url": url, "final_url": url, "status": None, "content_type": "", "kind": None, "ok": False}
+        if not await self._robots_allowed(url):
+            result["error"] = "Disallowed by robots.txt"
+            return result
+
+        try:
+            # Probes are cheap checks, so they respect open breakers but aren't retried
+            response = await asyncio.wait_for(
+                self.resilience.call_async(url, lambda: self._request("HEAD", url), max_attempts=1),
+                deadline or self.timeout
+            )
+            content_type = response.headers.get("Content-Type", "").lower()
+            kind = classify_content(content_type, str(response.url))
+            result.update({
+                "final_url": str(response.url),
+                "status": response.status_code,
+                "content_type": content_type,
+                "kind": kind,
+                "ok": response.status_code < 400 and kind == "html"
+            })
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result["error"] = str(e) or "Deadline exceeded"
+        return result
+
+    async def scrape_many(self, urls: List[str], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Scrape many URLs concurrently; results are in the same order as urls"""
+        tasks = [self._track(self.scrape_url(url, deadline)) for url in urls]
+        return await asyncio.gather(*tasks)
+
+    def cancel_all(self) -> int:
+        """Cancel every in-flight request and return how many were cancelled"""
+        cancelled = 0
+        for task in list(self._tasks):
+            if not task.done():
+                task.cancel()
+                cancelled += 1
+        return cancelled
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics, in the same shape as HttpClient.stats"""
+        requests_sent = self._requests
+        reused = max(0, requests_sent - self._connections_opened)
+        return {
+            "backend": "httpx-async",
+            "requests": requests_sent,
+            "connections_opened": self._connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_sent, 3) if requests_sent else 0.0,
+            "http_versions": dict(self._http_versions),
+            "in_flight": len(self._tasks)
+        }
+
+    async def aclose(self) -> None:
+        """Close the underlying client"""
+        self.cancel_all()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _track(self, coro) -> asyncio.Task:
+        """Create a task and remember it so cancel_all() can reach it"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _fetch(self, url: str, deadline: Optional[float], allowed=None):
+        """
+        Stream a URL within its deadline, reading at most max_bytes of the body
+
+        Returns (final_url, content_type, body, truncated); the body is skipped
+        when allowed(content_type) is False. Failed attempts are retried through
+        the resilience layer while the deadline allows.
+        """
+        async def read(response):
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if allowed is not None and not allowed(content_type):
+                return str(response.url), content_type, b"", False
+
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                if self.max_bytes and len(buffer) >= self.max_bytes:
+                    return str(response.url), content_type, bytes(buffer[:self.max_bytes]), True
+            return str(response.url), content_type, bytes(buffer), False
+
+        fetch = self.resilience.call_async(url, lambda: self._request("GET", url, read=read))
+        return await asyncio.wait_for(fetch, deadline or self.timeout)
+
+    async def _request(self, method: str, url: str, read=None):
+        """
+        Send a request once the global and per-host limits allow it.
+        With read, the response is streamed and read(response) is returned instead.
+        """
+        client = self._get_client()
+        host_state = await self._host_state(urlparse(url).netloc.lower())
+
+        # Politeness waits happen before taking a global slot so they don't starve other hosts
+        async with host_state["semaphore"]:
+            await self._wait_for_host(host_state)
+            async with self._in_flight:
+                self._requests += 1
+                if read is None:
+                    response = await client.request(method, url, extensions=self._trace_extensions())
+                    self._count_version(response.http_version)
+                    return response
+                async with client.stream(method, url, extensions=self._trace_extensions()) as response:
+                    self._count_version(response.http_version)
+                    return await read(response)
+
+    def _count_version(self, version: str) -> None:
+        self._http_versions[version] = self._http_versions.get(version, 0) + 1
+
+    def _trace_extensions(self) -> Dict[str, Any]:
+        """httpcore trace hook used to count newly opened connections"""
+        async def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                self._connections_opened += 1
+        return {"trace": trace}
+
+    async def _wait_for_host(self, host_state: Dict[str, Any]) -> None:
+        """Hold back until the host's politeness interval has passed"""
+        async with host_state["lock"]:
+            now = time.monotonic()
+            wait_for = host_state["next_allowed"] - now
+            if wait_for > 0:
+                await asyncio.sleep(wait_for)
+            host_state["next_allowed"] = time.monotonic() + max(self.delay, host_state["crawl_delay"] or 0)
+
+    async def _host_state(self, host: str) -> Dict[str, Any]:
+        """Create per-host state on first use, including its robots Crawl-delay"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                "semaphore": asyncio.Semaphore(self.per_host_connections),
+                "lock": asyncio.Lock(),
+                "next_allowed": 0.0,
+                "crawl_delay": None,
+                "ready": asyncio.Event()
+            }
+            self._hosts[host] = state
+            try:
+                state["crawl_delay"] = await self._robots_crawl_delay(host)
+            finally:
+                state["ready"].set()
+        else:
+            await state["ready"].wait()
+        return state
+
+    async def _robots_crawl_delay(self, host: str) -> Optional[float]:
+        """Look up the Crawl-delay a host's robots.txt asks for, if any"""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, self.robots.crawl_delay_for_host, host)
+        except Exception:
+            return None
+
+    async def _robots_allowed(self, url: str) -> bool:
+        """Ask the shared robots policy, off the event loop when robots.txt must be fetched"""
+        if self.robots.is_cached(url):
+            return self.robots.allowed(url)
+        return await asyncio.get_running_loop().run_in_executor(None, self.robots.allowed, url)
+
+    def _get_client(self):
+        """Create the client and global limiter inside the running event loop"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+            )
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        return self._client
+
+
+class AsyncWebScraperFacade:
+    """
+    Synchronous facade over AsyncWebScraper.
+
+    Runs the engine's event loop on a background thread and exposes the
+    WebScraper methods, so ContactFinder and BulkContactFinder can use the
+    async engine without being rewritten. As with WebScraper, concurrent
+    scrapes of the same URL share one request.
+    """
+
+    def __init__(self, **kwargs):
+        self.engine = AsyncWebScraper(**kwargs)
+        self.robots = self.engine.robots
+        self.resilience = self.engine.resilience
+        self.search_manager = None
+        self.headers = self.engine.headers
+        self.timeout = self.engine.timeout
+        self.delay = self.engine.delay
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-fetch-loop", daemon=True)
+        self._thread.start()
+
+    def scrape_url(self, url: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Blocking equivalent of WebScraper.scrape_url"""
+        return get_singleflight("fetch").do(("http", url), lambda: self._run(
+            self.engine.scrape_url(url, deadline),
+            cancelled={"url": url, "error": "Cancelled", "content": ""}
+        ))
+
+    def scrape_many(self, urls: List[str], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Scrape many URLs with all requests in flight on the event loop"""
+        return self._run(
+            self.engine.scrape_many(urls, deadline),
+            cancelled=[{"url": url, "error": "Cancelled", "content": ""} for url in urls]
+        )
+
+    def fetch_html(self, url: str, deadline: Optional[float] = None, check_robots: bool = True):
+        """Blocking equivalent of WebScraper.fetch_html"""
+        return self._run(self.engine.fetch_html(url, deadline, check_robots), cancelled=(url, ""))
+
+    def fetch_text(self, url: str, deadline: Optional[float] = None, check_robots: bool = True):
+        """Blocking equivalent of WebScraper.fetch_text"""
+        return self._run(self.engine.fetch_text(url, deadline, check_robots), cancelled=(url, ""))
+
+    def probe_url(self, url: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Blocking equivalent of WebScraper.probe_url"""
+        return self._run(
+            self.engine.probe_url(url, deadline),
+            cancelled={"url": url, "final_url": url, "status": None, "content_type": "", "kind": None, "ok": False}
+        )
+
+    def search(self, query: str, max_results: int = 5) -> List[str]:
+        """Find relevant URLs through the search backends, fetching result pages on the loop"""
+        if self.search_manager is None:
+            fetch = lambda url: self.fetch_html(url, check_robots=False)
+            self.search_manager = SearchManager([BingBackend(fetch), DuckDuckGoBackend(fetch)])
+        return self.search_manager.search(query, max_results)
+
+    def resilience_metrics(self) -> Dict[str, Any]:
+        """Retry counts and per-domain circuit breaker state"""
+        return self.resilience.metrics()
+
+    def robots_stats(self) -> Dict[str, Any]:
+        """robots.txt cache counters and per-host status"""
+        return self.robots.stats()
+
+    def connection_stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics for the engine's client"""
+        return self.engine.stats()
+
+    def cancel_all(self) -> int:
+        """Cancel every in-flight request on the engine's loop"""
+        future = asyncio.run_coroutine_threadsafe(self._cancel_all(), self._loop)
+        return future.result()
+
+    def close(self) -> None:
+        """Close the client and stop the background loop"""
+        try:
+            self._run(self.engine.aclose())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    async def _cancel_all(self) -> int:
+        return self.engine.cancel_all()
+
+    def _run(self, coro, cancelled=None):
+        """
+        Run a coroutine on the engine's loop, tracked so cancel_all() reaches it.
+        Returns the cancelled value if the work is cancelled before finishing.
+        """
+        async def tracked():
+            return await self.engine._track(coro)
+
+        future = asyncio.run_coroutine_threadsafe(tracked(), self._loop)
+        try:
+            return future.result()
+        except (asyncio.CancelledError, concurrent.futures.CancelledError):
+            return cancelled
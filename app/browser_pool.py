@@ -0,0 +1,88 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional
+
+
+class BrowserPool:
+    """
+    Browsers shared by the companies of a bulk job.
+
+    A company borrows a browser only for one page fetch or search page,
+    inside a slot of the adaptive fetch limiter, so no more browsers are busy
+    than the live fetch limit allows however many companies are in flight.
+    Returned browsers are kept for reuse while the pool holds fewer than the
+    current limit; the rest are closed, so the number of running browsers
+    follows the limit down as well as up.
+    """
+
+    def __init__(self, factory: Callable[[], Any], limiter):
+        """
+        Initialise the pool
+
+        Args:
+            factory: Creates a browser (a SeleniumScraper); its driver starts on first use
+            limiter (AdaptiveLimiter): Fetch limiter whose slots bound the busy browsers
+        """
+        self.factory = factory
+        self.limiter = limiter
+        self.created = 0
+        self._idle: List[Any] = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def browser(self):
+        """Borrow a browser; call it while holding a fetch slot"""
+        with self._lock:
+            browser = self._idle.pop() if self._idle else None
+            self._in_use += 1
+            if browser is None:
+                self.created += 1
+        if browser is None:
+            try:
+                browser = self.factory()
+            except BaseException:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+        try:
+            yield browser
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                keep = len(self._idle) + self._in_use < self.limiter.limit
+                if keep:
+                    self._idle.append(browser)
+            if not keep:
+                browser.close()
+
+    def fetch_page_source(self, url: str, timeout: Optional[float] = None):
+        """
+        Load a page (e.g. a search results page) in a pooled browser, within a fetch slot
+
+        Returns:
+            tuple: (final_url, page_source), or (url, "") on failure
+        """
+        def load():
+            with self.browser() as browser:
+                return browser.fetch_page_source(url)
+
+        try:
+            return self.limiter.call(load, is_error=lambda result: not result[1], wait_timeout=timeout)
+        except TimeoutError as e:
+            print(f"Not loading {url}: {e}")
+            return url, ""
+
+    def close(self) -> None:
+        """Close the idle browsers; borrowed ones are closed when they come back"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            try:
+                browser.close()
+            except Exception as e:
+                print(f"Warning: Could not close browser: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"idle": len(self._idle), "in_use": self._in_use, "created": self.created}
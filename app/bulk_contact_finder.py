@@ -1282,9 +1282,20 @@ import os
 import csv
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from contact_finder import ContactFinder
+from hedged_fetch import HedgedFetcher
+from adaptive_concurrency import get_concurrency_limiter
+from browser_pool import BrowserPool
+from bulk_processes import ProcessBulkRunner
+from company_budget import CompanyBudget, BudgetExceeded
+from serp_extractor import extract_serp_candidate, is_serp_complete, format_serp_candidate
+from domain_utils import registrable_domain, site_root
+from contact_signals import find_contact_signals, merge_contact_signals, missing_contact_fields
+from name_matching import group_duplicate_names
+from bulk_refresh import content_hash, load_previous_results, record_age_days, diff_contact_info, save_change_summary
 
 # Try importing the evaluator, but don't fail if it's not available
 try:
@@ -1309,8 +1320,52 @@ class BulkContactFinder:
             config_path (str): Path to configuration file
             output_dir (str): Directory to save search results
         """
+        self.config_path = config_path
         self.contact_finder = ContactFinder(config_path)
         
+        # Optional hedging of slow browser fetches with the HTTP tier
+        config = self.contact_finder.config_manager
+        self.hedged_fetcher = HedgedFetcher(
+            enabled=bool(config.get("hedged_fetches", False)),
+            percentile=config.get("hedge_percentile", 0.9),
+            min_delay=config.get("hedge_min_delay", 2.0),
+            default_delay=config.get("hedge_default_delay", 8.0),
+            max_workers=2 * config.get("fetch_concurrency_max", 4)  # a hedge beside every concurrent fetch
+        )
+        
+        # Fields the search results must already show before page scraping is skipped
+        self.serp_required_fields = config.get("serp_required_fields", ["phones", "address", "website"])
+        
+        # Scores search results so only the most promising pages are fetched
+        self.result_ranker = self.contact_finder.result_ranker
+        self.max_pages_per_company = config.get("max_pages_per_company", 3)
+        self.ranker_min_score = config.get("ranker_min_score", 0.3)
+        
+        # Stop fetching a company's pages once trusted pages have shown all of these
+        self.scrape_required_fields = config.get("scrape_required_fields", ["phones", "emails", "address", "website"])
+        self.early_exit_min_confidence = config.get("early_exit_min_confidence", 0.5)
+        
+        # Process cheap (cached, known-website) names before cold searches
+        self.cost_ordering = bool(config.get("cost_ordering", True))
+        
+        # Live concurrency of page fetches and model queries, tuned as the job runs.
+        # Enough companies run at once to keep both stages busy at their ceilings.
+        self.fetch_limiter = get_concurrency_limiter("fetch", config)
+        self.model_limiter = get_concurrency_limiter("model", config)
+        if self.fetch_limiter.ceiling > 1 or self.model_limiter.ceiling > 1:
+            self.max_workers = self.fetch_limiter.ceiling + self.model_limiter.ceiling
+        else:
+            self.max_workers = 1
+        
+        # Browsers are borrowed per fetch inside a fetch slot, so there are never
+        # more of them busy than the live fetch limit, however many companies run
+        self.browser_pool = BrowserPool(self._new_browser, self.fetch_limiter)
+        self.search_manager = self.contact_finder.build_search_manager(self.browser_pool)
+        
+        # With more than one, companies are spread across worker processes instead
+        self.worker_processes = config.get("bulk_worker_processes", 1)
+        self.worker_task_timeout = config.get("bulk_worker_task_timeout", 600)
+        
         # Initialize evaluator if available
         self.evaluator = None
         if EVALUATOR_AVAILABLE:
@@ -1352,224 +1407,684 @@ class BulkContactFinder:
         # Use provided evaluator or the default one
         evaluator = prowler or self.evaluator
         
-        # Prepare results storage
-        bulk_results = []
+        bulk_results = self.search_names(names, query, evaluator, progress_callback)
         
-        # Perform searches
-        for name in names:
-            try:
-                print(f"Searching for contact information for: {name} {query}")
-                
-                # Initialize selenium scraper
-                print("Initializing Selenium scraper...")
-                from selenium_scraper import SeleniumScraper
-                scraper = SeleniumScraper(headless=True)
-                
-                # Search for relevant URLs
-                search_query = f"{name} {query}"
-                urls = scraper.search(search_query)
-                print(f"Found {len(urls)} search results")
-                
-                # Look for contact pages specifically
-                contact_urls = []
-                for url in urls:
-                    # Prioritize contact-us pages
-                    if 'contact' in url.lower():
-                        contact_urls.insert(0, url)
-                    else:
-                        contact_urls.append(url)
-                
-                # Make sure we have at least some URLs
-                if not contact_urls:
-                    contact_urls = urls
-                
-                # Initialize results
-                result_text = ""
-                scraped_contents = []
-                
-                # Visit and scrape each URL (especially contact pages)
-                print("Scraping contact pages for detailed information...")
-                for url in contact_urls[:3]:  # Limit to first 3 URLs to avoid too much scraping
-                    print(f"Scraping URL: {url}")
-                    page_result = scraper.scrape_url(url)
-                    
-                    if page_result and 'content' in page_result and page_result['content']:
-                        # Add the page content to our results
-                        scraped_contents.append(f"URL: {url}\n{page_result['content']}")
-                
-                # Close the scraper when done
-                scraper.close()
-                print("Browser closed")
-                
-                # Combine all scraped content
-                if scraped_contents:
-                    result_text = "\n\n---\n\n".join(scraped_contents)
-                else:
-                    result_text = "No content could be extracted from the URLs."
-                
-                # Store the complete results
-                result_entry = {
+        # Save full results if requested
+        filename = ""
+        if save_full_results:
+            filename = self._save_bulk_results(bulk_results, query, bool(evaluator))
+        
+        return filename
+    
+    def search_names(self, names: List[str], query: str, evaluator=None, progress_callback=None) -> List[Dict[str, Any]]:
+        """
+        Run the search, scrape and extraction pipeline for each name
+        
+        Args:
+            names (List[str]): Names/businesses to search
+            query (str): User's specific search query
+            evaluator: Optional evaluator used to score each result
+            progress_callback: Optional callback function for progress reporting
+        
+        Returns:
+            list: One result entry per input name, in input order
+        """
+        # Preflight: search each group of names of the same organisation only once
+        groups = group_duplicate_names(names)
+        unique_names = [names[group[0]].strip() for group in groups]
+        if len(unique_names) < len(names):
+            print(f"Preflight: {len(names)} names reduced to {len(unique_names)} unique organisations")
+        
+        # Cheapest names first so useful rows arrive early; output keeps input order
+        order = self._order_by_cost(unique_names, query) if self.cost_ordering else range(len(unique_names))
+        
+        # Companies run side by side; the fetch and model limiters decide how many are busy at once
+        ordered_names = [unique_names[index] for index in order]
+        workers = min(self.max_workers, len(ordered_names))
+        if self.worker_processes > 1 and len(ordered_names) > 1:
+            # Separate processes, so CPU-bound parsing isn't serialised by the GIL
+            runner = ProcessBulkRunner(
+                self.config_path,
+                self.output_dir,
+                processes=self.worker_processes,
+                task_timeout=self.worker_task_timeout
+            )
+            bulk_results = runner.run(ordered_names, query, bool(evaluator), progress_callback)
+        elif workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk") as executor:
+                bulk_results = list(executor.map(
+                    lambda name: self._run_company(name, query, evaluator, progress_callback), ordered_names
+                ))
+        else:
+            bulk_results = [self._run_company(name, query, evaluator, progress_callback) for name in ordered_names]
+        self.browser_pool.close()
+        
+        total_pages_saved = sum(result.get("Pages_Saved", 0) for result in bulk_results)
+        if total_pages_saved:
+            print(f"Early exit saved {total_pages_saved} page fetch(es) across {len(unique_names)} organisation(s)")
+        
+        # Give every original row (duplicates included) its group's result
+        return self._fan_out_duplicates(bulk_results, names, groups, progress_callback)
+    
+    def enqueue_bulk(self, names: List[str], query: str, queue, evaluate: bool = True) -> str:
+        """
+        Queue a bulk job for `main.py worker` processes instead of running it here
+        
+        Duplicate names become one task and tasks are prioritised cheapest
+        first, exactly as in search_names.
+        
+        Args:
+            names (List[str]): Names/businesses to search
+            query (str): User's specific search query
+            queue (WorkQueue): Queue to add the job to
+            evaluate (bool): Whether workers should evaluate their results
+        
+        Returns:
+            str: The job id
+        """
+        groups = group_duplicate_names(names)
+        unique_names = [names[group[0]].strip() for group in groups]
+        order = self._order_by_cost(unique_names, query) if self.cost_ordering else list(range(len(unique_names)))
+        return queue.create_job(names, query, groups, order, evaluate)
+    
+    def merge_queued_results(self, queue, job_id: str) -> str:
+        """
+        Save a finished queued job in the standard CSV/JSON format
+        
+        Rows are in input order (duplicates filled in from their group) whichever
+        workers processed them, so merging the same job twice gives the same rows.
+        
+        Returns:
+            str: Filename of the saved results
+        """
+        job = queue.job(job_id)
+        if job is None:
+            raise ValueError(f"No job {job_id} in {queue.path}")
+        results = queue.results(job_id)
+        expanded = self._fan_out_duplicates(results, job["names"], job["groups"])
+        return self._save_bulk_results(expanded, job["query"], job["evaluate"])
+    
+    def _run_company(self, name: str, query: str, evaluator=None, progress_callback=None) -> Dict[str, Any]:
+        """
+        Process one company, turning any failure into an error row, then report progress
+        
+        Returns:
+            dict: The company's result entry
+        """
+        try:
+            result_entry = self._process_company(name, query, evaluator)
+        except Exception as search_err:
+            print(f"Error searching for {name}: {search_err}")
+            import traceback
+            traceback.print_exc()
+            
+            result_entry = {
+                "Name": name,
+                "Query": query,
+                "MilesAI_Response": f"Error: {str(search_err)}",
+                "Sources": [],
+                "Error": str(search_err)
+            }
+        
+        # Call the progress callback if provided (failed companies included)
+        if progress_callback and callable(progress_callback):
+            progress_callback(name)
+        
+        return result_entry
+    
+    def _process_company(self, name: str, query: str, evaluator=None) -> Dict[str, Any]:
+        """
+        Search, scrape, extract and evaluate one company
+        
+        Args:
+            name (str): Name/business to search
+            query (str): User's specific search query
+            evaluator: Optional evaluator used to score the result
+        
+        Returns:
+            dict: The company's result entry
+        """
+        print(f"Searching for contact information for: {name} {query}")
+        
+        # Wall-clock, page and model-call limits shared by every stage below
+        budget = CompanyBudget.from_config(self.contact_finder.config_manager, name)
+        
+        known_site = self.contact_finder.domain_index.resolve(name)
+        if known_site:
+            # Already know the official site, so go straight to it
+            print(f"Using known website {known_site}, skipping search")
+            urls = [known_site]
+            contact_page = self.contact_finder.contact_discovery.discover(known_site)
+            if contact_page:
+                urls.insert(0, contact_page)
+            serp_candidate = None
+            serp_complete = False
+        else:
+            # Search for relevant URLs
+            search_query = f"{name} {query}"
+            if self.contact_finder.negative_cache.check_query(search_query):
+                print(f"Search for '{search_query}' found nothing recently, not repeating it")
+                search = {"urls": [], "responses": [], "status": "ok"}
+            else:
+                search = self.search_manager.search_detailed(search_query, timeout=budget.timeout())
+                if search.get("status") == "ok" and not search["urls"]:
+                    self.contact_finder.negative_cache.record_empty_search(search_query)
+            urls = search["urls"]
+            print(f"Found {len(urls)} search results")
+            
+            if search.get("status") == "blocked":
+                # Every engine served a throttle/CAPTCHA page; don't scrape junk
+                return {
                     "Name": name,
                     "Query": query,
-                    "MilesAI_Response": result_text,  # Complete content from all pages
-                    "Sources": contact_urls
+                    "MilesAI_Response": "Error: search engines are blocking requests",
+                    "Sources": [],
+                    "Status": "blocked",
+                    "Error": "Search blocked"
                 }
+            
+            if search.get("status") == "error":
+                # No engine answered (network failure, open breakers, timeouts); retry later rather than report nothing
+                return {
+                    "Name": name,
+                    "Query": query,
+                    "MilesAI_Response": "Error: no search engine could be reached",
+                    "Sources": [],
+                    "Status": "error",
+                    "Error": "Search failed"
+                }
+            
+            # Snippets and the local panel often already carry the contact details
+            serp_candidate = extract_serp_candidate(search["responses"], name, urls)
+            serp_complete = is_serp_complete(serp_candidate, self.serp_required_fields)
+        
+        # Rank results so the official site and its contact page come first
+        contact_urls = self.result_ranker.rank(
+            urls, name, limit=self.max_pages_per_company, min_score=self.ranker_min_score
+        )
+        
+        # A similarly named business's site is only a hint: fetch its pages first if the search found them
+        hinted_site = None if known_site else self.contact_finder.domain_index.hint(name)
+        if hinted_site:
+            hinted_domain = registrable_domain(hinted_site)
+            contact_urls.sort(key=lambda url: registrable_domain(url) != hinted_domain)
+        
+        # Initialize results
+        result_text = ""
+        scraped_contents = []
+        content_hashes = {}  # url -> fingerprint of its contact content, for refresh runs
+        pages_saved = 0
+        own_site = ""  # root of a fetched page of the business's own site that had contact details
+        
+        if serp_complete:
+            print(f"Search results already show {', '.join(self.serp_required_fields)}, skipping page scraping")
+            scraped_contents.append(format_serp_candidate(serp_candidate))
+        else:
+            # Visit and scrape each URL (especially contact pages)
+            print("Scraping contact pages for detailed information...")
+            found = {"phones": [], "emails": [], "address": "", "website": ""}
+            for position, url in enumerate(contact_urls):
+                failure = self.contact_finder.negative_cache.check_url(url)
+                if failure:
+                    print(f"Skipping URL {url}: failed recently ({failure})")
+                    continue
+                
+                if not budget.take_page():
+                    print(f"Budget used up, keeping the {len(scraped_contents)} page(s) fetched so far")
+                    break
                 
-                # Use LLM-based extraction
-                contact_info = self._extract_contact_info_with_llm(name, result_text, contact_urls)
-                
-                # Store the extracted results
-                result_entry["Contact_Info"] = contact_info
-                
-                # Evaluate results if evaluator is available
-                if evaluator:
-                    try:
-                        print(f"Evaluating results for {name}...")
-                        time.sleep(1)  # Small delay to avoid overwhelming the API
-                        
-                        # Use the contact info for evaluation
-                        phones = []
-                        for phone in contact_info.get("phones", []):
-                            if isinstance(phone, dict) and "number" in phone:
-                                phones.append(phone["number"])
-                        
-                        emails = []
-                        for email in contact_info.get("emails", []):
-                            if isinstance(email, dict) and "address" in email:
-                                emails.append(email["address"])
-                        
-                        website = contact_info.get("website", "")
-                        address = contact_info.get("address", "")
-                        
-                        # Create a summary of found items for better prompt context
-                        found_items = []
-                        if phones:
-                            found_items.append(f"Phone numbers: {', '.join(phones[:3])}")
-                        if emails:
-                            found_items.append(f"Email addresses: {', '.join(emails[:3])}")
-                        if website:
-                            found_items.append(f"Website: {website}")
-                        if address:
-                            found_items.append(f"Address: {address}")
-                        
-                        found_summary = "\n".join(found_items)
-                        
-                        # Query evaluator with explicit instructions
-                        prompt = f"""Evaluate the following contact information extracted for {name}:
+                print(f"Scraping URL: {url}")
+                confidence = self.result_ranker.score(url, name)
+                page_result = self._fetch_page(url, budget)
+                
+                if page_result and 'content' in page_result and page_result['content']:
+                    # Add the page content to our results
+                    scraped_contents.append(f"URL: {url}\n{page_result['content']}")
+                    content_hashes[url] = content_hash(page_result['content'])
+                
+                # Teach the ranker whether this page was worth fetching
+                if page_result and not page_result.get('error'):
+                    signals = find_contact_signals(page_result.get('content', ''))
+                    found_contacts = bool(signals['phones'] or signals['emails'])
+                    self.result_ranker.record_outcome(url, name, found_contacts)
+                    if not found_contacts:
+                        self.contact_finder.negative_cache.record_no_contacts(url)
+                    
+                    # Only pages likely to be the business's own count towards stopping early
+                    if confidence >= self.early_exit_min_confidence:
+                        found = dict(merge_contact_signals(found, signals), website=found["website"])
+                        if found_contacts and not own_site and url not in self.result_ranker.directories:
+                            own_site = found["website"] = site_root(url)
+                elif page_result:
+                    self.contact_finder.negative_cache.record_fetch_error(url, page_result['error'])
+                
+                remaining_urls = len(contact_urls) - position - 1
+                if remaining_urls and not missing_contact_fields(found, self.scrape_required_fields):
+                    pages_saved = remaining_urls
+                    print(f"Found {', '.join(self.scrape_required_fields)} after {position + 1} result(s), skipping the other {pages_saved}")
+                    break
+        
+        # Combine all scraped content
+        if scraped_contents:
+            result_text = "\n\n---\n\n".join(scraped_contents)
+        else:
+            result_text = "No content could be extracted from the URLs."
+        
+        # Store the complete results
+        result_entry = {
+            "Name": name,
+            "Query": query,
+            "MilesAI_Response": result_text,  # Complete content from all pages
+            "Sources": contact_urls,
+            "Checked_At": datetime.now().isoformat(),
+            "Content_Hashes": content_hashes
+        }
+        
+        if serp_complete:
+            # Already structured, no need for LLM extraction
+            contact_info = {key: value for key, value in serp_candidate.items()
+                            if key not in ("sources", "verified_website")}
+        else:
+            # Use LLM-based extraction
+            contact_info = self._extract_contact_info_with_llm(name, result_text, contact_urls, budget)
+        
+        # Store the extracted results
+        result_entry["Contact_Info"] = contact_info
+        
+        # Remember where this organisation lives for future runs; only a site we
+        # fetched ourselves counts, never the model's or a directory's idea of it
+        if own_site:
+            self.contact_finder.domain_index.record(name, own_site)
+        
+        # Evaluate results if evaluator is available
+        if evaluator:
+            try:
+                print(f"Evaluating results for {name}...")
+                time.sleep(1)  # Small delay to avoid overwhelming the API
+                
+                # Use the contact info for evaluation
+                phones = []
+                for phone in contact_info.get("phones", []):
+                    if isinstance(phone, dict) and "number" in phone:
+                        phones.append(phone["number"])
+                
+                emails = []
+                for email in contact_info.get("emails", []):
+                    if isinstance(email, dict) and "address" in email:
+                        emails.append(email["address"])
+                
+                website = contact_info.get("website", "")
+                address = contact_info.get("address", "")
+                
+                # Create a summary of found items for better prompt context
+                found_items = []
+                if phones:
+                    found_items.append(f"Phone numbers: {', '.join(phones[:3])}")
+                if emails:
+                    found_items.append(f"Email addresses: {', '.join(emails[:3])}")
+                if website:
+                    found_items.append(f"Website: {website}")
+                if address:
+                    found_items.append(f"Address: {address}")
+                
+                found_summary = "\n".join(found_items)
+                
+                # Query evaluator with explicit instructions
+                prompt = f"""Evaluate the following contact information extracted for {name}:
 
-                                CONTACT INFORMATION SUMMARY:
-                                {found_summary if found_items else "No structured contact information found"}
+                        CONTACT INFORMATION SUMMARY:
+                        {found_summary if found_items else "No structured contact information found"}
 
-                                FULL EXTRACTED TEXT:
-                                {result_text[:800] if len(result_text) > 800 else result_text}
+                        FULL EXTRACTED TEXT:
+                        {result_text[:800] if len(result_text) > 800 else result_text}
 
-                                SOURCE URLS: {'; '.join(contact_urls[:3]) if contact_urls else 'No sources provided'}
+                        SOURCE URLS: {'; '.join(contact_urls[:3]) if contact_urls else 'No sources provided'}
 
-                                You must analyse the quality of this contact information and provide your assessment as a JSON object with these fields:
-                                1. overall_score: A score from 30-95 indicating the overall quality and reliability
-                                2. confidence: A score from 30-95 indicating how confident you are in this data
-                                3. completeness: A score from 30-95 indicating how complete the information is
-                                4. accuracy: A score from 30-95 indicating likely accuracy based on sources
-                                5. reasoning: Your detailed explanation for these scores
+                        You must analyse the quality of this contact information and provide your assessment as a JSON object with these fields:
+                        1. overall_score: A score from 30-95 indicating the overall quality and reliability
+                        2. confidence: A score from 30-95 indicating how confident you are in this data
+                        3. completeness: A score from 30-95 indicating how complete the information is
+                        4. accuracy: A score from 30-95 indicating likely accuracy based on sources
+                        5. reasoning: Your detailed explanation for these scores
 
-                                The reasoning field MUST contain 3-5 specific sentences about:
-                                - What contact information was found and missing
-                                - How reliable the sources appear to be
-                                - Why you assigned these specific scores
+                        The reasoning field MUST contain 3-5 specific sentences about:
+                        - What contact information was found and missing
+                        - How reliable the sources appear to be
+                        - Why you assigned these specific scores
 
-                                IMPORTANT: Use concrete examples from the data in your reasoning. DO NOT use placeholder text like "Your detailed explanation here."
+                        IMPORTANT: Use concrete examples from the data in your reasoning. DO NOT use placeholder text like "Your detailed explanation here."
 
-                                Return ONLY valid JSON format.
-                                """
-                        # Query the model directly
-                        raw_result = evaluator.evaluator.model_manager.query_model(prompt)
-                        print(f"Raw evaluation (first 200 chars): {raw_result[:200]}...")
-                        
-                        # Try to extract JSON data from the response
+                        Return ONLY valid JSON format.
+                        """
+                # Query the model directly, within what is left of the budget
+                if not budget.take_llm_call():
+                    raise BudgetExceeded("No model queries left for evaluation")
+                raw_result = self._query_model_in_slot(
+                    evaluator.evaluator.model_manager, prompt, budget, "Evaluation",
+                    timeout=self.contact_finder.model_timeout
+                )
+                print(f"Raw evaluation (first 200 chars): {raw_result[:200]}...")
+                
+                # Try to extract JSON data from the response
+                try:
+                    # First try direct JSON parsing
+                    evaluation = json.loads(raw_result)
+                except json.JSONDecodeError:
+                    # Try to extract JSON object using regex
+                    import re
+                    json_match = re.search(r'(\{[^{]*"overall_score"[^}]*\})', raw_result, re.DOTALL)
+                    if json_match:
                         try:
-                            # First try direct JSON parsing
-                            evaluation = json.loads(raw_result)
-                        except json.JSONDecodeError:
-                            # Try to extract JSON object using regex
-                            import re
-                            json_match = re.search(r'(\{[^{]*"overall_score"[^}]*\})', raw_result, re.DOTALL)
-                            if json_match:
-                                try:
-                                    json_str = json_match.group(0)
-                                    evaluation = json.loads(json_str)
-                                except:
-                                    # Generate fallback evaluation
-                                    evaluation = self._generate_evaluation(name, contact_info, contact_urls)
-                            else:
-                                # No JSON found, generate evaluation
-                                evaluation = self._generate_evaluation(name, contact_info, contact_urls)
-                        
-                        # Ensure scores are within valid range
-                        for key in ["overall_score", "confidence", "completeness", "accuracy"]:
-                            if key not in evaluation or not evaluation[key] or evaluation[key] < 20:
-                                evaluation[key] = 60  # Default fallback score
-                        
-                        # Store the evaluation
-                        result_entry["Evaluation"] = evaluation
-                        
-                        # Print reasoning for debugging
-                        print(f"Reasoning: {evaluation.get('reasoning', 'No reasoning provided')}")
-                        
-                        # Create simplified output format
-                        phones_str = ', '.join(phones) if phones else ''
-                        emails_str = ', '.join(emails) if emails else ''
-                        contact_summary = f"Phone: {phones_str}, Email: {emails_str}, Website: {website}"
-                        
-                        confidence = evaluation.get("confidence", 70) / 100
-                        result_entry["Simplified"] = f"{name}, {contact_summary}, rating: {confidence:.1f}"
-                        
-                        print(f"Evaluation scores: Overall={evaluation.get('overall_score')}, Confidence={evaluation.get('confidence')}, Completeness={evaluation.get('completeness')}, Accuracy={evaluation.get('accuracy')}")
-                    
-                    except Exception as eval_err:
-                        print(f"Error during evaluation: {eval_err}")
-                        # Generate fallback evaluation
+                            json_str = json_match.group(0)
+                            evaluation = json.loads(json_str)
+                        except:
+                            # Generate fallback evaluation
+                            evaluation = self._generate_evaluation(name, contact_info, contact_urls)
+                    else:
+                        # No JSON found, generate evaluation
                         evaluation = self._generate_evaluation(name, contact_info, contact_urls)
-                        result_entry["Evaluation"] = evaluation
-                        
-                        # Simple output format
-                        phones_str = ', '.join(phones) if phones else ''
-                        emails_str = ', '.join(emails) if emails else ''
-                        contact_summary = f"Phone: {phones_str}, Email: {emails_str}, Website: {website}"
-                        
-                        confidence = evaluation.get("confidence", 65) / 100
-                        result_entry["Simplified"] = f"{name}, {contact_summary}, rating: {confidence:.1f}"
                 
-                bulk_results.append(result_entry)
+                # Ensure scores are within valid range
+                for key in ["overall_score", "confidence", "completeness", "accuracy"]:
+                    if key not in evaluation or not evaluation[key] or evaluation[key] < 20:
+                        evaluation[key] = 60  # Default fallback score
                 
-                # Call the progress callback if provided
-                if progress_callback and callable(progress_callback):
-                    progress_callback(name)
+                # Store the evaluation
+                result_entry["Evaluation"] = evaluation
                 
-            except Exception as search_err:
-                print(f"Error searching for {name}: {search_err}")
-                import traceback
-                traceback.print_exc()
+                # Print reasoning for debugging
+                print(f"Reasoning: {evaluation.get('reasoning', 'No reasoning provided')}")
                 
-                bulk_results.append({
-                    "Name": name,
-                    "Query": query,
-                    "MilesAI_Response": f"Error: {str(search_err)}",
-                    "Sources": [],
-                    "Error": str(search_err)
-                })
+                # Create simplified output format
+                phones_str = ', '.join(phones) if phones else ''
+                emails_str = ', '.join(emails) if emails else ''
+                contact_summary = f"Phone: {phones_str}, Email: {emails_str}, Website: {website}"
                 
-                # Still call the progress callback for failed companies
-                if progress_callback and callable(progress_callback):
-                    progress_callback(name)
+                confidence = evaluation.get("confidence", 70) / 100
+                result_entry["Simplified"] = f"{name}, {contact_summary}, rating: {confidence:.1f}"
+                
+                print(f"Evaluation scores: Overall={evaluation.get('overall_score')}, Confidence={evaluation.get('confidence')}, Completeness={evaluation.get('completeness')}, Accuracy={evaluation.get('accuracy')}")
+            
+            except Exception as eval_err:
+                print(f"Error during evaluation: {eval_err}")
+                # Generate fallback evaluation
+                evaluation = self._generate_evaluation(name, contact_info, contact_urls)
+                result_entry["Evaluation"] = evaluation
+                
+                # Simple output format
+                phones_str = ', '.join(phones) if phones else ''
+                emails_str = ', '.join(emails) if emails else ''
+                contact_summary = f"Phone: {phones_str}, Email: {emails_str}, Website: {website}"
+                
+                confidence = evaluation.get("confidence", 65) / 100
+                result_entry["Simplified"] = f"{name}, {contact_summary}, rating: {confidence:.1f}"
+        
+        # Record what the company cost, and flag results cut short by the budget
+        result_entry["Budget"] = budget.summary()
+        result_entry["Pages_Saved"] = pages_saved
+        if budget.exhausted_by:
+            result_entry["Status"] = "partial"
+        
+        return result_entry
+    
+    def refresh_bulk_results(
+        self,
+        previous_path: str,
+        ttl_days: Optional[float] = None,
+        prowler = None,
+        progress_callback = None
+    ) -> str:
+        """
+        Re-run a previous bulk job, doing only the work that is needed
         
-        # Save full results if requested
-        filename = ""
-        if save_full_results:
-            filename = self._save_bulk_results(bulk_results, query, bool(evaluator))
+        Records younger than ttl_days are reused as they are. Older ones have their
+        source pages re-fetched over HTTP: if every page's contact content is
+        unchanged the record is kept, if it changed the LLM extraction is re-run on
+        the new content, and if the pages can't be checked the company goes through
+        the full search pipeline again.
         
+        Args:
+            previous_path (str): Previous results JSON (or its CSV)
+            ttl_days (float): Maximum age of a reusable record, defaults to refresh_ttl_days
+            prowler: Optional prowler evaluator
+            progress_callback: Optional callback function for progress reporting
+        
+        Returns:
+            str: Filename of the new results; a _changes.csv summary is written beside it
+        """
+        evaluator = prowler or self.evaluator
+        if ttl_days is None:
+            ttl_days = self.contact_finder.config_manager.get("refresh_ttl_days", 30)
+        
+        previous = load_previous_results(previous_path)
+        print(f"Refreshing {len(previous)} records from {previous_path} (TTL {ttl_days} days)")
+        
+        results = [None] * len(previous)
+        changes = [None] * len(previous)
+        to_search = []  # indices that need the full pipeline
+        
+        for index, record in enumerate(previous):
+            name = record.get("Name", "")
+            age = record_age_days(record)
+            change = {"Name": name, "Age_Days": round(age, 1) if age != float("inf") else ""}
+            
+            if age < ttl_days and not record.get("Error") and record.get("Status") != "partial":
+                results[index] = record
+                change["Action"] = "reused"
+            else:
+                revalidated = self._revalidate_record(record)
+                if revalidated is None:
+                    to_search.append(index)
+                    continue
+                results[index], change["Action"], change["Changed_Fields"] = revalidated
+            
+            changes[index] = change
+            if progress_callback and callable(progress_callback):
+                progress_callback(name)
+        
+        # Companies whose pages couldn't be checked are searched again from scratch
+        if to_search:
+            print(f"{len(to_search)} records need a full search")
+            by_query = {}
+            for index in to_search:
+                by_query.setdefault(previous[index].get("Query", ""), []).append(index)
+            
+            for query, indices in by_query.items():
+                names = [previous[index].get("Name", "") for index in indices]
+                searched = {result["Name"]: result for result in self.search_names(names, query, evaluator, progress_callback)}
+                for index in indices:
+                    old = previous[index]
+                    new = searched.get(old.get("Name", "").strip(), old)
+                    results[index] = new
+                    changes[index] = {
+                        "Name": old.get("Name", ""),
+                        "Action": "failed" if new.get("Error") else "reprocessed",
+                        "Changed_Fields": diff_contact_info(old.get("Contact_Info"), new.get("Contact_Info")),
+                        "Age_Days": round(record_age_days(old), 1) if record_age_days(old) != float("inf") else "",
+                        "Details": new.get("Error", "")
+                    }
+        
+        queries = sorted({record.get("Query", "") for record in previous if record.get("Query")})
+        filename = self._save_bulk_results(results, f"refresh {queries[0] if queries else ''}", bool(evaluator))
+        save_change_summary(changes, filename)
         return filename
     
-    def _extract_contact_info_with_llm(self, name, text, urls):
+    def _revalidate_record(self, record):
+        """
+        Re-fetch a stale record's source pages and compare their contact content
+        
+        Returns:
+            tuple: (record, action, changed fields), or None if a full search is needed
+        """
+        hashes = record.get("Content_Hashes") or {}
+        if not hashes or record.get("Error") or record.get("Status") == "partial":
+            return None
+        
+        pages = {}
+        for url in hashes:
+            if self.contact_finder.negative_cache.check_url(url):
+                return None
+            page = self.contact_finder.web_scraper.scrape_url(url)
+            if page.get("error") or not page.get("content"):
+                return None
+            pages[url] = page["content"]
+        
+        new_hashes = {url: content_hash(content) for url, content in pages.items()}
+        
+        # A page with no contact content at all over HTTP probably needs the browser
+        empty = content_hash("")
+        if all(value == empty for value in new_hashes.values()) and any(value != empty for value in hashes.values()):
+            return None
+        
+        refreshed = dict(record)
+        refreshed["Checked_At"] = datetime.now().isoformat()
+        refreshed["Content_Hashes"] = new_hashes
+        
+        if new_hashes == hashes:
+            return refreshed, "unchanged", []
+        
+        # Contact content changed, so extract again from the new pages
+        name = record.get("Name", "")
+        sources = record.get("Sources") or list(pages)
+        result_text = "\n\n---\n\n".join(f"URL: {url}\n{content}" for url, content in pages.items())
+        contact_info = self._extract_contact_info_with_llm(name, result_text, sources)
+        
+        refreshed["MilesAI_Response"] = result_text
+        refreshed["Contact_Info"] = contact_info
+        if "Evaluation" in record:
+            refreshed["Evaluation"] = self._generate_evaluation(name, contact_info, sources)
+        
+        return refreshed, "updated", diff_contact_info(record.get("Contact_Info"), contact_info)
+    
+    def _order_by_cost(self, names: List[str], query: str) -> List[int]:
+        """
+        Order in which to process names, cheapest first
+        
+        Names whose search recently came back empty (answered from the negative
+        cache) go first, then names with a known website (no search needed),
+        then cold searches. Input order is kept within each tier.
+        
+        Args:
+            names (list): Unique names to process
+            query (str): User's search query
+        
+        Returns:
+            list: Indices into names, in processing order
+        """
+        negative_cache = self.contact_finder.negative_cache
+        domain_index = self.contact_finder.domain_index
+        
+        def cost(index):
+            name = names[index]
+            if negative_cache.check_query(f"{name} {query}", count_hit=False):
+                return 0
+            entry, confidence = domain_index.lookup(name)
+            if entry and confidence == 1.0:
+                return 1
+            return 2
+        
+        costs = [cost(index) for index in range(len(names))]
+        order = sorted(range(len(names)), key=lambda index: (costs[index], index))
+        if order != sorted(order):
+            print(f"Processing {costs.count(0)} cached, {costs.count(1)} known-website and "
+                  f"{costs.count(2)} cold names, cheapest first")
+        return order
+    
+    def _fan_out_duplicates(self, results, names, groups, progress_callback=None):
+        """
+        Expand per-group results back to one result per input name, in input order
+        
+        Args:
+            results (list): One result per group, keyed by the group's first name
+            names (list): Original input names
+            groups (list): Index groups from group_duplicate_names
+            progress_callback: Called for each duplicate row filled in
+        
+        Returns:
+            list: Results in the order of names
+        """
+        by_name = {result["Name"]: result for result in results}
+        group_of = {index: group for group in groups for index in group}
+        expanded = []
+        
+        for index, name in enumerate(names):
+            group = group_of[index]
+            result = by_name.get(names[group[0]].strip())
+            if result is None:
+                continue
+            
+            if index == group[0]:
+                expanded.append(result)
+            else:
+                duplicate = dict(result)
+                duplicate["Name"] = name.strip()
+                duplicate["Duplicate_Of"] = result["Name"]
+                expanded.append(duplicate)
+                if progress_callback and callable(progress_callback):
+                    progress_callback(duplicate["Name"])
+        
+        return expanded
+    
+    def _new_browser(self):
+        """A browser for the pool; Chrome itself starts on first use"""
+        from selenium_scraper import SeleniumScraper
+        return SeleniumScraper(
+            headless=True,
+            resilience=self.contact_finder.resilience,
+            http_scraper=self.contact_finder.web_scraper,
+            robots=self.contact_finder.robots
+        )
+    
+    def _fetch_page(self, url: str, budget: Optional[CompanyBudget] = None) -> Dict[str, Any]:
+        """
+        Fetch one candidate page with a pooled browser. With hedging enabled, a
+        browser fetch that runs past the observed latency percentile is raced
+        against the HTTP tier; the first page with content wins and the other is
+        cancelled. The fetch waits for a slot from the adaptive fetch limiter and
+        only then borrows a browser; with a budget, neither the wait nor the fetch
+        runs past the company's time.
+        """
+        def fetch():
+            with self.browser_pool.browser() as browser:
+                attempts = [
+                    ("browser", lambda: browser.scrape_url(url), browser.cancel),
+                    ("http", lambda: self.contact_finder.web_scraper.scrape_url(url), None)
+                ]
+                return self.hedged_fetcher.fetch(attempts, budget.timeout() if budget else None)
+        
+        try:
+            label, page_result = self.fetch_limiter.call(
+                fetch,
+                is_error=lambda result: not result[1] or bool(result[1].get("error")),
+                wait_timeout=budget.timeout() if budget else None
+            )
+        except TimeoutError as e:
+            print(f"Not fetching {url}: {e}")
+            return {"error": "Time budget exhausted", "content": ""}
+        if label != "browser":
+            print(f"Hedged fetch: {label} tier answered first for {url}")
+        return page_result
+    
+    def _query_model_in_slot(self, model_manager, prompt: str, budget: CompanyBudget, stage: str,
+                             timeout: Optional[float] = None) -> str:
+        """
+        Query a model in a slot of the model limiter, within the company's budget
+        
+        The slot is waited for (no longer than the time left in the budget)
+        before the stage's own timeout starts, and it is given back as soon as
+        the budget stops waiting for the answer, so an abandoned query doesn't
+        keep other companies from the model.
+        
+        Raises:
+            BudgetExceeded: If the query didn't finish in time
+            TimeoutError: If no slot freed up in time
+        """
+        return self.model_limiter.call(
+            lambda: budget.run(lambda: model_manager.query_model(prompt), timeout=timeout, stage=stage),
+            wait_timeout=budget.timeout()
+        )
+    
+    def _extract_contact_info_with_llm(self, name, text, urls, budget=None):
         """
         Use the LLM to extract structured contact information with context
         
@@ -1577,6 +2092,8 @@ class BulkContactFinder:
             name (str): Business name
             text (str): Text to extract information from
             urls (list): Source URLs
+            budget (CompanyBudget): Optional per-company budget; without a model
+                query left (or time for one) the rule-based extraction is used
             
         Returns:
             dict: Structured contact information
@@ -1628,16 +2145,25 @@ class BulkContactFinder:
         YOUR ENTIRE RESPONSE MUST BE VALID JSON ONLY. Do not include anything else.
         """
         
+        if budget is not None and not budget.take_llm_call():
+            print(f"No model queries left for {name}, using rule-based extraction")
+            return self._process_extraction_fallback(name, text, urls)
+        budget = budget or CompanyBudget()
+        
         # Query the model via the contact_finder
         if hasattr(self.contact_finder, 'model_manager') and self.contact_finder.model_manager:
             try:
-                raw_result = self.contact_finder.model_manager.query_model(prompt)
+                raw_result = self._query_model_in_slot(
+                    self.contact_finder.model_manager, prompt, budget, "Extraction"
+                )
             except Exception as e:
                 print(f"Error querying model: {e}")
                 return self._process_extraction_fallback(name, text, urls)
         elif self.evaluator and hasattr(self.evaluator, 'evaluator') and hasattr(self.evaluator.evaluator, 'model_manager'):
             try:
-                raw_result = self.evaluator.evaluator.model_manager.query_model(prompt)
+                raw_result = self._query_model_in_slot(
+                    self.evaluator.evaluator.model_manager, prompt, budget, "Extraction"
+                )
             except Exception as e:
                 print(f"Error querying evaluator model: {e}")
                 return self._process_extraction_fallback(name, text, urls)
@@ -1776,16 +2302,7 @@ class BulkContactFinder:
         import re
         
         # Extract website from URLs if available
-        website = ""
-        if urls and len(urls) > 0:
-            for url in urls:
-                if '://' in url:
-                    parts = url.split('://')
-                    if len(parts) > 1:
-                        domain_parts = parts[1].split('/')
-                        if domain_parts:
-                            website = f"{parts[0]}://{domain_parts[0]}"
-                            break
+        website = next((site_root(url) for url in urls or [] if site_root(url)), "")
         
         # Extract email addresses
         emails = []
@@ -1902,15 +2419,7 @@ class BulkContactFinder:
             dict: Basic contact information
         """
         # Extract website from URLs
-        website = ""
-        if urls and len(urls) > 0:
-            url = urls[0]
-            if '://' in url:
-                parts = url.split('://')
-                if len(parts) > 1:
-                    domain_parts = parts[1].split('/')
-                    if domain_parts:
-                        website = f"{parts[0]}://{domain_parts[0]}"
+        website = site_root(urls[0]) if urls else ""
         
         return {
             "business_name": name,
@@ -1941,14 +2450,7 @@ class BulkContactFinder:
             
         if not contact_info.get("website") and urls and len(urls) > 0:
             # Get domain from first URL
-            url = urls[0]
-            if '://' in url:
-                parts = url.split('://')
-                if len(parts) > 1:
-                    domain = parts[1].split('/')[0]
-                    contact_info["website"] = f"{parts[0]}://{domain}"
-            else:
-                contact_info["website"] = ""
+            contact_info["website"] = site_root(urls[0])
         
         if "address" not in contact_info:
             contact_info["address"] = ""
@@ -0,0 +1,208 @@
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _worker_main(conn, config_path: str, output_dir: str, query: str, use_evaluator: bool) -> None:
+    """
+    Body of a worker process
+
+    Builds its own BulkContactFinder (browsers, parsers, model clients) and
+    processes the names the coordinator sends, one at a time, until told to stop.
+    """
+    from bulk_contact_finder import BulkContactFinder
+
+    finder = BulkContactFinder(config_path, output_dir)
+    evaluator = finder.evaluator if use_evaluator else None
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break  # coordinator has gone away
+        if message[0] == "stop":
+            break
+        _, index, name = message
+        conn.send(("result", index, finder._run_company(name, query, evaluator)))
+
+    finder.browser_pool.close()
+    conn.close()
+
+
+class _Worker:
+    """One worker process, its end of the pipe and the task it is working on"""
+
+    def __init__(self, context, slot: int, args: tuple):
+        self.slot = slot
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn,) + args, name=f"bulk-worker-{slot}", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.task: Optional[int] = None  # index of the name being processed
+        self.started = 0.0
+
+    def assign(self, index: int, name: str) -> None:
+        self.task = index
+        self.started = time.monotonic()
+        self.conn.send(("task", index, name))
+
+    def stop(self, force: bool = False) -> None:
+        """Ask the process to exit (or kill it), then release its pipe"""
+        if force:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ProcessBulkRunner:
+    """
+    Runs bulk companies across worker processes.
+
+    Parsing, regex extraction and serialisation are CPU-bound, so threads in
+    one process are serialised by the GIL. Here each worker process owns its
+    own browsers and parsing; the coordinator hands out one name at a time
+    over a pipe and gathers the result entries. A worker that crashes, or
+    takes longer than task_timeout on one company, is restarted and its name
+    reassigned (up to max_attempts times, after which the name gets an error row).
+    """
+
+    def __init__(self, config_path: str, output_dir: str, processes: int = 2,
+                 task_timeout: float = 600, max_attempts: int = 2, max_restarts: int = 10):
+        """
+        Initialise the runner
+
+        Args:
+            config_path (str): Config file each worker loads
+            output_dir (str): Results directory each worker's BulkContactFinder uses
+            processes (int): Number of worker processes
+            task_timeout (float): Seconds one company may take before its worker is killed
+            max_attempts (int): Times a name is tried before it is given up on
+            max_restarts (int): Worker restarts allowed before the remaining names are failed
+        """
+        self.config_path = config_path
+        self.output_dir = output_dir
+        self.processes = max(1, processes)
+        self.task_timeout = task_timeout
+        self.max_attempts = max(1, max_attempts)
+        self.max_restarts = max_restarts
+        # spawn, so workers don't inherit the coordinator's threads and browser handles
+        self._context = multiprocessing.get_context("spawn")
+
+    def run(self, names: List[str], query: str, use_evaluator: bool = False,
+            progress_callback: Optional[Callable[[str], Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Process names across the worker processes
+
+        Args:
+            names (list): Names to process, in the order they should be handed out
+            query (str): User's search query
+            use_evaluator (bool): Whether workers evaluate their results
+            progress_callback: Called with each name as its result arrives
+
+        Returns:
+            list: One result entry per name, in the order of names
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(names)
+        attempts = [0] * len(names)
+        pending = deque(range(len(names)))
+        remaining = len(names)
+        restarts = 0
+        args = (self.config_path, self.output_dir, query, use_evaluator)
+
+        def finish(index: int, entry: Dict[str, Any]) -> None:
+            nonlocal remaining
+            results[index] = entry
+            remaining -= 1
+            if progress_callback and callable(progress_callback):
+                progress_callback(names[index])
+
+        def fail(index: int, reason: str) -> None:
+            print(f"Giving up on {names[index]}: {reason}")
+            finish(index, {
+                "Name": names[index],
+                "Query": query,
+                "MilesAI_Response": f"Error: {reason}",
+                "Sources": [],
+                "Error": reason
+            })
+
+        print(f"Starting {min(self.processes, len(names))} worker processes")
+        workers: List[Optional[_Worker]] = [
+            _Worker(self._context, slot, args) for slot in range(min(self.processes, len(names)))
+        ]
+
+        try:
+            while remaining:
+                live = [worker for worker in workers if worker is not None]
+                for worker in live:
+                    if worker.task is None and pending:
+                        index = pending.popleft()
+                        attempts[index] += 1
+                        worker.assign(index, names[index])
+
+                ready = wait([worker.conn for worker in live] + [worker.process.sentinel for worker in live],
+                             timeout=1.0)
+
+                for position, worker in enumerate(workers):
+                    if worker is None:
+                        continue
+                    # Results first: a worker may send its last result and then exit
+                    crashed = None
+                    try:
+                        while worker.conn.poll():
+                            _, index, entry = worker.conn.recv()
+                            worker.task = None
+                            finish(index, entry)
+                    except (EOFError, OSError):
+                        crashed = "worker process exited"
+
+                    if crashed is None and worker.process.sentinel in ready:
+                        worker.process.join(timeout=1)
+                        crashed = f"worker process exited with code {worker.process.exitcode}"
+                    if crashed is None and worker.task is not None \
+                            and time.monotonic() - worker.started > self.task_timeout:
+                        crashed = f"no result after {self.task_timeout:.0f}s"
+                    if crashed is None:
+                        continue
+
+                    print(f"Worker {worker.slot} failed ({crashed})")
+                    if worker.task is not None:
+                        index = worker.task
+                        if attempts[index] < self.max_attempts:
+                            print(f"Reassigning {names[index]}")
+                            pending.appendleft(index)
+                        else:
+                            fail(index, f"Worker failed on every attempt ({crashed})")
+                    worker.stop(force=True)
+                    workers[position] = None
+                    if not pending:
+                        continue  # nothing left for a replacement to do
+
+                    restarts += 1
+                    if restarts > self.max_restarts:
+                        raise RuntimeError(f"{restarts} worker restarts")
+                    workers[position] = _Worker(self._context, worker.slot, args)
+        except RuntimeError as e:
+            print(f"Stopping worker processes: {e}")
+            for index, entry in enumerate(results):
+                if entry is None:
+                    fail(index, f"Too many worker crashes ({e})")
+        finally:
+            for worker in workers:
+                if worker is not None:
+                    worker.stop(force=worker.task is not None)
+
+        print(f"Worker processes finished {len(names)} names with {restarts} restart(s)")
+        return results
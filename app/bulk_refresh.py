@@ -0,0 +1,99 @@
+import os
+import csv
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from contact_signals import find_contact_signals
+
+# Contact fields compared when summarising what changed between runs
+COMPARED_FIELDS = ("phones", "emails", "website", "address")
+
+
+def content_hash(content: str) -> str:
+    """
+    Fingerprint of the contact-relevant part of a page
+
+    Only the phones, emails and address found on the page are hashed, so the
+    fingerprint is stable across fetch tiers (browser vs HTTP) and unaffected by
+    rotating markup such as timestamps or tracking tokens.
+    """
+    signals = find_contact_signals(content or "")
+    material = json.dumps({
+        "phones": sorted(signals["phones"]),
+        "emails": sorted(email.lower() for email in signals["emails"]),
+        "address": signals["address"].lower()
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def load_previous_results(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a previous bulk results JSON file
+
+    A CSV path is accepted too, as long as its .json companion exists.
+    Records from files written before Checked_At was recorded get the file's
+    modification time instead.
+    """
+    json_path = os.path.splitext(path)[0] + ".json" if path.lower().endswith(".csv") else path
+    with open(json_path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        raise ValueError(f"{json_path} is not a bulk results file")
+
+    file_time = datetime.fromtimestamp(os.path.getmtime(json_path)).isoformat()
+    for record in records:
+        record.setdefault("Checked_At", file_time)
+    return records
+
+
+def record_age_days(record: Dict[str, Any], now: Optional[datetime] = None) -> float:
+    """Days since the record was last checked"""
+    try:
+        checked = datetime.fromisoformat(record.get("Checked_At", ""))
+    except ValueError:
+        return float("inf")
+    return ((now or datetime.now()) - checked).total_seconds() / 86400
+
+
+def diff_contact_info(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Names of the contact fields whose values differ between two records"""
+    def values(info, field):
+        value = (info or {}).get(field)
+        if isinstance(value, list):
+            items = set()
+            for item in value:
+                if isinstance(item, dict):
+                    item = item.get("number") or item.get("address") or ""
+                items.add(str(item).strip().lower())
+            return items
+        return str(value or "").strip().lower().rstrip("/")
+
+    return [field for field in COMPARED_FIELDS if values(old, field) != values(new, field)]
+
+
+def save_change_summary(changes: List[Dict[str, Any]], results_path: str) -> str:
+    """
+    Write the per-row change summary next to the new results file
+
+    Returns:
+        str: Path of the summary CSV
+    """
+    summary_path = os.path.splitext(results_path)[0] + "_changes.csv"
+    with open(summary_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Action", "Changed_Fields", "Age_Days", "Details"])
+        for change in changes:
+            writer.writerow([
+                change["Name"],
+                change["Action"],
+                ", ".join(change.get("Changed_Fields", [])),
+                change.get("Age_Days", ""),
+                change.get("Details", "")
+            ])
+
+    counts: Dict[str, int] = {}
+    for change in changes:
+        counts[change["Action"]] = counts.get(change["Action"], 0) + 1
+    print(f"Change summary saved to {summary_path}: " + ", ".join(f"{n} {a}" for a, n in sorted(counts.items())))
+    return summary_path
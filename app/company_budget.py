@@ -0,0 +1,175 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+
+class BudgetExceeded(Exception):
+    """Raised when a stage can't run, or didn't finish, within a company's budget"""
+
+
+class CompanyBudget:
+    """
+    Limits on the work spent on one company: a wall-clock deadline, a number
+    of page fetches and a number of LLM calls.
+
+    One budget is created per company and handed to every stage (search,
+    page fetches, extraction, evaluation). Each stage shrinks its own timeout
+    to the time left and, once the budget runs out, returns the best partial
+    result it has instead of starting more work. A limit of None (or 0) means
+    unlimited.
+    """
+
+    def __init__(self, deadline_seconds: Optional[float] = None, max_pages: Optional[int] = None,
+                 max_llm_calls: Optional[int] = None, label: str = ""):
+        """
+        Initialise the budget; the clock starts now
+
+        Args:
+            deadline_seconds (float): Wall-clock seconds allowed for the company
+            max_pages (int): Page fetches allowed
+            max_llm_calls (int): Model queries allowed (extraction and evaluation)
+            label (str): Company name, used in log messages
+        """
+        self.deadline_seconds = deadline_seconds or None
+        self.max_pages = max_pages or None
+        self.max_llm_calls = max_llm_calls or None
+        self.label = label
+        self.started = time.monotonic()
+        self.pages_used = 0
+        self.llm_calls = 0
+        self.exhausted_by: Optional[str] = None  # first limit that was hit
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_manager, label: str = "", interactive: bool = False) -> "CompanyBudget":
+        """
+        Budget with the limits configured for one company
+
+        Args:
+            config_manager: Configuration to read the limits from
+            label (str): Company name, used in log messages
+            interactive (bool): A single-company lookup the user is waiting on; it has no
+                wall-clock deadline unless interactive_deadline_seconds is set
+        """
+        if interactive:
+            deadline_seconds = config_manager.get("interactive_deadline_seconds", 0)
+        else:
+            deadline_seconds = config_manager.get("company_deadline_seconds", 180)
+        return cls(
+            deadline_seconds=deadline_seconds,
+            max_pages=config_manager.get("company_max_pages", 8),
+            max_llm_calls=config_manager.get("company_max_llm_calls", 2),
+            label=label
+        )
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (infinite without one)"""
+        if self.deadline_seconds is None:
+            return float("inf")
+        return max(0.0, self.deadline_seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        """True once the deadline has passed"""
+        if self.remaining() > 0:
+            return False
+        self._exhaust("deadline")
+        return True
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """
+        A stage's timeout shrunk to the time left
+
+        Args:
+            default (float): The stage's usual timeout, or None for no timeout
+
+        Returns:
+            float: min(default, time left), or None when neither limits the stage
+        """
+        remaining = self.remaining()
+        if remaining == float("inf"):
+            return default
+        return remaining if default is None else min(default, remaining)
+
+    def take_page(self) -> bool:
+        """Reserve one page fetch; False if the page or time budget is used up"""
+        if self.expired():
+            return False
+        with self._lock:
+            if self.max_pages is not None and self.pages_used >= self.max_pages:
+                limit_hit = True
+            else:
+                self.pages_used += 1
+                limit_hit = False
+        if limit_hit:
+            self._exhaust("pages")
+        return not limit_hit
+
+    def take_llm_call(self) -> bool:
+        """Reserve one model query; False if the LLM call or time budget is used up"""
+        if self.expired():
+            return False
+        with self._lock:
+            if self.max_llm_calls is not None and self.llm_calls >= self.max_llm_calls:
+                limit_hit = True
+            else:
+                self.llm_calls += 1
+                limit_hit = False
+        if limit_hit:
+            self._exhaust("llm_calls")
+        return not limit_hit
+
+    def run(self, fn: Callable[[], Any], timeout: Optional[float] = None, stage: str = "stage") -> Any:
+        """
+        Call fn, giving up when the stage timeout or the deadline is reached
+
+        A call that overruns keeps going in a background thread, but the
+        caller stops waiting for it.
+
+        Args:
+            fn: Zero-argument callable doing the work
+            timeout (float): The stage's usual timeout, shrunk to the time left
+            stage (str): Stage name for the error message
+
+        Returns:
+            The result of fn
+
+        Raises:
+            BudgetExceeded: If no time is left or fn didn't finish in time
+        """
+        limit = self.timeout(timeout)
+        if limit is None:
+            return fn()
+        if limit <= 0:
+            self._exhaust("deadline")
+            raise BudgetExceeded(f"No time left for {stage}")
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="budget")
+        future = executor.submit(fn)
+        try:
+            return future.result(timeout=limit)
+        except FuturesTimeoutError:
+            if self.remaining() <= 0:
+                self._exhaust("deadline")
+            raise BudgetExceeded(f"{stage} did not finish within {limit:.0f}s")
+        finally:
+            executor.shutdown(wait=False)
+
+    def summary(self) -> Dict[str, Any]:
+        """What the company used, and which limit (if any) cut it short"""
+        return {
+            "elapsed_seconds": round(self.elapsed(), 1),
+            "pages": self.pages_used,
+            "llm_calls": self.llm_calls,
+            "exhausted": self.exhausted_by or ""
+        }
+
+    def _exhaust(self, reason: str) -> None:
+        with self._lock:
+            if self.exhausted_by is not None:
+                return
+            self.exhausted_by = reason
+        print(f"Budget exhausted for {self.label or 'company'} ({reason}) after {self.elapsed():.1f}s")
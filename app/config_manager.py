@@ -33,7 +33,49 @@ class ConfigManager:
             "request_delay": 1.0,
             "max_search_results": 5,
             "max_depth": 2,
+            "max_pages_per_site": 8,
+            "retry_attempts": 3,
+            "breaker_failure_threshold": 3,
+            "breaker_reset_timeout": 300,
+            "max_response_bytes": 2000000,
+            "respect_robots": True,
+            "robots_cache_ttl": 86400,
+            "robots_negative_ttl": 3600,
+            "hedged_fetches": False,
+            "hedge_percentile": 0.9,
             "search_engine": "https://www.google.com/search?q=",
+            "search_backends": ["google", "bing", "duckduckgo"],
+            "search_mode": "sequential",
+            "search_cooldown_base": 60,
+            "search_block_max_wait": 300,
+            "serp_required_fields": ["phones", "address", "website"],
+            "max_pages_per_company": 3,
+            "ranker_min_score": 0.3,
+            "scrape_required_fields": ["phones", "emails", "address", "website"],
+            "early_exit_min_confidence": 0.5,
+            "domain_index_min_confidence": 0.9,
+            "cost_ordering": True,
+            "adaptive_concurrency": True,
+            "fetch_concurrency_min": 1,
+            "fetch_concurrency_max": 4,
+            "model_concurrency_min": 1,
+            "model_concurrency_max": 2,
+            "concurrency_window": 10,
+            "concurrency_latency_tolerance": 2.0,
+            "concurrency_max_error_rate": 0.3,
+            "concurrency_cpu_limit": 0.85,
+            "concurrency_memory_limit": 0.85,
+            "bulk_worker_processes": 1,
+            "bulk_worker_task_timeout": 600,
+            "work_queue_path": "bulk_queue.sqlite",
+            "work_queue_lease_seconds": 300,
+            "work_queue_max_attempts": 3,
+            "refresh_ttl_days": 30,
+            "company_deadline_seconds": 180,
+            "company_max_pages": 8,
+            "company_max_llm_calls": 2,
+            "interactive_deadline_seconds": 0,
+            "model_timeout": 300,
             "verbose": True
         }
         
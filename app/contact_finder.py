@@ -1,18 +1,65 @@
 from typing import Dict, List, Any, Tuple
 from config_manager import ConfigManager
-from web_scraper import WebScraper
+from scraper_factory import get_web_scraper
+from resilience import get_resilience_layer
+from robots_policy import get_robots_policy
+from domain_utils import get_public_suffix_list, registrable_domain, site_root
+from domain_index import DomainIndex
+from result_ranker import ResultRanker
+from negative_cache import NegativeCache
+from company_budget import CompanyBudget, BudgetExceeded
+from search_backends import build_search_manager
+from serp_extractor import extract_serp_candidate, is_serp_complete, format_serp_candidate
 from selenium_scraper import SeleniumScraper
+from contact_page_discovery import ContactPageDiscovery
+from site_crawler import SiteCrawler
 import re
 from bs4 import BeautifulSoup
 from model_factory import get_model_manager
 
+# Number of recent SERP candidates kept for follow-up deep scrapes
+MAX_SERP_CANDIDATES = 256
+
+
 class ContactFinder:
     """Main class that orchestrates the contact finding process"""
     
     def __init__(self, config_path: str = "config.json"):
         self.config_manager = ConfigManager(config_path)
         self.model_manager = get_model_manager(self.config_manager)
-        self.web_scraper = WebScraper(self.config_manager)
+        self.resilience = get_resilience_layer(self.config_manager)
+        self.robots = get_robots_policy(self.config_manager)
+        get_public_suffix_list(self.config_manager)
+        self.web_scraper = get_web_scraper(self.config_manager)
+        self.contact_discovery = ContactPageDiscovery(
+            self.web_scraper,
+            stats_path=self.config_manager.get("contact_path_stats_path", "contact_path_stats.json"),
+            max_workers=self.config_manager.get("discovery_workers", 6),
+            verbose=bool(self.config_manager.get("verbose"))
+        )
+        self.site_crawler = SiteCrawler(
+            self.web_scraper,
+            max_depth=self.config_manager.get("max_depth", 2),
+            max_pages=self.config_manager.get("max_pages_per_site", 8),
+            verbose=bool(self.config_manager.get("verbose"))
+        )
+        self.serp_required_fields = self.config_manager.get("serp_required_fields", ["phones", "address", "website"])
+        self.serp_candidates = {}  # business name -> structured contact data from its search results
+        self.result_ranker = ResultRanker(
+            stats_path=self.config_manager.get("ranker_stats_path", "result_ranker_stats.json"),
+            verbose=bool(self.config_manager.get("verbose"))
+        )
+        self.early_exit_min_confidence = self.config_manager.get("early_exit_min_confidence", 0.5)
+        # Slow local models can take minutes to answer
+        self.model_timeout = self.config_manager.get("model_timeout", 300)
+        self.domain_index = DomainIndex(
+            path=self.config_manager.get("domain_index_path", "domain_index.json"),
+            min_confidence=self.config_manager.get("domain_index_min_confidence", 0.9)
+        )
+        self.negative_cache = NegativeCache(
+            path=self.config_manager.get("negative_cache_path", "negative_cache.json"),
+            ttls=self.config_manager.get("negative_cache_ttls", {})
+        )
         self.selenium_scraper = None  # Will be initialised when needed
     
     def setup(self) -> bool:
@@ -24,7 +71,17 @@ class ContactFinder:
         if self.selenium_scraper is None:
             print("Initialising Selenium scraper...")
             headless = self.config_manager.get("headless", True)
-            self.selenium_scraper = SeleniumScraper(headless=headless)
+            self.selenium_scraper = SeleniumScraper(
+                headless=headless,
+                resilience=self.resilience,
+                http_scraper=self.web_scraper,
+                robots=self.robots
+            )
+            self.selenium_scraper.search_manager = self.build_search_manager(self.selenium_scraper)
+    
+    def build_search_manager(self, browser=None):
+        """Search backends from config, with Google fetched through browser if given"""
+        return build_search_manager(self.config_manager, self.web_scraper, browser)
     
     def _cleanup_selenium(self):
         """Clean up Selenium resources when done"""
@@ -32,35 +89,67 @@ class ContactFinder:
             self.selenium_scraper.close()
             self.selenium_scraper = None
     
-    def initial_search(self, business_name: str) -> Tuple[str, List[Dict[str, Any]]]:
+    def initial_search(self, business_name: str, budget: CompanyBudget = None) -> Tuple[str, List[Dict[str, Any]]]:
         """
         Perform initial search and extract contact information from search results only.
         Returns contact information and a list of URLs for further scraping if needed.
+        Every step is bounded by budget (a fresh single-company budget if not given).
         """
         verbose = self.config_manager.get("verbose")
+        budget = budget or CompanyBudget.from_config(self.config_manager, business_name, interactive=True)
         
         if verbose:
             print(f"Searching for contact information for: {business_name}")
         
+        # Organisations we've resolved before go straight to their own site
+        known_site = self.domain_index.resolve(business_name)
+        if known_site:
+            if verbose:
+                print(f"Using known website {known_site}, skipping search")
+            return self.deep_scrape_url(known_site, business_name, budget), [known_site]
+        
+        if self.negative_cache.check_query(business_name):
+            return "No search results found recently. Please try a different search term.", []
+        
         try:
             # Initialise Selenium
             self._initialise_selenium()
             
-            # Step 1: Search for the business using Selenium
+            # Step 1: Search for the business across the configured search backends
             max_results = self.config_manager.get("max_search_results", 5)
-            search_results = self.selenium_scraper.search(business_name, max_results)
+            search = self.selenium_scraper.search_detailed(business_name, max_results, budget.timeout())
+            search_results = search["urls"]
+            
+            if search.get("status") == "blocked":
+                return "Search engines are temporarily blocking requests. Please try again later.", []
+            
+            if search.get("status") == "error":
+                return "The search engines could not be reached. Please try again later.", []
             
             if not search_results:
+                if search.get("status") == "ok":
+                    self.negative_cache.record_empty_search(business_name)
                 return "No search results found. Please try a different search term.", []
             
             if verbose:
                 print(f"Found {len(search_results)} search results")
             
             # Step 2: Extract information from search results pages
+            candidate = extract_serp_candidate(search["responses"], business_name, search_results)
+            self._remember_serp_candidate(business_name, candidate)
+            
+            if is_serp_complete(candidate, self.serp_required_fields):
+                # Snippets and the local panel already answer the question, no page visits needed
+                if verbose:
+                    print(f"Search results already show {', '.join(self.serp_required_fields)}, skipping page scraping")
+                return format_serp_candidate(candidate), search_results
+            
             search_page_data = {
                 "urls": search_results,
                 "search_term": business_name,
-                "contact_info_from_search": self._extract_contact_info_from_selenium()
+                "contact_info_from_search": self._extract_contact_info_from_selenium(
+                    [response["html"] for response in search["responses"] if response.get("html")]
+                )
             }
             
             # Step 3: Format the data for the model
@@ -71,17 +160,15 @@ class ContactFinder:
                 print("Extracting contact information from search results...")
             
             try:
-                from concurrent.futures import ThreadPoolExecutor, TimeoutError
-                
-                with ThreadPoolExecutor() as executor:
-                    future = executor.submit(self.model_manager.query_model, formatted_data)
-                    
-                    try:
-                        # Set a 5-minute timeout
-                        result = future.result(timeout=300)
-                    except TimeoutError:
-                        print("\nERROR: Model query timed out after 5 minutes.")
-                        return "Model query timed out. Unable to extract contact information.", search_results
+                if not budget.take_llm_call():
+                    raise BudgetExceeded("No model queries left")
+                # At most model_timeout, less if the company's budget is nearly spent
+                result = budget.run(
+                    lambda: self.model_manager.query_model(formatted_data), timeout=self.model_timeout, stage="Model query"
+                )
+            except BudgetExceeded as budget_err:
+                print(f"\nERROR: {budget_err}")
+                return "PARTIAL RESULT (time budget ran out before extraction)\n" + format_serp_candidate(candidate), search_results
             except Exception as model_err:
                 print(f"\nERROR during model query: {model_err}")
                 return f"Error processing results: {model_err}", search_results
@@ -96,91 +183,102 @@ class ContactFinder:
             # Clean up Selenium resources
             self._cleanup_selenium()
     
-    def deep_scrape_url(self, url: str, business_name: str) -> str:
-        """Scrape a specific URL for more detailed contact information"""
+    def deep_scrape_url(self, url: str, business_name: str, budget: CompanyBudget = None) -> str:
+        """
+        Scrape a specific URL for more detailed contact information.
+        Page loads, the crawl and the model query are bounded by budget
+        (a fresh single-company budget if not given).
+        """
         verbose = self.config_manager.get("verbose")
+        budget = budget or CompanyBudget.from_config(self.config_manager, business_name, interactive=True)
         
         if verbose:
             print(f"Deep scraping URL: {url}")
         
+        # The search step may already have everything for this business's own site
+        candidate = self.serp_candidate(business_name)
+        if candidate and is_serp_complete(candidate, self.serp_required_fields) \
+                and registrable_domain(candidate["website"]) == registrable_domain(url):
+            if verbose:
+                print("Search results already covered this site, skipping page scraping")
+            return format_serp_candidate(candidate)
+        
+        failure = self.negative_cache.check_url(url)
+        if failure:
+            return f"Skipping {url}: it failed recently ({failure.replace('_', ' ')}). Please try again later."
+        
         try:
-            # Initialize Selenium
-            self._initialise_selenium()
-            
             # Check if this is a homepage or main domain URL
             is_homepage = url.count('/') < 4 and not url.split('/')[-1].endswith(('.html', '.php', '.asp'))
             
-            # If it's a homepage, try to find Contact Us page first
-            contact_pages_tried = []
+            # If it's a homepage, find the Contact Us page with cheap HTTP probes first
+            contact_url = None
             if is_homepage:
-                domain = '/'.join(url.split('/')[:3])  # Get domain only (http://example.com)
-                potential_contact_urls = [
-                    f"{domain}/contact",
-                    f"{domain}/contact-us",
-                    f"{domain}/contactus",
-                    f"{domain}/get-in-touch",
-                    f"{domain}/reach-us",
-                    f"{domain}/about-us/contact",
-                ]
+                contact_url = self.contact_discovery.discover(url)
+            
+            # No obvious contact page, so crawl the most contact-relevant links instead
+            if is_homepage and not contact_url:
+                crawl = self.site_crawler.crawl(url, budget)
+                if crawl["pages"]:
+                    if verbose:
+                        print(f"Crawler found contact details on {len(crawl['pages'])} of {crawl['pages_fetched']} pages")
+                    
+                    page_data = self._page_data_from_crawl(crawl)
+                    formatted_data = self._format_url_data_for_model(business_name, url, page_data)
+                    
+                    if verbose:
+                        print("Extracting detailed contact information from crawled pages...")
+                    
+                    return self._query_model(formatted_data, budget, business_name, url, page_data)
+            
+            # Initialize Selenium - only the winning page is fully rendered
+            self._initialise_selenium()
+            
+            if contact_url:
+                if verbose:
+                    print(f"Rendering discovered contact page: {contact_url}")
                 
-                for contact_url in potential_contact_urls:
-                    try:
-                        if verbose:
-                            print(f"Trying potential contact page: {contact_url}")
-                        
-                        # Try to navigate to the contact page
-                        self.selenium_scraper.navigate(contact_url)
-                        current_url = self.selenium_scraper.driver.current_url
-                        
-                        # Check if we've reached a contact-looking page
-                        page_title = self.selenium_scraper.driver.title.lower()
-                        if ("contact" in current_url.lower() or 
-                            "contact" in page_title or 
-                            "get in touch" in page_title):
-                            
-                            if verbose:
-                                print(f"Found contact page: {current_url}")
-                            
-                            # Successfully found contact page, scrape it
-                            page_data = self.selenium_scraper.get_current_page_data()
-                            self._enhance_page_data_with_contact_info(page_data)
-                            
-                            # Format data for the model
-                            formatted_data = self._format_url_data_for_model(
-                                business_name, 
-                                current_url, 
-                                page_data,
-                                is_contact_page=True
-                            )
-                            
-                            # Query the model
-                            if verbose:
-                                print("Extracting detailed contact information from contact page...")
-                            
-                            contact_page_result = self.model_manager.query_model(formatted_data)
-                            contact_pages_tried.append(current_url)
-                            
-                            # If we found a contact page, use this result
-                            return contact_page_result
+                page_data = self._render_page(contact_url, budget)
+                if not page_data.get("error"):
+                    self._enhance_page_data_with_contact_info(page_data)
                     
-                    except Exception as e:
-                        if verbose:
-                            print(f"Error trying contact page {contact_url}: {str(e)}")
-                        continue
+                    # Feed the outcome back so future runs order candidates better
+                    found_contacts = bool(page_data.get("phones") or page_data.get("emails"))
+                    self.contact_discovery.record_result(url, contact_url, found_contacts)
+                    if found_contacts:
+                        self._record_own_site(business_name, url)
+                    
+                    # Format data for the model
+                    formatted_data = self._format_url_data_for_model(
+                        business_name, 
+                        contact_url, 
+                        page_data,
+                        is_contact_page=True
+                    )
+                    
+                    # Query the model
+                    if verbose:
+                        print("Extracting detailed contact information from contact page...")
+                    
+                    return self._query_model(formatted_data, budget, business_name, contact_url, page_data)
+                
+                self.contact_discovery.record_result(url, contact_url, False)
             
             # If no contact page was found or if it's not a homepage, scrape the original URL
             if verbose:
-                if contact_pages_tried:
-                    print(f"Contact pages tried: {', '.join(contact_pages_tried)}")
                 print(f"Scraping original URL: {url}")
             
-            # Navigate to the original URL
-            self.selenium_scraper.navigate(url)
-            page_data = self.selenium_scraper.get_current_page_data()
+            page_data = self._render_page(url, budget)
             
             # Extract contact information from the page HTML
             self._enhance_page_data_with_contact_info(page_data)
             
+            # Remember dead or empty pages so they aren't rendered again soon
+            if page_data.get("error"):
+                self.negative_cache.record_fetch_error(url, page_data["error"])
+            elif not (page_data.get("phones") or page_data.get("emails")):
+                self.negative_cache.record_no_contacts(url)
+            
             # Format data for the model
             formatted_data = self._format_url_data_for_model(business_name, url, page_data)
             
@@ -188,7 +286,7 @@ class ContactFinder:
             if verbose:
                 print("Extracting detailed contact information...")
             
-            result = self.model_manager.query_model(formatted_data)
+            result = self._query_model(formatted_data, budget, business_name, url, page_data)
             
             return result
             
@@ -196,19 +294,103 @@ class ContactFinder:
             # Clean up Selenium resources
             self._cleanup_selenium()
     
-    def _extract_contact_info_from_selenium(self) -> Dict[str, List[str]]:
-        """Extract contact information from the Selenium browser's current page"""
-        if self.selenium_scraper is None:
-            return {"phones": [], "emails": []}
+    def _render_page(self, url: str, budget: CompanyBudget) -> Dict[str, Any]:
+        """Render url in the browser, giving up when the company's pages or time run out"""
+        if not budget.take_page():
+            return {"url": url, "error": "Time budget exhausted", "content": ""}
+        try:
+            return budget.run(lambda: self.selenium_scraper.scrape_url(url), stage=f"Rendering {url}")
+        except BudgetExceeded as e:
+            self.selenium_scraper.cancel()
+            return {"url": url, "error": str(e), "content": ""}
+    
+    def _query_model(self, formatted_data: str, budget: CompanyBudget, business_name: str,
+                     url: str, page_data: Dict[str, Any]) -> str:
+        """
+        Query the model within the company's budget. When no model query is
+        left (or it overruns), the phones and emails already found on the page
+        are returned as a partial result instead.
+        """
+        try:
+            if not budget.take_llm_call():
+                raise BudgetExceeded("No model queries left")
+            return budget.run(
+                lambda: self.model_manager.query_model(formatted_data), timeout=self.model_timeout, stage="Model query"
+            )
+        except BudgetExceeded as e:
+            print(f"{e}; returning the contact details found without the model")
+        
+        lines = ["PARTIAL RESULT (time budget ran out before extraction)", f"Business: {business_name}"]
+        lines += [f"Phone: {phone}" for phone in page_data.get("phones", [])]
+        lines += [f"Email: {email}" for email in page_data.get("emails", [])]
+        lines.append(f"Website: {site_root(url)}")
+        return "\n".join(lines)
+    
+    def serp_candidate(self, business_name: str) -> Dict[str, Any]:
+        """Structured contact data found in the most recent search for business_name, if any"""
+        return self.serp_candidates.get(business_name.strip().lower())
+    
+    def serp_complete(self, business_name: str) -> bool:
+        """Whether the search results for business_name made page scraping unnecessary"""
+        return is_serp_complete(self.serp_candidate(business_name), self.serp_required_fields)
+    
+    def _remember_serp_candidate(self, business_name: str, candidate: Dict[str, Any]):
+        """Keep a bounded record of recent SERP candidates"""
+        key = business_name.strip().lower()
+        self.serp_candidates.pop(key, None)
+        self.serp_candidates[key] = candidate
+        while len(self.serp_candidates) > MAX_SERP_CANDIDATES:
+            self.serp_candidates.pop(next(iter(self.serp_candidates)))
+    
+    def _record_own_site(self, business_name: str, url: str) -> bool:
+        """
+        Remember url's site as the business's own in the domain index
+
+        The URL may have been picked by the user or passed to the API, so it is
+        only recorded when it isn't a directory site and the ranker scores it at
+        least early_exit_min_confidence for this business, as in bulk runs.
+
+        Returns:
+            bool: True if the site was recorded
+        """
+        if url in self.result_ranker.directories:
+            return False
+        if self.result_ranker.score(url, business_name) < self.early_exit_min_confidence:
+            return False
+        return self.domain_index.record(business_name, url)
+    
+    def _page_data_from_crawl(self, crawl: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine the pages a crawl found contact details on into one page_data dict"""
+        sections = []
+        for page in crawl["pages"]:
+            sections.append(f"PAGE: {page['url']} ({page['title']})\n{page['content']}")
         
-        # Get the page source from Selenium
-        page_source = self.selenium_scraper.driver.page_source
+        text = "\n\n---\n\n".join(sections)
+        signals = crawl["signals"]
         
-        # Use BeautifulSoup to parse the HTML
-        soup = BeautifulSoup(page_source, "html.parser")
+        return {
+            "url": crawl["pages"][0]["url"],
+            "title": crawl["pages"][0]["title"],
+            "content": text,
+            "text_content": text[:10000],
+            "emails": signals["emails"],
+            "phones": signals["phones"]
+        }
+    
+    def _extract_contact_info_from_selenium(self, page_sources: List[str] = None) -> Dict[str, List[str]]:
+        """Extract contact information from search result pages (or the browser's current page)"""
+        if page_sources is None:
+            if self.selenium_scraper is None or self.selenium_scraper.driver is None:
+                return {"phones": [], "emails": []}
+            
+            # Get the page source from Selenium
+            page_sources = [self.selenium_scraper.driver.page_source]
         
-        # Extract text content
-        text = soup.get_text(separator="\n", strip=True)
+        # Use BeautifulSoup to parse the HTML and extract text content
+        text = "\n".join(
+            BeautifulSoup(page_source, "html.parser").get_text(separator="\n", strip=True)
+            for page_source in page_sources
+        )
         
         # Extract contact info using our existing methods
         emails = self._extract_emails(text)
@@ -380,7 +562,7 @@ class ContactFinder:
         """Format a single URL's data for the model"""
         formatted_text = f"Extract detailed contact information for {business_name} from this specific webpage:\n\n"
         formatted_text += f"URL: {url}\n"
-        formatted_text += f"TITLE: {page_data['title']}\n\n"
+        formatted_text += f"TITLE: {page_data.get('title', '')}\n\n"
         
         if is_contact_page:
             formatted_text += "THIS IS AN OFFICIAL CONTACT PAGE. Extract ALL contact information carefully.\n\n"
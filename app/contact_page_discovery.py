@@ -0,0 +1,327 @@
+import re
+import threading
+from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urljoin
+from bs4 import BeautifulSoup
+from json_store import load_json, update_json
+
+# Paths that commonly hold contact details, in rough order of likelihood
+DEFAULT_CONTACT_PATHS = [
+    "/contact",
+    "/contact-us",
+    "/contactus",
+    "/get-in-touch",
+    "/reach-us",
+    "/about-us/contact",
+    "/contact.html",
+    "/contact-us.html",
+    "/contact.php",
+    "/about/contact",
+    "/find-us",
+]
+
+# Anchor text / URL keywords and how strongly they suggest a contact page
+CONTACT_KEYWORDS = {
+    "contact": 10,
+    "get in touch": 9,
+    "get-in-touch": 9,
+    "reach us": 8,
+    "find us": 7,
+    "find-us": 7,
+    "enquir": 6,
+    "locations": 4,
+    "visit us": 4,
+    "about": 1,
+}
+
+# Markers used to recognise the CMS behind a site from its homepage HTML
+CMS_SIGNATURES = {
+    "wordpress": ["wp-content", "wp-includes", "wordpress"],
+    "shopify": ["cdn.shopify.com", "shopify"],
+    "squarespace": ["squarespace"],
+    "wix": ["wixstatic.com", "wix.com"],
+    "drupal": ["drupal", "/sites/default/files"],
+    "joomla": ["joomla", "/media/jui/"],
+    "webflow": ["webflow"],
+}
+
+
+class ContactPageDiscovery:
+    """
+    Finds the most likely contact page for a website before any browser is used.
+
+    Candidates come from the homepage's anchors, the sitemap and a list of common
+    paths. They are ordered using hit statistics learned from past runs (per domain
+    and per CMS) and probed in parallel with lightweight HTTP requests.
+    """
+
+    def __init__(self, web_scraper, stats_path: str = "contact_path_stats.json",
+                 max_workers: int = 6, verbose: bool = False):
+        """
+        Initialise the discovery step
+
+        Args:
+            web_scraper: WebScraper used for homepage, sitemap and probe requests
+            stats_path (str): JSON file holding the learned path statistics
+            max_workers (int): Number of candidate probes to run in parallel
+            verbose (bool): Print progress information
+        """
+        self.web_scraper = web_scraper
+        self.stats_path = stats_path
+        self.max_workers = max_workers
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self.stats = self._load_stats()
+        self._pending = self._empty_changes()  # changes since the last save, merged into the file on save
+
+    def discover(self, url: str) -> Optional[str]:
+        """
+        Find the best contact page for the site that url belongs to
+
+        Args:
+            url (str): Homepage (or any page) of the site
+
+        Returns:
+            str: URL of the winning contact page, or None if nothing was found
+        """
+        parsed = urlparse(url)
+        if not parsed.scheme or not parsed.netloc:
+            return None
+
+        root = f"{parsed.scheme}://{parsed.netloc}"
+        domain = self._domain_key(url)
+
+        final_url, html = self.web_scraper.fetch_html(url)
+        cms = self._detect_cms(html)
+
+        if self.verbose:
+            print(f"Discovering contact page for {domain} (CMS: {cms or 'unknown'})")
+
+        # Collect candidates with a prior score from where they were found
+        candidates: Dict[str, float] = {}
+        for link, score in self._anchor_candidates(final_url or url, html).items():
+            candidates[link] = max(candidates.get(link, 0), score)
+        for link in self._sitemap_candidates(root):
+            candidates[link] = max(candidates.get(link, 0), 6)
+        for path in DEFAULT_CONTACT_PATHS:
+            link = root + path
+            candidates.setdefault(link, 2)
+
+        ordered = self._order_candidates(candidates, domain, cms)
+        if not ordered:
+            return None
+
+        winner = self._probe_in_order(ordered)
+        if winner:
+            self._remember_cms(domain, cms)
+            if self.verbose:
+                print(f"Found contact page: {winner}")
+
+        return winner
+
+    def record_result(self, site_url: str, page_url: str, success: bool) -> None:
+        """
+        Record whether a rendered contact page actually produced contact details
+
+        Args:
+            site_url (str): URL the discovery was run for
+            page_url (str): Contact page that was rendered
+            success (bool): Whether contact details were found on that page
+        """
+        domain = self._domain_key(site_url)
+        path = self._path_key(page_url)
+
+        with self._lock:
+            cms = self.stats["domain_cms"].get(domain)
+            for stats in (self.stats, self._pending):
+                buckets = [stats["domains"].setdefault(domain, {})]
+                if cms:
+                    buckets.append(stats["cms"].setdefault(cms, {}))
+
+                for bucket in buckets:
+                    entry = bucket.setdefault(path, {"hits": 0, "tries": 0})
+                    entry["tries"] += 1
+                    if success:
+                        entry["hits"] += 1
+
+            self._save_stats()
+
+    def _probe_in_order(self, ordered: List[str]) -> Optional[str]:
+        """
+        Probe all candidates in parallel and return the best-ranked one that
+        resolves, without waiting on lower-ranked probes once it is known
+        """
+        stop = threading.Event()
+
+        def probe(link):
+            # Probes queued behind the per-host politeness interval are skipped once we have a winner
+            if stop.is_set():
+                return {"url": link, "ok": False}
+            return self.web_scraper.probe_url(link)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [executor.submit(probe, link) for link in ordered]
+
+        winner = None
+        try:
+            for future in futures:
+                try:
+                    probe = future.result()
+                except Exception:
+                    continue
+
+                if probe.get("ok"):
+                    winner = probe.get("final_url") or probe["url"]
+                    break
+        finally:
+            # Drop probes that haven't started and don't wait on the stragglers
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return winner
+
+    def _anchor_candidates(self, base_url: str, html: str) -> Dict[str, float]:
+        """Score same-site anchors on the homepage by how contact-like they look"""
+        if not html:
+            return {}
+
+        soup = BeautifulSoup(html, "html.parser")
+        base_host = urlparse(base_url).netloc.lower()
+        candidates = {}
+
+        for link in soup.find_all("a", href=True):
+            href = link.get("href", "").strip()
+            if not href or href.startswith(("#", "mailto:", "tel:", "javascript:")):
+                continue
+
+            absolute = urljoin(base_url, href).split("#")[0]
+            if urlparse(absolute).netloc.lower() != base_host:
+                continue
+
+            text = link.get_text(" ", strip=True).lower()
+            score = self._keyword_score(text) + self._keyword_score(urlparse(absolute).path.lower()) / 2
+            if score >= 4:
+                # Anchors are the strongest signal since the site itself links to them
+                candidates[absolute] = max(candidates.get(absolute, 0), score + 5)
+
+        return candidates
+
+    def _sitemap_candidates(self, root: str) -> List[str]:
+        """Return contact-like URLs listed in the site's sitemap.xml"""
+        # Sitemaps are usually served as application/xml, which fetch_html would skip
+        _, xml = self.web_scraper.fetch_text(f"{root}/sitemap.xml")
+        if not xml:
+            return []
+
+        locations = re.findall(r"<loc>\s*([^<\s]+)\s*</loc>", xml, re.IGNORECASE)
+
+        # Sitemap indexes point at further sitemaps; follow a couple of likely ones
+        if re.search(r"<sitemapindex", xml, re.IGNORECASE):
+            nested = [loc for loc in locations if "page" in loc.lower()][:2] or locations[:1]
+            locations = []
+            for sitemap_url in nested:
+                _, nested_xml = self.web_scraper.fetch_text(sitemap_url)
+                locations.extend(re.findall(r"<loc>\s*([^<\s]+)\s*</loc>", nested_xml, re.IGNORECASE))
+
+        return [loc for loc in locations if self._keyword_score(urlparse(loc).path.lower()) >= 4][:10]
+
+    def _order_candidates(self, candidates: Dict[str, float], domain: str, cms: Optional[str]) -> List[str]:
+        """Order candidates by prior score plus learned per-domain and per-CMS hit rates"""
+        domain_stats = self.stats["domains"].get(domain, {})
+        cms_stats = self.stats["cms"].get(cms, {}) if cms else {}
+
+        def score(link):
+            path = self._path_key(link)
+            total = candidates[link]
+            total += 20 * self._hit_rate(domain_stats.get(path))
+            total += 8 * self._hit_rate(cms_stats.get(path))
+            return total
+
+        return sorted(candidates, key=score, reverse=True)
+
+    def _hit_rate(self, entry: Optional[Dict[str, int]]) -> float:
+        """Smoothed hit rate so a single failure doesn't bury a path forever"""
+        if not entry:
+            return 0.0
+        return (entry.get("hits", 0) + 0.5) / (entry.get("tries", 0) + 1)
+
+    def _keyword_score(self, text: str) -> float:
+        """Highest contact keyword weight present in text"""
+        return max((weight for keyword, weight in CONTACT_KEYWORDS.items() if keyword in text), default=0)
+
+    def _detect_cms(self, html: str) -> Optional[str]:
+        """Guess the CMS from the generator meta tag or well-known asset paths"""
+        if not html:
+            return None
+
+        lower_html = html.lower()
+        generator = re.search(r'<meta[^>]+name=["\']generator["\'][^>]+content=["\']([^"\']+)', lower_html)
+        haystack = generator.group(1) if generator else lower_html
+
+        for cms, markers in CMS_SIGNATURES.items():
+            if any(marker in haystack for marker in markers):
+                return cms
+
+        # Fall back to scanning the whole page if the generator tag didn't match
+        if generator:
+            for cms, markers in CMS_SIGNATURES.items():
+                if any(marker in lower_html for marker in markers):
+                    return cms
+
+        return None
+
+    def _remember_cms(self, domain: str, cms: Optional[str]) -> None:
+        """Remember which CMS a domain runs so results can be attributed to it"""
+        if not cms:
+            return
+        with self._lock:
+            self.stats["domain_cms"][domain] = cms
+            self._pending["domain_cms"][domain] = cms
+
+    def _domain_key(self, url: str) -> str:
+        """Host used to key per-domain statistics"""
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _path_key(self, url: str) -> str:
+        """Normalised path used to key statistics"""
+        return urlparse(url).path.rstrip("/").lower() or "/"
+
+    @staticmethod
+    def _empty_changes() -> Dict[str, Any]:
+        return {"domains": {}, "cms": {}, "domain_cms": {}}
+
+    def _load_stats(self) -> Dict[str, Any]:
+        """Load learned statistics from disk"""
+        stats = self._empty_changes()
+        saved = load_json(self.stats_path, "contact path stats")
+        if isinstance(saved, dict):
+            stats.update(saved)
+        return stats
+
+    def _save_stats(self) -> None:
+        """
+        Add the counts recorded here to the statistics on disk, so results
+        learnt by other workers meanwhile are kept; the caller holds the lock
+        """
+        pending = self._pending
+
+        def merge(current):
+            stats = self._empty_changes()
+            if isinstance(current, dict):
+                stats.update(current)
+            stats["domain_cms"].update(pending["domain_cms"])
+            for group in ("domains", "cms"):
+                for key, paths in pending[group].items():
+                    bucket = stats[group].setdefault(key, {})
+                    for path, change in paths.items():
+                        entry = bucket.setdefault(path, {"hits": 0, "tries": 0})
+                        for field, value in change.items():
+                            entry[field] = entry.get(field, 0) + value
+            return stats
+
+        saved = update_json(self.stats_path, merge, "contact path stats")
+        if saved is not None:
+            self._pending = self._empty_changes()
+            self.stats = saved
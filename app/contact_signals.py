@@ -0,0 +1,78 @@
+import re
+from typing import Dict, List, Any
+
+# Fast deterministic patterns for spotting contact details in page text
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+UK_PHONE_PATTERNS = [
+    re.compile(r'\+44\s?(?:\(0\))?\s?\d[\d\s\-\(\)\.]{7,17}\d'),
+    re.compile(r'(?<!\d)0(?:1\d{2,3}|2\d|3\d{2}|5\d{2}|7\d{3}|8\d{2})[\s\-]?\d{3,4}[\s\-]?\d{3,4}(?!\d)'),
+]
+
+UK_POSTCODE_PATTERN = re.compile(r'\b[A-Z]{1,2}[0-9][0-9A-Z]?\s?[0-9][A-Z]{2}\b')
+
+# Image and asset suffixes that look like email domains (e.g. logo@2x.png)
+IGNORED_EMAIL_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
+
+CONTACT_FIELDS = ("phones", "emails", "address")
+
+
+def find_contact_signals(text: str) -> Dict[str, Any]:
+    """
+    Extract phones, emails and a postcode-anchored address from plain text
+
+    Args:
+        text (str): Page text with markup already removed
+
+    Returns:
+        dict: {"phones": [...], "emails": [...], "address": str}
+    """
+    emails = []
+    for email in EMAIL_PATTERN.findall(text):
+        if not email.lower().endswith(IGNORED_EMAIL_SUFFIXES) and email not in emails:
+            emails.append(email)
+
+    phones = []
+    seen_digits = set()
+    for pattern in UK_PHONE_PATTERNS:
+        for match in pattern.findall(text):
+            digits = re.sub(r'\D', '', match)
+            if digits.startswith('440'):
+                digits = digits[2:]
+            elif digits.startswith('44'):
+                digits = '0' + digits[2:]
+            if 10 <= len(digits) <= 11 and digits not in seen_digits:
+                seen_digits.add(digits)
+                phones.append(re.sub(r'\s+', ' ', match).strip())
+
+    address = ""
+    postcode = UK_POSTCODE_PATTERN.search(text)
+    if postcode:
+        start = max(0, postcode.start() - 100)
+        address = re.sub(r'\s+', ' ', text[start:postcode.end()]).strip()
+
+    return {"phones": phones, "emails": emails, "address": address}
+
+
+def merge_contact_signals(current: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge newly found signals into an accumulated set without duplicates"""
+    merged = {
+        "phones": list(current.get("phones", [])),
+        "emails": list(current.get("emails", [])),
+        "address": current.get("address", ""),
+    }
+
+    for field in ("phones", "emails"):
+        for value in new.get(field, []):
+            if value not in merged[field]:
+                merged[field].append(value)
+
+    if not merged["address"] and new.get("address"):
+        merged["address"] = new["address"]
+
+    return merged
+
+
+def missing_contact_fields(signals: Dict[str, Any], required: List[str] = CONTACT_FIELDS) -> List[str]:
+    """Return the required fields that have not been found yet"""
+    return [field for field in required if not signals.get(field)]
@@ -0,0 +1,212 @@
+import io
+import re
+import zlib
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+# pypdf gives better PDF text; the built-in extractor handles simple text PDFs without it
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_TYPES = ("text/plain",)
+PDF_TYPES = ("application/pdf", "application/x-pdf")
+
+# Used when a server sends no (or a generic) Content-Type
+PDF_SUFFIXES = (".pdf",)
+BINARY_SUFFIXES = (
+    ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".ico", ".zip", ".gz", ".rar",
+    ".mp3", ".mp4", ".avi", ".mov", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".exe", ".dmg"
+)
+
+PDF_STREAM_PATTERN = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_TEXT_BLOCK_PATTERN = re.compile(rb'BT(.*?)ET', re.S)
+PDF_LITERAL_PATTERN = re.compile(rb'\(((?:\\.|[^\\)])*)\)', re.S)
+PDF_TITLE_PATTERN = re.compile(rb'/Title\s*\(((?:\\.|[^\\)])*)\)')
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+               b'(': b'(', b')': b')', b'\\': b'\\'}
+
+
+def classify_content(content_type: Optional[str], url: str = "") -> str:
+    """
+    Decide how a response should be handled
+
+    Args:
+        content_type (str): Content-Type header (may be empty)
+        url (str): URL, used as a hint when the header is missing or generic
+
+    Returns:
+        str: "html", "text", "pdf" or "binary"
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+
+    if media_type in HTML_TYPES:
+        return "html"
+    if media_type in PDF_TYPES:
+        return "pdf"
+    if media_type in TEXT_TYPES:
+        return "text"
+
+    path = urlparse(url).path.lower()
+    if not media_type or media_type in ("application/octet-stream", "binary/octet-stream"):
+        if path.endswith(PDF_SUFFIXES):
+            return "pdf"
+        if path.endswith(BINARY_SUFFIXES):
+            return "binary"
+        # Most servers that omit the header are serving a page
+        return "html" if not media_type else "binary"
+
+    if media_type.startswith("text/") or media_type.endswith("+xml") or media_type.endswith("/xml"):
+        return "text"
+
+    return "binary"
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """Extract the charset parameter from a Content-Type header"""
+    match = re.search(r'charset=["\']?([\w\-]+)', content_type or "", re.I)
+    return match.group(1) if match else None
+
+
+def decode_body(body: bytes, content_type: Optional[str] = None) -> str:
+    """Decode a response body using its declared charset, falling back to UTF-8"""
+    encoding = charset_from_content_type(content_type) or "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def html_to_page(url, html):
+    """
+    Turn raw HTML into the scrape_url result shape: url, title and full text content
+    """
+    # Parse the HTML
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Get title
+    title = soup.title.string if soup.title else "No title"
+
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.extract()
+
+    # Get text content
+    text = soup.get_text(separator="\n", strip=True)
+
+    return {
+        "url": url,
+        "title": title,
+        "content": text  # Return the full text content
+    }
+
+
+def pdf_to_page(url: str, data: bytes) -> Dict[str, Any]:
+    """
+    Extract text from a PDF into the scrape_url result shape
+
+    Uses pypdf when it is installed, otherwise a lightweight extractor that reads
+    the text operators of plain and Flate-compressed content streams. A truncated
+    download still yields the text of the streams that arrived.
+    """
+    text = ""
+    if PYPDF_AVAILABLE:
+        try:
+            reader = PdfReader(io.BytesIO(data))
+            text = "\n".join((page.extract_text() or "") for page in reader.pages)
+        except Exception:
+            text = ""
+
+    if not text.strip():
+        text = _extract_pdf_text(data)
+
+    title_match = PDF_TITLE_PATTERN.search(data)
+    if title_match:
+        title = _unescape_pdf_string(title_match.group(1)).decode("latin-1", errors="replace").strip()
+    else:
+        title = urlparse(url).path.rsplit("/", 1)[-1] or "PDF document"
+
+    return {
+        "url": url,
+        "title": title,
+        "content": text,
+        "content_kind": "pdf"
+    }
+
+
+def body_to_page(url: str, body: bytes, content_type: Optional[str], truncated: bool = False) -> Dict[str, Any]:
+    """
+    Route a downloaded body to the right extractor based on its content type
+
+    Returns:
+        dict: The scrape_url result shape; binaries come back with an error and
+        "skipped": True so callers can tell them apart from failed fetches
+    """
+    kind = classify_content(content_type, url)
+
+    if kind == "html":
+        page = html_to_page(url, decode_body(body, content_type))
+    elif kind == "text":
+        page = {"url": url, "title": "", "content": decode_body(body, content_type)}
+    elif kind == "pdf":
+        page = pdf_to_page(url, body)
+    else:
+        return {
+            "url": url,
+            "error": f"Skipped non-text content ({content_type or 'unknown type'})",
+            "content": "",
+            "skipped": True
+        }
+
+    page.setdefault("content_kind", kind)
+    if truncated:
+        page["truncated"] = True
+    return page
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    """Pull literal strings out of the text blocks of every content stream"""
+    blocks = []
+    for match in PDF_STREAM_PATTERN.finditer(data):
+        stream = match.group(1)
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            # Uncompressed stream, or one using a filter we don't handle
+            pass
+
+        for block in PDF_TEXT_BLOCK_PATTERN.findall(stream):
+            parts = [_unescape_pdf_string(literal) for literal in PDF_LITERAL_PATTERN.findall(block)]
+            line = b"".join(parts).decode("latin-1", errors="replace").strip()
+            if line:
+                blocks.append(line)
+
+    return "\n".join(blocks)
+
+
+def _unescape_pdf_string(value: bytes) -> bytes:
+    """Resolve backslash escapes in a PDF literal string"""
+    result = bytearray()
+    i = 0
+    while i < len(value):
+        char = value[i:i + 1]
+        if char == b'\\' and i + 1 < len(value):
+            nxt = value[i + 1:i + 2]
+            if nxt in PDF_ESCAPES:
+                result += PDF_ESCAPES[nxt]
+                i += 2
+                continue
+            octal = re.match(rb'[0-7]{1,3}', value[i + 1:i + 4])
+            if octal:
+                result.append(int(octal.group(0), 8) & 0xFF)
+                i += 1 + len(octal.group(0))
+                continue
+            i += 1
+            continue
+        result += char
+        i += 1
+    return bytes(result)
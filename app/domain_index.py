@@ -0,0 +1,192 @@
+import csv
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from domain_utils import DomainSet, registrable_domain, site_root
+from json_store import load_json, update_json
+from name_matching import normalize_name, name_similarity
+from result_ranker import DIRECTORY_DOMAINS
+
+# Column headers accepted when importing a CSV
+NAME_COLUMNS = ('name', 'business', 'business_name', 'organisation', 'organization', 'company')
+WEBSITE_COLUMNS = ('website', 'domain', 'url', 'site')
+
+
+class DomainIndex:
+    """
+    Persistent business name -> official website index.
+
+    Built from pages of a business's own site that produced its contact
+    details (and optional CSV imports) so that organisations we've seen before
+    can skip the search engine entirely. Only an exact match on the normalised
+    name does that: similar names ("Bolton Council" / "Boston Council") are
+    often different organisations, so a fuzzy match is only a ranking hint.
+    Directory and aggregator sites are never stored.
+    """
+
+    def __init__(self, path: str = "domain_index.json", min_confidence: float = 0.9):
+        """
+        Initialise the index
+
+        Args:
+            path (str): JSON file holding the index
+            min_confidence (float): Lowest fuzzy match confidence at which a known site is offered as a hint
+        """
+        self.path = path
+        self.min_confidence = min_confidence
+        self.directories = DomainSet(DIRECTORY_DOMAINS)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty: set = set()  # keys changed since the last save
+        self._tokens: Dict[str, set] = {}
+        for key in self.entries:
+            self._index_tokens(key)
+
+    def lookup(self, name: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Find the best entry for a business name
+
+        Returns:
+            tuple: (entry or None, confidence 0-1)
+        """
+        key = normalize_name(name)
+        if not key:
+            return None, 0.0
+
+        with self._lock:
+            if key in self.entries:
+                return self.entries[key], 1.0
+
+            # Only compare against names sharing at least one word
+            candidates = set()
+            for token in key.split():
+                candidates |= self._tokens.get(token, set())
+
+            best, best_score = None, 0.0
+            for candidate in candidates:
+                score = name_similarity(key, candidate)
+                if score > best_score:
+                    best, best_score = candidate, score
+
+            return (self.entries[best], best_score) if best else (None, 0.0)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Known website for name when the normalised name matches exactly, else None"""
+        entry, confidence = self.lookup(name)
+        if entry and confidence == 1.0:
+            print(f"Domain index: {name} -> {entry['website']}")
+            return entry["website"]
+        return None
+
+    def hint(self, name: str) -> Optional[str]:
+        """
+        Website of a similarly named business, for ranking search results only
+
+        Returns:
+            str: The website when a fuzzy match reaches min_confidence, else None
+        """
+        entry, confidence = self.lookup(name)
+        if entry and self.min_confidence <= confidence < 1.0:
+            return entry["website"]
+        return None
+
+    def record(self, name: str, website: str, source: str = "extraction") -> bool:
+        """
+        Remember the website a business's contact details were found on
+
+        Only record a site that was fetched and found to be the business's
+        own; directory and aggregator sites are rejected.
+
+        Args:
+            name (str): Business name
+            website (str): Any URL on the business's site
+            source (str): Where the mapping came from ("extraction" or "csv")
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        with self._lock:
+            stored = self._store(name, website, source)
+            if stored:
+                self._save()
+        return stored
+
+    def import_csv(self, csv_path: str) -> int:
+        """
+        Load name/website pairs from a CSV file with a header row
+
+        Returns:
+            int: Number of entries imported
+        """
+        imported = 0
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            headers = {header.strip().lower(): header for header in reader.fieldnames or []}
+            name_column = next((headers[c] for c in NAME_COLUMNS if c in headers), None)
+            website_column = next((headers[c] for c in WEBSITE_COLUMNS if c in headers), None)
+            if not name_column or not website_column:
+                raise ValueError(f"CSV needs a name column {NAME_COLUMNS} and a website column {WEBSITE_COLUMNS}")
+
+            with self._lock:
+                for row in reader:
+                    name = (row.get(name_column) or "").strip()
+                    website = (row.get(website_column) or "").strip()
+                    if name and website and self._store(name, website, source="csv"):
+                        imported += 1
+                self._save()
+
+        print(f"Imported {imported} entries into the domain index from {csv_path}")
+        return imported
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _store(self, name: str, website: str, source: str) -> bool:
+        """Add or refresh an entry; the caller holds the lock"""
+        key = normalize_name(name)
+        root = site_root(website if "://" in website else f"https://{website.strip()}")
+        if not key or not root or root in self.directories:
+            return False
+
+        entry = self.entries.get(key)
+        if entry and registrable_domain(entry["website"]) == registrable_domain(root):
+            entry["hits"] = entry.get("hits", 0) + 1
+            entry["updated"] = datetime.now().isoformat()
+        else:
+            self.entries[key] = {
+                "name": name.strip(),
+                "website": root,
+                "hits": 1,
+                "source": source,
+                "updated": datetime.now().isoformat()
+            }
+            self._index_tokens(key)
+        self._dirty.add(key)
+        return True
+
+    def _index_tokens(self, key: str) -> None:
+        for token in key.split():
+            self._tokens.setdefault(token, set()).add(key)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index from disk"""
+        entries = load_json(self.path, "domain index")
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self) -> None:
+        """Merge the entries changed here into the index on disk; the caller holds the lock"""
+        changed = {key: self.entries[key] for key in self._dirty}
+
+        def merge(current):
+            entries = current if isinstance(current, dict) else {}
+            entries.update(changed)
+            return entries
+
+        saved = update_json(self.path, merge, "domain index")
+        if saved is None:
+            return
+        # Pick up entries other workers have added meanwhile
+        self._dirty.clear()
+        for key in saved.keys() - self.entries.keys():
+            self._index_tokens(key)
+        self.entries = saved
@@ -0,0 +1,199 @@
+import os
+import threading
+from typing import Iterable, Optional, Set
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Multi-label public suffixes we run into most, used when no PSL file is configured.
+# Single-label TLDs (com, uk, ...) need no entry: the PSL default rule is "*".
+BUILTIN_SUFFIXES = {
+    # United Kingdom
+    "co.uk", "org.uk", "me.uk", "ltd.uk", "plc.uk", "net.uk", "sch.uk", "ac.uk",
+    "gov.uk", "nhs.uk", "police.uk", "mod.uk", "nic.uk",
+    # Crown dependencies
+    "co.im", "org.im", "co.je", "org.je", "co.gg", "org.gg",
+    # Ireland and Europe
+    "gov.ie", "co.at", "or.at", "com.es", "org.es", "com.pl", "com.pt", "com.gr", "com.cy",
+    # Commonwealth and elsewhere
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "asn.au", "id.au",
+    "co.nz", "org.nz", "net.nz", "govt.nz", "ac.nz",
+    "co.za", "org.za", "gov.za", "ac.za",
+    "co.in", "net.in", "org.in", "gov.in", "ac.in",
+    "com.sg", "org.sg", "edu.sg", "gov.sg",
+    "com.hk", "org.hk", "gov.hk",
+    "co.jp", "or.jp", "ne.jp", "ac.jp", "go.jp",
+    "co.kr", "or.kr", "com.cn", "net.cn", "org.cn", "gov.cn", "com.tw",
+    "com.br", "net.br", "org.br", "gov.br", "com.mx", "com.ar", "com.co",
+    "com.tr", "com.my", "com.ph", "com.pk", "com.ng", "com.eg", "co.il", "co.ke",
+    # Hosting platforms where each subdomain is a separate site
+    "github.io", "herokuapp.com", "blogspot.com", "wordpress.com", "wixsite.com",
+    "squarespace.com", "netlify.app", "azurewebsites.net", "cloudfront.net",
+}
+
+# Query parameters that only track the click and never change the page
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid", "_ga", "ref", "srsltid"}
+
+
+class PublicSuffixList:
+    """
+    Registrable-domain lookup following the Public Suffix List algorithm.
+
+    Rules are held in hashed sets, so a lookup costs one set probe per label of
+    the host. Wildcard ("*.ck") and exception ("!www.ck") rules from a full PSL
+    file are supported; without a file the built-in subset is used.
+    """
+
+    def __init__(self, rules: Optional[Iterable[str]] = None, path: Optional[str] = None):
+        """
+        Args:
+            rules (iterable): Suffix rules in PSL syntax, defaults to BUILTIN_SUFFIXES
+            path (str): Optional public_suffix_list.dat to load instead
+        """
+        self.suffixes: Set[str] = set()
+        self.wildcards: Set[str] = set()
+        self.exceptions: Set[str] = set()
+
+        if path and os.path.exists(path):
+            rules = self._read_rules(path)
+            print(f"Loaded public suffix list from {path}")
+        for rule in (BUILTIN_SUFFIXES if rules is None else rules):
+            self.add_rule(rule)
+
+    def add_rule(self, rule: str) -> None:
+        rule = rule.strip().lower()
+        if not rule or rule.startswith("//"):
+            return
+        if rule.startswith("!"):
+            self.exceptions.add(rule[1:])
+        elif rule.startswith("*."):
+            self.wildcards.add(rule[2:])
+        else:
+            self.suffixes.add(rule)
+
+    def public_suffix(self, host: str) -> str:
+        """The public suffix of host, e.g. co.uk for www.example.co.uk"""
+        labels = host.lower().strip(".").split(".")
+        # Longest matching rule wins, so walk from the full host down
+        for i in range(len(labels)):
+            candidate = ".".join(labels[i:])
+            if candidate in self.exceptions:
+                return ".".join(labels[i + 1:])
+            if candidate in self.suffixes:
+                return candidate
+            parent = ".".join(labels[i + 1:])
+            if parent in self.wildcards:
+                return candidate
+        return labels[-1]
+
+    def registrable_domain(self, host: str) -> str:
+        """The public suffix plus one label, e.g. example.co.uk; the host itself if it is a suffix"""
+        host = host.lower().strip(".")
+        if not host or _is_ip(host):
+            return host
+        suffix = self.public_suffix(host)
+        if host == suffix:
+            return host
+        labels = host[:-len(suffix) - 1].split(".")
+        return f"{labels[-1]}.{suffix}"
+
+    def _read_rules(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                # PSL rules end at the first whitespace
+                rule = line.split()[0] if line.split() else ""
+                if rule and not rule.startswith("//"):
+                    yield rule
+
+
+class DomainSet:
+    """
+    Hashed set of domains matched against URLs or hosts.
+
+    A URL matches when its host, or any parent domain of it, is in the set:
+    "maps.google.com" matches "google.com", "notgoogle.com" does not.
+    """
+
+    def __init__(self, domains: Iterable[str] = ()):
+        self.domains = {domain.lower().strip(".") for domain in domains}
+
+    def add(self, domain: str) -> None:
+        self.domains.add(domain.lower().strip("."))
+
+    def __contains__(self, url_or_host: str) -> bool:
+        labels = hostname(url_or_host).split(".")
+        return any(".".join(labels[i:]) in self.domains for i in range(len(labels)))
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+
+_shared_psl: Optional[PublicSuffixList] = None
+_shared_lock = threading.Lock()
+
+
+def get_public_suffix_list(config_manager=None) -> PublicSuffixList:
+    """
+    Return the process-wide suffix list, loading public_suffix_list_path from
+    config on first use and falling back to the built-in subset
+    """
+    global _shared_psl
+    with _shared_lock:
+        if _shared_psl is None:
+            get = config_manager.get if config_manager else (lambda key, default=None: default)
+            _shared_psl = PublicSuffixList(path=get("public_suffix_list_path"))
+        return _shared_psl
+
+
+def hostname(url_or_host: str) -> str:
+    """Lower-cased host of a URL (or a bare host), without port or credentials"""
+    value = (url_or_host or "").strip()
+    if "://" not in value:
+        value = "//" + value
+    try:
+        return (urlsplit(value).hostname or "").strip(".")
+    except ValueError:
+        return ""
+
+
+def registrable_domain(url_or_host: str) -> str:
+    """Registrable domain of a URL or host, e.g. example.co.uk"""
+    return get_public_suffix_list().registrable_domain(hostname(url_or_host))
+
+
+def site_root(url: str) -> str:
+    """scheme://host[:port] of a URL, or "" when it has no scheme and host"""
+    parts = urlsplit(url.strip())
+    if not parts.scheme or not parts.netloc:
+        return ""
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalise a URL so trivially different spellings of the same page compare equal
+
+    Lower-cases scheme and host, drops default ports, "www.", fragments and
+    tracking parameters, sorts the remaining query and removes a trailing slash.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        host = parts.hostname or ""
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _is_ip(host: str) -> bool:
+    return host.replace(".", "").isdigit() or ":" in host
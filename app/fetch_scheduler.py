@@ -0,0 +1,214 @@
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+
+class _HostState:
+    """Politeness bookkeeping for a single host"""
+
+    def __init__(self):
+        self.active = 0
+        self.next_allowed = 0.0
+        self.crawl_delay = None
+        self.crawl_delay_loaded = False
+        self.requests = 0
+        self.wait_time = 0.0
+
+
+class FetchScheduler:
+    """
+    Per-host politeness scheduler for HTTP fetches.
+
+    Each host gets its own request interval and concurrency limit, so a job that
+    touches many domains runs them concurrently while every individual site still
+    sees at most one request per interval. A robots.txt Crawl-delay larger than
+    the configured interval takes precedence for that host.
+    """
+
+    def __init__(self, delay: float = 1.0, per_host_concurrency: int = 1, max_workers: int = 8,
+                 crawl_delay_provider: Optional[Callable[[str], Optional[float]]] = None):
+        """
+        Initialise the scheduler
+
+        Args:
+            delay (float): Minimum seconds between request starts on the same host
+            per_host_concurrency (int): Maximum simultaneous requests per host
+            max_workers (int): Worker threads used by map()
+            crawl_delay_provider: Optional callable returning a host's robots Crawl-delay
+        """
+        self.delay = delay or 0.0
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.max_workers = max(1, max_workers)
+        self.crawl_delay_provider = crawl_delay_provider
+        self._hosts: Dict[str, _HostState] = {}
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Context manager that blocks until the URL's host may be fetched again
+
+        Usage:
+            with scheduler.slot(url):
+                response = session.get(url)
+        """
+        host = self._host(url)
+        self._load_crawl_delay(host)
+
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                wait_for = self._try_reserve(host)
+                if wait_for is None:
+                    self._hosts[host].wait_time += time.monotonic() - started
+                    break
+                self._cond.wait(timeout=wait_for)
+
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    def map(self, fn: Callable[[str], Any], urls: List[str]) -> List[Any]:
+        """
+        Apply fn to every URL, interleaving hosts that are ready to be fetched
+
+        Results are returned in the same order as urls. Exceptions raised by fn
+        are returned in place of the result for that URL.
+        """
+        queues: "OrderedDict[str, deque]" = OrderedDict()
+        for index, url in enumerate(urls):
+            host = self._host(url)
+            queues.setdefault(host, deque()).append((index, url))
+
+        for host in queues:
+            self._load_crawl_delay(host)
+
+        results: List[Any] = [None] * len(urls)
+
+        def worker():
+            while True:
+                task = self._take_ready(queues)
+                if task is None:
+                    return
+
+                index, url, host = task
+                try:
+                    results[index] = fn(url)
+                except Exception as e:
+                    results[index] = e
+                finally:
+                    self._release(host)
+
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(min(self.max_workers, len(urls)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def set_crawl_delay(self, host: str, seconds: Optional[float]) -> None:
+        """Override the crawl delay for a host (e.g. from robots.txt)"""
+        with self._cond:
+            state = self._hosts.setdefault(host.lower(), _HostState())
+            state.crawl_delay = seconds
+            state.crawl_delay_loaded = True
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts, accumulated wait time and effective interval"""
+        with self._cond:
+            return {
+                host: {
+                    "requests": state.requests,
+                    "wait_time": round(state.wait_time, 3),
+                    "interval": self._interval(state),
+                    "active": state.active
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def _take_ready(self, queues: "OrderedDict[str, deque]"):
+        """Block until some host with pending work is ready; None once all work is taken"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                if not any(queues.values()):
+                    return None
+
+                shortest_wait = None
+                for host in list(queues.keys()):
+                    if not queues[host]:
+                        continue
+
+                    wait_for = self._try_reserve(host)
+                    if wait_for is None:
+                        index, url = queues[host].popleft()
+                        # Rotate so the next worker starts with a different host
+                        queues.move_to_end(host)
+                        self._hosts[host].wait_time += time.monotonic() - started
+                        return index, url, host
+
+                    if shortest_wait is None or wait_for < shortest_wait:
+                        shortest_wait = wait_for
+
+                self._cond.wait(timeout=shortest_wait)
+
+    def _try_reserve(self, host: str) -> Optional[float]:
+        """
+        Reserve a request slot on host if it's ready (caller holds the lock)
+
+        Returns None when reserved, otherwise the seconds to wait before retrying
+        (a long-ish timeout when waiting on concurrency rather than time).
+        """
+        state = self._hosts.setdefault(host, _HostState())
+        now = time.monotonic()
+
+        if state.active >= self.per_host_concurrency:
+            return 1.0
+
+        if now < state.next_allowed:
+            return state.next_allowed - now
+
+        state.active += 1
+        state.requests += 1
+        # The interval is measured between request starts
+        state.next_allowed = now + self._interval(state)
+        return None
+
+    def _release(self, host: str) -> None:
+        """Free a host's concurrency slot and wake up waiting workers"""
+        with self._cond:
+            state = self._hosts.get(host)
+            if state and state.active > 0:
+                state.active -= 1
+            self._cond.notify_all()
+
+    def _interval(self, state: _HostState) -> float:
+        """Effective interval for a host: the larger of the configured and robots delays"""
+        return max(self.delay, state.crawl_delay or 0.0)
+
+    def _load_crawl_delay(self, host: str) -> None:
+        """Look up a host's crawl delay once, outside the scheduler lock"""
+        with self._cond:
+            state = self._hosts.setdefault(host, _HostState())
+            if state.crawl_delay_loaded or not self.crawl_delay_provider:
+                return
+            state.crawl_delay_loaded = True
+
+        try:
+            crawl_delay = self.crawl_delay_provider(host)
+        except Exception as e:
+            print(f"Warning: Could not get crawl delay for {host}: {e}")
+            crawl_delay = None
+
+        with self._cond:
+            state.crawl_delay = crawl_delay
+
+    def _host(self, url: str) -> str:
+        """Host key used for politeness limits"""
+        return urlparse(url).netloc.lower()
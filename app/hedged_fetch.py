@@ -0,0 +1,192 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+
+class LatencyTracker:
+    """Rolling window of fetch latencies used to pick the hedging threshold"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th quantile (0-1) of recent latencies, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(q * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class HedgedFetcher:
+    """
+    Runs a fetch with backup attempts for tail-latency control.
+
+    The first attempt starts straight away. If it hasn't produced a useful
+    result by the hedge delay (a percentile of recently observed latencies),
+    the next attempt starts alongside it, and so on. The first useful result
+    wins and the attempts still running are cancelled.
+
+    Each attempt is a (label, fetch, cancel) tuple: fetch() returns a result,
+    cancel() (optional) aborts it from another thread.
+    """
+
+    def __init__(self, enabled: bool = True, percentile: float = 0.9, min_delay: float = 2.0,
+                 default_delay: float = 8.0, min_samples: int = 5, max_workers: int = 4,
+                 is_useful: Optional[Callable[[Any], bool]] = None):
+        """
+        Initialise the fetcher
+
+        Args:
+            enabled (bool): When False only the first attempt is ever run
+            percentile (float): Latency percentile used as the hedge delay
+            min_delay (float): Never hedge sooner than this many seconds
+            default_delay (float): Hedge delay until enough latencies are observed
+            min_samples (int): Samples needed before the percentile is trusted
+            max_workers (int): Threads available for concurrent attempts
+            is_useful: Predicate deciding whether a result ends the race
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.is_useful = is_useful or self._has_content
+        self.latencies = LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedged-fetch")
+        self._lock = threading.Lock()
+        self.hedges_started = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait on an attempt before starting the next one"""
+        if len(self.latencies) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    def fetch(self, attempts: List[Tuple[str, Callable[[], Any], Optional[Callable[[], None]]]],
+              timeout: Optional[float] = None):
+        """
+        Run attempts with hedging and return (label, result) of the winner
+
+        If no attempt produces a useful result, the first attempt's result is
+        returned so callers still see its error. With a timeout (e.g. the time
+        left in a company's budget), attempts still running when it expires
+        are cancelled and an error result is returned.
+        """
+        if not attempts:
+            return None, None
+
+        if not self.enabled:
+            attempts = attempts[:1]
+        if len(attempts) == 1 and timeout is None:
+            label, fetch, _ = attempts[0]
+            return label, self._timed(fetch)
+
+        running = {}
+        results = {}
+        hedged = set()
+        next_index = 0
+        delay = self.hedge_delay()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def start_next():
+            nonlocal next_index
+            label, fetch, cancel = attempts[next_index]
+            future = self._executor.submit(self._timed, fetch)
+            running[future] = (next_index, label, cancel)
+            next_index += 1
+
+        start_next()
+        try:
+            while running:
+                can_hedge = next_index < len(attempts)
+                wait_for = delay if can_hedge else None
+                if deadline is not None:
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        print(f"Fetch gave up after {timeout:.1f}s, the time left for it")
+                        return attempts[0][0], {"error": "Time budget exhausted", "content": ""}
+                    wait_for = left if wait_for is None else min(wait_for, left)
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                if not done:
+                    if not can_hedge or time.monotonic() >= (deadline or float("inf")):
+                        continue  # out of time, handled at the top of the loop
+                    # Nothing back within the hedge delay: start a backup alongside
+                    print(f"Fetch slower than {delay:.1f}s, starting {attempts[next_index][0]} as a hedge")
+                    with self._lock:
+                        self.hedges_started += 1
+                    hedged.add(next_index)
+                    start_next()
+                    continue
+
+                for future in done:
+                    index, label, _ = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {"error": str(e), "content": ""}
+                    results[index] = (label, result)
+
+                    if self.is_useful(result):
+                        if index in hedged:
+                            with self._lock:
+                                self.hedges_won += 1
+                        return label, result
+
+                # A failed attempt shouldn't wait out the delay before the next one starts
+                if not running and next_index < len(attempts):
+                    start_next()
+        finally:
+            self._cancel(running)
+
+        return results.get(0, (attempts[0][0], None))
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedging counters and the current hedge delay"""
+        with self._lock:
+            return {
+                "hedges_started": self.hedges_started,
+                "hedges_won": self.hedges_won,
+                "hedge_delay": round(self.hedge_delay(), 2),
+                "samples": len(self.latencies)
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _timed(self, fetch: Callable[[], Any]) -> Any:
+        """Run one attempt, recording its latency when it succeeds"""
+        started = time.monotonic()
+        result = fetch()
+        if self.is_useful(result):
+            self.latencies.record(time.monotonic() - started)
+        return result
+
+    def _cancel(self, running: Dict) -> None:
+        """Cancel the attempts that lost the race"""
+        for future, (_, label, cancel) in running.items():
+            if future.cancel():
+                continue
+            if cancel is not None:
+                try:
+                    cancel()
+                except Exception as e:
+                    print(f"Warning: Could not cancel {label}: {e}")
+
+    def _has_content(self, result: Any) -> bool:
+        """Default usefulness check for scrape_url results"""
+        return bool(isinstance(result, dict) and result.get("content") and not result.get("error"))
@@ -0,0 +1,318 @@
+import time
+import socket
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+# httpx (with the h2 package) gives us HTTP/2; fall back to requests without it
+try:
+    import httpx
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Both requests and httpx decode brotli transparently when one of these is installed
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+
+# Ask for a single byte when a GET stands in for HEAD
+RANGE_PROBE_HEADERS = {"Range": "bytes=0-0"}
+
+
+class DNSCache:
+    """
+    Process-wide TTL cache in front of socket.getaddrinfo.
+
+    Installing it means repeated requests to the same host (including new
+    connections when the pool is exhausted) skip the resolver round trip.
+    """
+
+    _installed = None
+    _install_lock = threading.Lock()
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._cache: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._original_getaddrinfo = socket.getaddrinfo
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def install(cls, ttl: float = 300) -> "DNSCache":
+        """Install the cache once per process and return the active instance"""
+        with cls._install_lock:
+            if cls._installed is None:
+                cache = cls(ttl)
+                socket.getaddrinfo = cache.getaddrinfo
+                cls._installed = cache
+            return cls._installed
+
+    def getaddrinfo(self, host, port, *args, **kwargs):
+        """Cached drop-in replacement for socket.getaddrinfo"""
+        key = (host, port) + args + tuple(sorted(kwargs.items()))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+
+        result = self._original_getaddrinfo(host, port, *args, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = (now + self.ttl, result)
+
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the cache"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+
+class StreamedResponse:
+    """Body of a streamed GET, read up to a byte cap"""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes, truncated: bool, http_version: str):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.truncated = truncated
+        self.http_version = http_version
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("Content-Type", "")
+
+
+class HttpClient:
+    """
+    Long-lived pooled HTTP client shared by the HTTP scraping tier.
+
+    Connections are kept alive and reused per host, HTTP/2 is negotiated when
+    httpx and h2 are installed, DNS lookups are cached in-process and gzip/brotli
+    responses are decoded transparently.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 10,
+                 per_host_connections: int = 4, http2: bool = True, dns_cache_ttl: float = 300):
+        """
+        Initialise the client
+
+        Args:
+            headers (dict): Default headers sent with every request
+            timeout (float): Default request timeout in seconds
+            per_host_connections (int): Maximum pooled connections per host
+            http2 (bool): Use HTTP/2 where the server and installed packages support it
+            dns_cache_ttl (float): Seconds to cache DNS lookups (0 disables the cache)
+        """
+        self.timeout = timeout
+        self.per_host_connections = max(1, per_host_connections)
+        self.headers = dict(headers or {})
+        self.headers.setdefault(
+            "Accept-Encoding", "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+        )
+
+        self.dns_cache = DNSCache.install(dns_cache_ttl) if dns_cache_ttl else None
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections_opened = 0
+        self._http_versions: Dict[str, int] = {}
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+
+        self.backend = "httpx" if (http2 and HTTP2_AVAILABLE) else "requests"
+        if self.backend == "httpx":
+            self._client = httpx.Client(
+                http2=True,
+                headers=self.headers,
+                timeout=timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=100)
+            )
+        else:
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+            # pool_maxsize is per host; pool_block stops bursts from opening extra sockets
+            adapter = HTTPAdapter(pool_connections=100, pool_maxsize=self.per_host_connections, pool_block=True)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._adapter = adapter
+
+    def get(self, url: str, timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None):
+        """Send a GET request, following redirects"""
+        return self.request("GET", url, timeout=timeout, headers=headers)
+
+    def head(self, url: str, timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None):
+        """Send a HEAD request, following redirects"""
+        return self.request("HEAD", url, timeout=timeout, headers=headers)
+
+    def get_headers_only(self, url: str, timeout: Optional[float] = None):
+        """
+        Start a GET and close it as soon as the headers arrive, for servers
+        that don't implement HEAD properly. A one-byte Range is requested so
+        servers that honour it don't start sending the body at all.
+        """
+        timeout = timeout or self.timeout
+        with self._host_slot(url):
+            self._count_request()
+            if self.backend == "httpx":
+                with self._client.stream("GET", url, timeout=timeout, headers=RANGE_PROBE_HEADERS,
+                                         extensions=self._trace_extensions()) as response:
+                    self._count_version(response.http_version)
+                    return response
+
+            response = self._session.get(url, timeout=timeout, headers=RANGE_PROBE_HEADERS,
+                                         stream=True, allow_redirects=True)
+            response.close()
+            self._count_version(self._requests_version(response))
+            return response
+
+    def stream_get(self, url: str, max_bytes: int, timeout: Optional[float] = None,
+                   allowed=None) -> StreamedResponse:
+        """
+        GET a URL, reading the body only up to max_bytes
+
+        Raises the backend's HTTP error for 4xx/5xx responses before any of the
+        body is read. If allowed is given it is called with the Content-Type
+        header and the body is skipped entirely when it returns False.
+        """
+        timeout = timeout or self.timeout
+        with self._host_slot(url):
+            self._count_request()
+            if self.backend == "httpx":
+                with self._client.stream("GET", url, timeout=timeout, extensions=self._trace_extensions()) as response:
+                    self._count_version(response.http_version)
+                    response.raise_for_status()
+                    body, truncated = self._read_capped(
+                        response.iter_bytes(), max_bytes, response.headers, allowed
+                    )
+                    return StreamedResponse(str(response.url), response.status_code, response.headers,
+                                            body, truncated, response.http_version)
+
+            response = self._session.get(url, timeout=timeout, stream=True, allow_redirects=True)
+            try:
+                version = self._requests_version(response)
+                self._count_version(version)
+                response.raise_for_status()
+                body, truncated = self._read_capped(
+                    response.iter_content(chunk_size=16384), max_bytes, response.headers, allowed
+                )
+                return StreamedResponse(response.url, response.status_code, response.headers,
+                                        body, truncated, version)
+            finally:
+                response.close()
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None,
+                headers: Optional[Dict[str, str]] = None):
+        """Send a request through the pooled backend"""
+        timeout = timeout or self.timeout
+        with self._host_slot(url):
+            self._count_request()
+            if self.backend == "httpx":
+                response = self._client.request(
+                    method, url, timeout=timeout, headers=headers, extensions=self._trace_extensions()
+                )
+                self._count_version(response.http_version)
+                return response
+
+            response = self._session.request(method, url, timeout=timeout, headers=headers, allow_redirects=True)
+            self._count_version(self._requests_version(response))
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection reuse statistics for the client"""
+        with self._lock:
+            requests_sent = self._requests
+            connections = self._connections_opened
+            versions = dict(self._http_versions)
+
+        if self.backend == "requests":
+            connections = self._requests_connections_opened()
+
+        reused = max(0, requests_sent - connections)
+        return {
+            "backend": self.backend,
+            "requests": requests_sent,
+            "connections_opened": connections,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / requests_sent, 3) if requests_sent else 0.0,
+            "http_versions": versions,
+            "dns_cache": self.dns_cache.stats() if self.dns_cache else None
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        if self.backend == "httpx":
+            self._client.close()
+        else:
+            self._session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Per-host connection limit. requests enforces this in its pool already;
+        httpx only has global limits so it is enforced here.
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_connections)
+            return self._host_limits[host]
+
+    def _read_capped(self, chunks, max_bytes: int, headers, allowed):
+        """Read decoded chunks until max_bytes; returns (body, truncated)"""
+        if allowed is not None and not allowed(headers.get("Content-Type", "")):
+            return b"", False
+
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            if max_bytes and len(buffer) >= max_bytes:
+                return bytes(buffer[:max_bytes]), True
+        return bytes(buffer), False
+
+    def _count_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def _count_version(self, version: str) -> None:
+        with self._lock:
+            self._http_versions[version] = self._http_versions.get(version, 0) + 1
+
+    def _trace_extensions(self) -> Dict[str, Any]:
+        """httpcore trace hook used to count newly opened connections"""
+        def trace(event_name, info):
+            if event_name == "connection.connect_tcp.complete":
+                with self._lock:
+                    self._connections_opened += 1
+        return {"trace": trace}
+
+    def _requests_version(self, response) -> str:
+        """HTTP version of a requests/urllib3 response as a string"""
+        version = getattr(response.raw, "version", 11)
+        return {10: "HTTP/1.0", 11: "HTTP/1.1", 20: "HTTP/2"}.get(version, f"HTTP/{version}")
+
+    def _requests_connections_opened(self) -> int:
+        """Sum of connections urllib3 has opened across its per-host pools"""
+        pools = self._adapter.poolmanager.pools
+        total = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                total += getattr(pool, "num_connections", 0)
+        return total
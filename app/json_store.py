@@ -0,0 +1,117 @@
+import os
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+
+def load_json(path: str, label: str = "data") -> Optional[Any]:
+    """
+    Read a JSON store
+
+    Args:
+        path (str): JSON file
+        label (str): What the file holds, for warnings
+
+    Returns:
+        The parsed content, or None if the file is missing or unreadable
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Warning: Could not load {label} from {path}: {e}")
+        return None
+
+
+def update_json(path: str, merge: Callable[[Optional[Any]], Any], label: str = "data") -> Optional[Any]:
+    """
+    Merge changes into a JSON store shared with other processes
+
+    Several bulk workers (processes or machines on a shared volume) keep the
+    same stores. Under a lock file, the current file is re-read and handed to
+    merge, which returns the content to write; it is written to a temporary
+    file and moved into place, so readers never see a half-written file and
+    other writers' entries aren't lost. A file that can't be parsed is kept
+    as <path>.corrupt instead of being overwritten.
+
+    Args:
+        path (str): JSON file
+        merge: Called with the file's current content (None if missing), returns the new content
+        label (str): What the file holds, for warnings
+
+    Returns:
+        The content written, or None if it couldn't be saved
+    """
+    try:
+        with _file_lock(path):
+            current = None
+            if os.path.exists(path):
+                try:
+                    with open(path, "r") as f:
+                        current = json.load(f)
+                except json.JSONDecodeError as e:
+                    print(f"Warning: {path} is not valid JSON ({e}), keeping it as {path}.corrupt")
+                    os.replace(path, path + ".corrupt")
+
+            content = merge(current)
+
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(content, f, indent=2)
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            return content
+    except OSError as e:
+        print(f"Warning: Could not save {label}: {e}")
+        return None
+
+
+@contextmanager
+def _file_lock(path: str, timeout: float = 30):
+    """Exclusive lock on <path>.lock across processes (a no-op where file locks aren't available)"""
+    with open(path + ".lock", "a+") as lock_file:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        elif MSVCRT_AVAILABLE:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            yield
@@ -3,6 +3,7 @@ import sys
 import argparse
 from contact_finder import ContactFinder
 from bulk_contact_finder import BulkContactFinder
+from work_queue import open_work_queue, run_worker
 from contact_evaluator import ContactEvaluator
 import os
 import time
@@ -36,8 +37,28 @@ def main():
     bulk_parser.add_argument("--names", nargs="+", help="List of names to search")
     bulk_parser.add_argument("--query", help="Search query to use")
     bulk_parser.add_argument("--input-file", help="File with names to search (one per line)")
+    bulk_parser.add_argument("--refresh", metavar="RESULTS_JSON", help="Refresh a previous results file, re-processing only stale or changed companies")
+    bulk_parser.add_argument("--refresh-ttl-days", type=float, help="Reuse records younger than this many days (default from config)")
+    bulk_parser.add_argument("--processes", type=int, help="Spread companies across this many worker processes (default from config)")
+    bulk_parser.add_argument("--enqueue", action="store_true", help="Add the job to the shared work queue for `worker` processes instead of running it")
+    bulk_parser.add_argument("--queue", metavar="DB", help="Work queue database (default from config)")
     bulk_parser.add_argument("--config", default="config.json", help="Path to config file")
     
+    # Domain index command
+    domains_parser = subparsers.add_parser("domains", help="Manage the known business website index")
+    domains_parser.add_argument("--import-csv", metavar="FILE", help="Import name,website pairs from a CSV file")
+    domains_parser.add_argument("--lookup", metavar="NAME", help="Show the known website for a business name")
+    domains_parser.add_argument("--config", default="config.json", help="Path to config file")
+    
+    # Queue worker command
+    worker_parser = subparsers.add_parser("worker", help="Process bulk jobs from a shared work queue")
+    worker_parser.add_argument("--queue", metavar="DB", help="Work queue database (default from config)")
+    worker_parser.add_argument("--worker-id", help="Name recorded on leases (default host-pid)")
+    worker_parser.add_argument("--exit-when-idle", action="store_true", help="Stop once no task can be claimed")
+    worker_parser.add_argument("--status", action="store_true", help="Show queued jobs and their progress")
+    worker_parser.add_argument("--merge", metavar="JOB_ID", help="Save a finished job's results as CSV/JSON")
+    worker_parser.add_argument("--config", default="config.json", help="Path to config file")
+    
     # Find with evaluation command
     find_eval_parser = subparsers.add_parser("find-eval", help="Find and evaluate contact information")
     find_eval_parser.add_argument("business_name", help="Business name to search for")
@@ -134,10 +155,20 @@ def main():
     
     elif args.command == "bulk":
         bulk_finder = BulkContactFinder(config_path)
+        if args.processes:
+            bulk_finder.worker_processes = args.processes
         
         if args.interactive:
             # Run interactive mode
             bulk_finder.interactive_bulk_search()
+        elif args.refresh:
+            # Incremental refresh of a previous run
+            try:
+                filename = bulk_finder.refresh_bulk_results(args.refresh, args.refresh_ttl_days)
+            except (OSError, ValueError) as e:
+                print(f"Error: Could not refresh {args.refresh}: {e}")
+                sys.exit(1)
+            print(f"Refreshed results saved to {filename}")
         else:
             # Validate input
             if args.input_file:
@@ -159,8 +190,54 @@ def main():
                 print("Error: Please specify search query with --query")
                 sys.exit(1)
             
-            # Perform bulk search
-            bulk_finder.bulk_search(names, args.query)
+            if args.enqueue:
+                # Leave the work to `main.py worker` processes
+                queue = open_work_queue(bulk_finder.contact_finder.config_manager, args.queue)
+                job_id = bulk_finder.enqueue_bulk(names, args.query, queue, bool(bulk_finder.evaluator))
+                print(f"Start workers with: python main.py worker --queue {queue.path}")
+                print(f"Merge the results with: python main.py worker --queue {queue.path} --merge {job_id}")
+            else:
+                # Perform bulk search
+                bulk_finder.bulk_search(names, args.query)
+    
+    elif args.command == "worker":
+        bulk_finder = BulkContactFinder(config_path)
+        queue = open_work_queue(bulk_finder.contact_finder.config_manager, args.queue)
+        
+        if args.status:
+            for job in queue.jobs():
+                counts = ", ".join(f"{count} {status}" for status, count in job["status"].items())
+                print(f"{job['id']}: {job['query']!r}, {len(job['names'])} names ({counts})")
+        elif args.merge:
+            try:
+                filename = bulk_finder.merge_queued_results(queue, args.merge)
+            except ValueError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            print(f"Merged results saved to {filename}")
+        else:
+            run_worker(bulk_finder, queue, args.worker_id, args.exit_when_idle)
+    
+    elif args.command == "domains":
+        contact_finder = ContactFinder(config_path)
+        index = contact_finder.domain_index
+        
+        if args.import_csv:
+            try:
+                index.import_csv(args.import_csv)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        
+        if args.lookup:
+            entry, confidence = index.lookup(args.lookup)
+            if entry:
+                print(f"{entry['name']}: {entry['website']} (confidence {confidence:.2f}, seen {entry['hits']} times)")
+            else:
+                print(f"No known website for {args.lookup}")
+        
+        if not args.import_csv and not args.lookup:
+            print(f"Domain index holds {len(index)} businesses")
     
     elif args.command == "find-eval":
         # Create integrated evaluator
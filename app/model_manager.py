@@ -2,6 +2,7 @@ import os
 import ollama
 from typing import Dict, Any
 from config_manager import ConfigManager
+from singleflight import get_singleflight
 
 class ModelManager:
     """Manages the Ollama model creation and interaction"""
@@ -76,7 +77,10 @@ class ModelManager:
             return False
     
     def query_model(self, prompt: str) -> str:
-        """Query the Ollama model"""
+        """Query the Ollama model; identical prompts already running share the answer"""
+        return get_singleflight("model").do((self.model_name, prompt), lambda: self._query_model(prompt))
+    
+    def _query_model(self, prompt: str) -> str:
         try:
             response = ollama.generate(
                 model=self.model_name,
@@ -0,0 +1,74 @@
+import re
+import string
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+# Legal-form and filler words dropped when normalising business names
+LEGAL_SUFFIXES = {'ltd', 'limited', 'plc', 'llp', 'lp', 'inc', 'incorporated', 'corp', 'co', 'company', 'cic', 'the'}
+
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical form of a business name for matching
+
+    "The Wigan Youth Zone Ltd." and "wigan youth zone" both become "wigan youth zone".
+    Legal suffixes are dropped before words are split on hyphens and other
+    punctuation, so "Co-op Funeralcare" keeps its "co".
+    """
+    words = [word.strip(string.punctuation) for word in name.lower().replace('&', ' and ').split()]
+    words = [word for word in words if word not in LEGAL_SUFFIXES]
+    return " ".join(re.sub(r"[^\w\s]", " ", " ".join(words)).split())
+
+
+def name_similarity(a: str, b: str) -> float:
+    """Fuzzy similarity (0-1) of two already-normalised names"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    # Branch numbers ("Unit 1" / "Unit 2") make otherwise similar names different places
+    if re.findall(r'\d+', a) != re.findall(r'\d+', b):
+        return 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def name_key(name: str) -> str:
+    """
+    Key shared by names of the same organisation: its words apart from
+    legal suffixes, in any order
+
+    "Wigan Youth Zone Ltd" and "The Wigan Youth Zone" share a key; "St Mary's
+    Primary School" and "St Mark's Primary School" don't, since any differing
+    word may be a different organisation.
+    """
+    return " ".join(sorted(set(normalize_name(name).split())))
+
+
+def group_duplicate_names(names: List[str]) -> List[List[int]]:
+    """
+    Group names of the same organisation
+
+    Only names with the same name_key are grouped. Similar-looking names
+    ("Bolton Council" / "Boston Council") are often different organisations,
+    so they are never merged.
+
+    Args:
+        names (list): Names in input order
+
+    Returns:
+        list: Groups of indices into names, in order of first appearance
+    """
+    groups: List[List[int]] = []
+    by_key: Dict[str, int] = {}  # name key -> group
+
+    for index, name in enumerate(names):
+        key = name_key(name)
+        group = by_key.get(key) if key else None
+        if group is None:
+            group = len(groups)
+            groups.append([])
+            if key:
+                by_key[key] = group
+        groups[group].append(index)
+
+    return groups
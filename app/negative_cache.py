@@ -0,0 +1,170 @@
+import re
+import time
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+from domain_utils import hostname
+from json_store import load_json, update_json
+
+# How long each kind of failure is remembered, in seconds
+DEFAULT_TTLS = {
+    "dns": 6 * 3600,           # domain doesn't resolve
+    "timeout": 30 * 60,        # host didn't answer in time
+    "http_4xx": 24 * 3600,     # page missing or forbidden
+    "http_5xx": 30 * 60,       # server error, often transient
+    "empty_serp": 6 * 3600,    # search returned no usable URLs
+    "no_contacts": 7 * 86400,  # page loaded but had no contact details
+}
+
+# Failures that condemn the whole host rather than one URL
+DOMAIN_FAILURES = ("dns", "timeout")
+
+DNS_MARKERS = (
+    "name or service not known", "nodename nor servname", "getaddrinfo failed",
+    "name resolution", "err_name_not_resolved", "no address associated", "temporary failure in name"
+)
+TIMEOUT_MARKERS = ("timed out", "timeout", "err_timed_out", "err_connection_timed_out")
+
+
+def classify_failure(error: str) -> Optional[str]:
+    """
+    Map a fetch error message to a failure class
+
+    Returns:
+        str: "dns", "timeout", "http_4xx", "http_5xx", or None for errors not worth caching
+    """
+    if not error:
+        return None
+    lower = error.lower()
+    if any(marker in lower for marker in DNS_MARKERS):
+        return "dns"
+    if any(marker in lower for marker in TIMEOUT_MARKERS):
+        return "timeout"
+    status = re.search(r'\b([45]\d\d)\s+(?:client|server)\s+error|(?:status|http|error)\W{0,3}([45]\d\d)\b', lower)
+    if status:
+        code = status.group(1) or status.group(2)
+        return "http_4xx" if code.startswith("4") else "http_5xx"
+    return None
+
+
+def is_site_root(url: str) -> bool:
+    """True for a site's homepage ("https://example.com/", ".../index.html")"""
+    path = urlparse(url if "://" in url else f"https://{url}").path.strip("/").lower()
+    return path in ("", "home") or re.fullmatch(r"(index|default|home)\.\w+", path) is not None
+
+
+class NegativeCache:
+    """
+    Remembers recent failures so they aren't retried in full on every run.
+
+    Entries are keyed by host (DNS failures, timeouts), URL (HTTP errors,
+    pages without contact details) or search query (empty result pages), and
+    expire after the TTL configured for their failure class. The cache is
+    stored on disk so it carries over between runs.
+    """
+
+    def __init__(self, path: str = "negative_cache.json", ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialise the cache
+
+        Args:
+            path (str): JSON file holding the cache
+            ttls (dict): Per failure class TTLs in seconds, overriding DEFAULT_TTLS
+        """
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty: set = set()  # keys recorded since the last save
+        self.hits = 0
+
+    def check_url(self, url: str) -> Optional[str]:
+        """Failure class if url (or its host) failed recently, else None"""
+        return self._check(f"url:{url}") or self._check(f"host:{hostname(url)}")
+
+    def check_query(self, query: str, count_hit: bool = True) -> Optional[str]:
+        """Failure class (empty_serp) if this search recently found nothing, else None"""
+        return self._check(f"query:{query.strip().lower()}", count_hit)
+
+    def record_url_failure(self, url: str, failure: str, detail: str = "") -> None:
+        """Remember that fetching url failed with the given failure class"""
+        key = f"host:{hostname(url)}" if failure in DOMAIN_FAILURES else f"url:{url}"
+        self._record(key, failure, detail)
+
+    def record_fetch_error(self, url: str, error: str) -> Optional[str]:
+        """Classify a fetch error and remember it if it's a cacheable failure"""
+        failure = classify_failure(error)
+        if failure:
+            self.record_url_failure(url, failure, error[:200])
+        return failure
+
+    def record_empty_search(self, query: str) -> None:
+        self._record(f"query:{query.strip().lower()}", "empty_serp")
+
+    def record_no_contacts(self, url: str) -> None:
+        """
+        Remember a page that loaded without contact details. Homepages are
+        exempt: their details are often a link away (/contact), and caching
+        them would skip contact page discovery for the whole site.
+        """
+        if is_site_root(url):
+            return
+        self._record(f"url:{url}", "no_contacts")
+
+    def stats(self) -> Dict[str, Any]:
+        """Live entries per failure class and how many lookups were answered from the cache"""
+        now = time.time()
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for entry in self.entries.values():
+                if entry["expires"] > now:
+                    counts[entry["failure"]] = counts.get(entry["failure"], 0) + 1
+            return {"entries": counts, "hits": self.hits}
+
+    def _check(self, key: str, count_hit: bool = True) -> Optional[str]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            if entry["expires"] <= time.time():
+                del self.entries[key]
+                return None
+            if count_hit:
+                self.hits += 1
+            return entry["failure"]
+
+    def _record(self, key: str, failure: str, detail: str = "") -> None:
+        ttl = self.ttls.get(failure, 0)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self.entries[key] = {"failure": failure, "expires": time.time() + ttl, "detail": detail}
+            self._dirty.add(key)
+            self._save()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load unexpired entries from disk"""
+        return self._unexpired(load_json(self.path, "negative cache"))
+
+    def _save(self) -> None:
+        """Merge the entries recorded here into the cache on disk; the caller holds the lock"""
+        changed = {key: self.entries[key] for key in self._dirty}
+
+        def merge(current):
+            entries = self._unexpired(current)
+            entries.update(changed)
+            return entries
+
+        saved = update_json(self.path, merge, "negative cache")
+        if saved is not None:
+            # Pick up failures other workers have recorded meanwhile
+            self._dirty.clear()
+            self.entries = saved
+
+    @staticmethod
+    def _unexpired(entries: Any) -> Dict[str, Dict[str, Any]]:
+        if not isinstance(entries, dict):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if entry.get("expires", 0) > now}
@@ -2,6 +2,7 @@ import os
 import openai
 from typing import Dict, Any
 from config_manager import ConfigManager
+from singleflight import get_singleflight
 
 class OpenAIModelManager:
     """Manages OpenAI API interaction"""
@@ -35,7 +36,12 @@ class OpenAIModelManager:
         return True
     
     def query_model(self, prompt: str) -> str:
-        """Query the OpenAI model"""
+        """Query the OpenAI model; identical prompts already running share the answer"""
+        return get_singleflight("model").do(
+            (self.model_name, self.system_prompt_path, prompt), lambda: self._query_model(prompt)
+        )
+    
+    def _query_model(self, prompt: str) -> str:
         if not self.client:
             return "Error: OpenAI API key not configured"
             
@@ -0,0 +1,328 @@
+import time
+import random
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Any, Optional
+from urllib.parse import urlparse
+
+# HTTP statuses worth retrying, and the ones that say the host itself is unhealthy
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Exception class names (requests, httpx, urllib3, selenium) that indicate a transient failure
+RETRYABLE_ERROR_NAMES = (
+    "Timeout", "ConnectionError", "ConnectError", "NetworkError", "RemoteProtocolError",
+    "ReadError", "ProtocolError", "ChunkedEncodingError",
+)
+
+# Browser error strings for failures that won't go away by retrying straight away
+HOST_DOWN_MARKERS = ("ERR_NAME_NOT_RESOLVED", "ERR_CONNECTION_REFUSED", "ERR_CONNECTION_TIMED_OUT",
+                     "ERR_ADDRESS_UNREACHABLE", "Name or service not known", "nodename nor servname")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of fetching when a domain's circuit breaker is open"""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"Circuit open for {domain}, retry in {retry_in:.0f}s")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Per-domain circuit breaker.
+
+    After failure_threshold consecutive host failures the breaker opens and calls
+    fail fast. Once reset_timeout has passed a single trial call is let through
+    (half-open); success closes the breaker, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.short_circuited = 0
+        self.successes = 0
+        self.failures = 0
+        self._trial_in_progress = False
+
+    def allow(self) -> Optional[float]:
+        """Return None if a call may proceed, otherwise seconds until the next trial"""
+        if self.state == self.CLOSED:
+            return None
+
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == self.OPEN and elapsed >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return None
+
+        self.short_circuited += 1
+        return max(0.0, self.reset_timeout - elapsed)
+
+    def record_success(self) -> None:
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._trial_in_progress = False
+        self.state = self.CLOSED
+
+    def release(self) -> None:
+        """Give up a call without a verdict (e.g. it was cancelled), freeing a half-open trial"""
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._trial_in_progress = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current breaker state for metrics"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "successes": self.successes,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+        }
+
+
+class ResilienceLayer:
+    """
+    Shared retry and circuit-breaker layer for the HTTP and Selenium tiers.
+
+    Retryable errors are retried with exponentially growing, fully jittered
+    backoff; browser timeouts are not, as the browser has already waited
+    out its page load timeout. Host-level failures (timeouts, connection and DNS errors, 5xx)
+    count towards the domain's circuit breaker; while it is open, calls for
+    that domain raise CircuitOpenError immediately instead of waiting out
+    another timeout.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 failure_threshold: int = 3, reset_timeout: float = 300):
+        """
+        Initialise the layer
+
+        Args:
+            max_attempts (int): Total attempts per call, including the first
+            base_delay (float): Backoff ceiling for the first retry in seconds
+            max_delay (float): Upper bound for any single backoff
+            failure_threshold (int): Consecutive host failures that open a breaker
+            reset_timeout (float): Seconds a breaker stays open before a trial call
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+
+    def call(self, url: str, fn: Callable[[], Any], max_attempts: Optional[int] = None) -> Any:
+        """
+        Run fn for url with retries and the domain's circuit breaker
+
+        Args:
+            url (str): URL being fetched (its host selects the breaker)
+            fn: Zero-argument callable performing one attempt; raises on failure
+            max_attempts (int): Override the default number of attempts
+
+        Returns:
+            Whatever fn returns on success
+
+        Raises:
+            CircuitOpenError: If the domain's breaker is open
+            Exception: The last error once retries are exhausted or it isn't retryable
+        """
+        domain = self.domain_key(url)
+        attempts = max_attempts or self.max_attempts
+
+        for attempt in range(1, attempts + 1):
+            breaker = self._admit(domain)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._retry_delay(url, breaker, e, attempt, attempts)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+
+            with self._lock:
+                breaker.record_success()
+            return result
+
+    async def call_async(self, url: str, fn: Callable[[], Awaitable[Any]], max_attempts: Optional[int] = None) -> Any:
+        """
+        Coroutine equivalent of call() for the async fetch engine
+
+        Args:
+            url (str): URL being fetched (its host selects the breaker)
+            fn: Zero-argument callable returning an awaitable for one attempt
+            max_attempts (int): Override the default number of attempts
+
+        Returns:
+            Whatever the awaited attempt returns on success
+        """
+        domain = self.domain_key(url)
+        attempts = max_attempts or self.max_attempts
+
+        for attempt in range(1, attempts + 1):
+            breaker = self._admit(domain)
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                with self._lock:
+                    breaker.release()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(url, breaker, e, attempt, attempts)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+
+            with self._lock:
+                breaker.record_success()
+            return result
+
+    def _admit(self, domain: str) -> CircuitBreaker:
+        """Return the domain's breaker, raising CircuitOpenError if it is open"""
+        with self._lock:
+            breaker = self._breaker(domain)
+            retry_in = breaker.allow()
+        if retry_in is not None:
+            raise CircuitOpenError(domain, retry_in)
+        return breaker
+
+    def _retry_delay(self, url: str, breaker: CircuitBreaker, error: Exception,
+                     attempt: int, attempts: int) -> Optional[float]:
+        """Record a failed attempt; return the backoff before the next one, or None to give up"""
+        host_failure = self.is_host_failure(error)
+        with self._lock:
+            if host_failure:
+                breaker.record_failure()
+            else:
+                # The host answered; the error is about this URL, not the domain
+                breaker.record_success()
+
+        if attempt >= attempts or not self.is_retryable(error) or breaker.state == CircuitBreaker.OPEN:
+            return None
+
+        delay = self.backoff(attempt)
+        with self._lock:
+            self.retries += 1
+        print(f"Retrying {url} in {delay:.1f}s after error: {error}")
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given attempt number"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether an error is transient and worth retrying"""
+        if isinstance(error, CircuitOpenError) or self.is_browser_timeout(error):
+            return False
+
+        status = self._status_code(error)
+        if status is not None:
+            return status in RETRYABLE_STATUSES
+
+        message = str(error)
+        if any(marker in message for marker in HOST_DOWN_MARKERS):
+            return False
+
+        return any(name in type(error).__name__ for name in RETRYABLE_ERROR_NAMES)
+
+    def is_browser_timeout(self, error: Exception) -> bool:
+        """
+        Whether a Selenium wait timed out. The browser has already waited its
+        full page load timeout, so retrying would triple the wait on a dead
+        site; the failure still counts towards the domain's breaker.
+        """
+        return type(error).__module__.startswith("selenium") and "Timeout" in type(error).__name__
+
+    def is_host_failure(self, error: Exception) -> bool:
+        """Whether an error says the whole domain is unhealthy (vs. a single bad URL)"""
+        status = self._status_code(error)
+        if status is not None:
+            return status >= 500 or status == 429
+
+        message = str(error)
+        if any(marker in message for marker in HOST_DOWN_MARKERS):
+            return True
+
+        return any(name in type(error).__name__ for name in RETRYABLE_ERROR_NAMES)
+
+    def is_open(self, url: str) -> bool:
+        """Whether calls for url's domain are currently being short-circuited"""
+        with self._lock:
+            breaker = self._breakers.get(self.domain_key(url))
+            return bool(breaker and breaker.state == CircuitBreaker.OPEN
+                        and time.monotonic() - breaker.opened_at < breaker.reset_timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Retry count and per-domain breaker state"""
+        with self._lock:
+            breakers = {domain: breaker.snapshot() for domain, breaker in self._breakers.items()}
+            return {
+                "retries": self.retries,
+                "open_breakers": sorted(d for d, b in breakers.items() if b["state"] != CircuitBreaker.CLOSED),
+                "breakers": breakers,
+            }
+
+    def domain_key(self, url: str) -> str:
+        """Host used to key circuit breakers"""
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _breaker(self, domain: str) -> CircuitBreaker:
+        """Get or create the breaker for a domain (caller holds the lock)"""
+        if domain not in self._breakers:
+            self._breakers[domain] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self._breakers[domain]
+
+    def _status_code(self, error: Exception) -> Optional[int]:
+        """HTTP status attached to a requests/httpx HTTP error, if any"""
+        response = getattr(error, "response", None)
+        return getattr(response, "status_code", None)
+
+
+_shared_layer = None
+_shared_lock = threading.Lock()
+
+
+def get_resilience_layer(config_manager=None) -> ResilienceLayer:
+    """
+    Return the process-wide resilience layer, creating it from config on first use,
+    so every scraper shares the same breaker state
+    """
+    global _shared_layer
+    with _shared_lock:
+        if _shared_layer is None:
+            get = config_manager.get if config_manager else (lambda key, default=None: default)
+            _shared_layer = ResilienceLayer(
+                max_attempts=get("retry_attempts", 3),
+                base_delay=get("retry_base_delay", 0.5),
+                max_delay=get("retry_max_delay", 8.0),
+                failure_threshold=get("breaker_failure_threshold", 3),
+                reset_timeout=get("breaker_reset_timeout", 300)
+            )
+        return _shared_layer
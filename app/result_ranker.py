@@ -0,0 +1,217 @@
+import re
+import math
+import threading
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+from domain_utils import DomainSet, registrable_domain, get_public_suffix_list, hostname
+from json_store import load_json, update_json
+
+# Directory, review and aggregator sites that list a business rather than being it
+DIRECTORY_DOMAINS = [
+    'yell.com', 'yelp.com', 'yelp.co.uk', 'thomsonlocal.com', '192.com', 'scoot.co.uk',
+    'freeindex.co.uk', 'hotfrog.co.uk', 'cylex-uk.co.uk', 'misterwhat.co.uk', 'brownbook.net',
+    'checkatrade.com', 'trustpilot.com', 'tripadvisor.com', 'tripadvisor.co.uk', 'bark.com',
+    'ratedpeople.com', 'mybuilder.com', 'trustatrader.com', 'which.co.uk', 'yably.co.uk',
+    'endole.co.uk', 'companycheck.co.uk', 'opencorporates.com', 'dnb.com', 'bizdb.co.uk',
+    'company-information.service.gov.uk', 'companieshouse.gov.uk', 'zoominfo.com',
+    'glassdoor.com', 'glassdoor.co.uk', 'indeed.com', 'indeed.co.uk', 'crunchbase.com',
+    'bbc.co.uk', 'theguardian.com', 'dailymail.co.uk', 'telegraph.co.uk', 'independent.co.uk',
+    'mirror.co.uk', 'thesun.co.uk', 'standard.co.uk', 'yahoo.com', 'nextdoor.co.uk',
+]
+
+# Path fragments hinting at what a page is
+CONTACT_PATH_CUES = ('contact', 'get-in-touch', 'find-us', 'reach-us', 'enquir')
+ABOUT_PATH_CUES = ('about', 'locations', 'branches', 'offices', 'visit')
+ARTICLE_PATH_CUES = ('news', 'blog', 'article', 'press', 'jobs', 'careers', 'review', 'story', '/20')
+
+# How much each public suffix suggests a local business's own site
+TLD_WEIGHTS = {
+    'co.uk': 1.0, 'uk': 0.9, 'org.uk': 0.8, 'ltd.uk': 0.8, 'plc.uk': 0.8, 'nhs.uk': 0.8,
+    'gov.uk': 0.6, 'ac.uk': 0.6, 'com': 0.6, 'org': 0.5, 'net': 0.4, 'biz': 0.2, 'info': 0.2,
+}
+
+# Words that don't identify a business on their own
+NAME_STOPWORDS = {'the', 'and', 'ltd', 'limited', 'plc', 'llp', 'inc', 'co', 'company', 'group', 'uk', 'of'}
+
+# Starting weights; they are adjusted online from extraction outcomes
+DEFAULT_WEIGHTS = {
+    'bias': -2.0,
+    'name_similarity': 3.0,
+    'contact_path': 2.0,
+    'about_path': 0.8,
+    'article_path': -1.5,
+    'tld': 0.5,
+    'domain_yield': 3.0,
+    'directory': -3.0,
+    'depth': -0.5,
+}
+
+
+class ResultRanker:
+    """
+    Scores search result URLs before any of them are fetched.
+
+    Each URL is described by a few cheap features (how closely the registrable
+    domain matches the business name, path cues, TLD, the domain's past
+    extraction yield, directory-site membership) combined by a logistic model.
+    After a page is scraped, record_outcome() feeds back whether it produced
+    contact details, which updates both the per-domain yield and the weights.
+    """
+
+    def __init__(self, stats_path: str = "result_ranker_stats.json", learning_rate: float = 0.05,
+                 verbose: bool = False):
+        """
+        Initialise the ranker
+
+        Args:
+            stats_path (str): JSON file holding learned weights and per-domain yields
+            learning_rate (float): Step size for online weight updates
+            verbose (bool): Print scores when ranking
+        """
+        self.stats_path = stats_path
+        self.learning_rate = learning_rate
+        self.verbose = verbose
+        self.directories = DomainSet(DIRECTORY_DOMAINS)
+        self._lock = threading.Lock()
+        self.stats = self._load_stats()
+        self._pending = self._empty_changes()  # changes since the last save, merged into the file on save
+
+    def features(self, url: str, business_name: str) -> Dict[str, float]:
+        """Feature vector for one candidate URL"""
+        domain = registrable_domain(url)
+        suffix = get_public_suffix_list().public_suffix(hostname(url)) if domain else ''
+        label = domain[:-len(suffix) - 1] if suffix and domain.endswith('.' + suffix) else domain
+        path = urlparse(url).path.lower()
+        segments = [segment for segment in path.split('/') if segment]
+
+        return {
+            'bias': 1.0,
+            'name_similarity': self._name_similarity(business_name, label),
+            'contact_path': 1.0 if any(cue in path for cue in CONTACT_PATH_CUES) else 0.0,
+            'about_path': 1.0 if any(cue in path for cue in ABOUT_PATH_CUES) else 0.0,
+            'article_path': 1.0 if any(cue in path for cue in ARTICLE_PATH_CUES) else 0.0,
+            'tld': TLD_WEIGHTS.get(suffix, 0.1),
+            'domain_yield': self._domain_yield(domain),
+            'directory': 1.0 if url in self.directories else 0.0,
+            'depth': min(len(segments), 5) / 5,
+        }
+
+    def score(self, url: str, business_name: str) -> float:
+        """Probability-like score (0-1) that url yields contact details for the business"""
+        return self._predict(self.features(url, business_name))
+
+    def rank(self, urls: List[str], business_name: str, limit: Optional[int] = None,
+             min_score: float = 0.0) -> List[str]:
+        """
+        Order urls best first; ties keep search engine order
+
+        Args:
+            urls (list): Candidate URLs in search engine order
+            business_name (str): Business the URLs were found for
+            limit (int): Keep at most this many
+            min_score (float): Drop URLs scoring below this, always keeping the best one
+
+        Returns:
+            list: Ranked URLs
+        """
+        scores = {url: self.score(url, business_name) for url in urls}
+        ranked = sorted(urls, key=lambda url: scores[url], reverse=True)
+        if self.verbose:
+            for url in ranked:
+                print(f"  {scores[url]:.2f}  {url}")
+        ranked = ranked[:1] + [url for url in ranked[1:] if scores[url] >= min_score]
+        return ranked[:limit] if limit else ranked
+
+    def record_outcome(self, url: str, business_name: str, success: bool) -> None:
+        """
+        Learn from whether a scraped page produced contact details
+
+        Args:
+            url (str): Page that was scraped
+            business_name (str): Business it was scraped for
+            success (bool): Whether contact details were found
+        """
+        features = self.features(url, business_name)
+        domain = registrable_domain(url)
+
+        with self._lock:
+            error = (1.0 if success else 0.0) - self._predict(features)
+            weights = self.stats["weights"]
+            for name, value in features.items():
+                step = self.learning_rate * error * value
+                weights[name] = weights.get(name, 0.0) + step
+                self._pending["weights"][name] = self._pending["weights"].get(name, 0.0) + step
+
+            outcome = {"hits": 1 if success else 0, "tries": 1}
+            for counts in (self.stats["domains"], self._pending["domains"]):
+                entry = counts.setdefault(domain, {"hits": 0, "tries": 0})
+                for key, value in outcome.items():
+                    entry[key] += value
+
+            self._save_stats()
+
+    def _predict(self, features: Dict[str, float]) -> float:
+        weights = self.stats["weights"]
+        total = sum(weights.get(name, 0.0) * value for name, value in features.items())
+        return 1 / (1 + math.exp(-max(-30.0, min(30.0, total))))
+
+    def _name_similarity(self, business_name: str, label: str) -> float:
+        """Fuzzy match between the business name and a domain label, 0-1"""
+        tokens = [token for token in re.findall(r'[a-z0-9]+', business_name.lower()) if token not in NAME_STOPWORDS]
+        if not tokens or not label:
+            return 0.0
+        label = re.sub(r'[^a-z0-9]', '', label.lower())
+        joined = ''.join(tokens)
+        initials = ''.join(token[0] for token in tokens)
+
+        ratio = SequenceMatcher(None, joined, label).ratio()
+        # Domains often use part of the name ("smithplumbing" for "J Smith Plumbing & Heating")
+        covered = sum(len(token) for token in tokens if len(token) > 2 and token in label)
+        coverage = covered / max(len(label), 1)
+        acronym = 1.0 if len(initials) > 1 and label == initials else 0.0
+        return max(ratio, min(coverage, 1.0), acronym)
+
+    def _domain_yield(self, domain: str) -> float:
+        """Smoothed past hit rate for a domain, centred so an unseen domain scores 0"""
+        entry = self.stats["domains"].get(domain)
+        if not entry:
+            return 0.0
+        return (entry.get("hits", 0) + 0.5) / (entry.get("tries", 0) + 1) - 0.5
+
+    @staticmethod
+    def _empty_changes() -> Dict[str, Any]:
+        return {"weights": {}, "domains": {}}
+
+    @staticmethod
+    def _with_defaults(saved: Any) -> Dict[str, Any]:
+        stats = {"weights": dict(DEFAULT_WEIGHTS), "domains": {}}
+        if isinstance(saved, dict):
+            stats.update(saved)
+        return stats
+
+    def _load_stats(self) -> Dict[str, Any]:
+        """Load learned weights and yields from disk"""
+        return self._with_defaults(load_json(self.stats_path, "ranker stats"))
+
+    def _save_stats(self) -> None:
+        """
+        Add the changes made here to the stats on disk, so outcomes learnt by
+        other workers meanwhile are kept; the caller holds the lock
+        """
+        pending = self._pending
+
+        def merge(current):
+            stats = self._with_defaults(current)
+            for name, step in pending["weights"].items():
+                stats["weights"][name] = stats["weights"].get(name, 0.0) + step
+            for domain, change in pending["domains"].items():
+                entry = stats["domains"].setdefault(domain, {"hits": 0, "tries": 0})
+                for key, value in change.items():
+                    entry[key] = entry.get(key, 0) + value
+            return stats
+
+        saved = update_json(self.stats_path, merge, "ranker stats")
+        if saved is not None:
+            self._pending = self._empty_changes()
+            self.stats = saved
@@ -0,0 +1,247 @@
+import re
+import time
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse
+from http_client import HttpClient
+
+# Decisions memoised per host before the memo is reset
+MAX_DECISIONS_PER_HOST = 4096
+
+
+class _RobotsRules:
+    """Compiled rules from one robots.txt group"""
+
+    def __init__(self, rules: List[Tuple[int, bool, Any]], crawl_delay: Optional[float], status: str):
+        # (pattern length, allow, compiled pattern), longest first so the first match wins
+        self.rules = sorted(rules, key=lambda rule: (-rule[0], not rule[1]))
+        self.crawl_delay = crawl_delay
+        self.status = status
+        self.decisions: Dict[str, bool] = {}
+
+    def allowed(self, path: str) -> bool:
+        """Longest-match decision for a path, memoised"""
+        decision = self.decisions.get(path)
+        if decision is None:
+            decision = True
+            for _, allow, pattern in self.rules:
+                if pattern.match(path):
+                    decision = allow
+                    break
+            if len(self.decisions) >= MAX_DECISIONS_PER_HOST:
+                self.decisions.clear()
+            self.decisions[path] = decision
+        return decision
+
+
+class RobotsPolicy:
+    """
+    robots.txt cache and policy engine shared by the scraping tiers.
+
+    Each host's robots.txt is fetched once and its group for our user agent is
+    compiled (with * and $ wildcards and longest-match precedence). Rules are
+    cached for ttl seconds; missing files allow everything and unreachable ones
+    are negatively cached for a shorter time so a dead host isn't asked again on
+    every page. After the first lookup, allow/deny answers for a URL come from
+    a per-host memo.
+    """
+
+    def __init__(self, user_agent: str = "Mozilla/5.0", client=None, ttl: float = 86400,
+                 negative_ttl: float = 3600, respect_robots: bool = True, timeout: float = 10):
+        """
+        Initialise the policy
+
+        Args:
+            user_agent (str): User agent whose robots group applies
+            client: HttpClient used to fetch robots.txt (one is created lazily if omitted)
+            ttl (float): Seconds to cache a fetched robots.txt
+            negative_ttl (float): Seconds to cache a failed fetch
+            respect_robots (bool): When False every URL is allowed (crawl delays still apply)
+            timeout (float): Timeout for robots.txt requests
+        """
+        self.user_agent = user_agent
+        self.agent_tokens = [token.lower() for token in re.findall(r'[A-Za-z][\w\-]*', user_agent)]
+        self.client = client
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.respect_robots = respect_robots
+        self.timeout = timeout
+
+        self._cache: Dict[str, Tuple[float, _RobotsRules]] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch url"""
+        if not self.respect_robots:
+            return True
+
+        parsed = urlparse(url)
+        if not parsed.netloc or parsed.path == "/robots.txt":
+            return True
+
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        return self._rules(parsed.scheme or "https", parsed.netloc.lower()).allowed(path)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Crawl-delay requested for url's host, if any"""
+        parsed = urlparse(url)
+        return self._rules(parsed.scheme or "https", parsed.netloc.lower()).crawl_delay
+
+    def crawl_delay_for_host(self, host: str) -> Optional[float]:
+        """Crawl-delay for a bare host name (used by the politeness scheduler)"""
+        return self._rules("https", host.lower()).crawl_delay
+
+    def is_cached(self, url: str) -> bool:
+        """Whether url's host has fresh rules, i.e. allowed() won't hit the network"""
+        parsed = urlparse(url)
+        key = f"{parsed.scheme or 'https'}://{parsed.netloc.lower()}"
+        with self._lock:
+            entry = self._cache.get(key)
+            return bool(entry and entry[0] > time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and per-host status"""
+        with self._lock:
+            return {
+                "fetches": self.fetches,
+                "hits": self.hits,
+                "hosts": {key: entry[1].status for key, entry in self._cache.items()}
+            }
+
+    def _rules(self, scheme: str, host: str) -> _RobotsRules:
+        """Cached rules for a host, fetching robots.txt at most once per TTL"""
+        key = f"{scheme}://{host}"
+
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+
+        # Only one thread fetches a given host's robots.txt; the rest wait for its result
+        with host_lock:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry and entry[0] > time.monotonic():
+                    self.hits += 1
+                    return entry[1]
+
+            rules, ttl = self._fetch(key)
+            with self._lock:
+                self.fetches += 1
+                self._cache[key] = (time.monotonic() + ttl, rules)
+            return rules
+
+    def _fetch(self, base_url: str) -> Tuple[_RobotsRules, float]:
+        """Fetch and compile robots.txt; returns the rules and how long to cache them"""
+        try:
+            response = self._get_client().get(f"{base_url}/robots.txt", timeout=self.timeout)
+        except Exception:
+            return _RobotsRules([], None, "unreachable"), self.negative_ttl
+
+        if response.status_code >= 500:
+            return _RobotsRules([], None, f"error {response.status_code}"), self.negative_ttl
+        if response.status_code >= 400:
+            # No robots.txt means no restrictions
+            return _RobotsRules([], None, "missing"), self.ttl
+
+        rules, crawl_delay = self.parse(response.text)
+        return _RobotsRules(rules, crawl_delay, "ok"), self.ttl
+
+    def parse(self, text: str):
+        """
+        Pick the group for our user agent and compile its rules
+
+        Returns:
+            tuple: (list of (length, allow, pattern), crawl delay or None)
+        """
+        groups = []
+        current = None
+        last_was_agent = False
+
+        for raw_line in text.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = line.split(":", 1)
+            field, value = field.strip().lower(), value.strip()
+
+            if field == "user-agent":
+                if current is None or not last_was_agent:
+                    current = {"agents": [], "rules": [], "crawl_delay": None}
+                    groups.append(current)
+                current["agents"].append(value.lower())
+                last_was_agent = True
+                continue
+
+            last_was_agent = False
+            if current is None:
+                continue
+            if field in ("allow", "disallow") and value:
+                current["rules"].append((field == "allow", value))
+            elif field == "crawl-delay":
+                try:
+                    current["crawl_delay"] = float(value)
+                except ValueError:
+                    pass
+
+        group = self._select_group(groups)
+        if group is None:
+            return [], None
+
+        rules = [(len(path), allow, self._compile(path)) for allow, path in group["rules"]]
+        return rules, group["crawl_delay"]
+
+    def _select_group(self, groups: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Most specific group naming one of our agent tokens, else the * group"""
+        best, best_length, fallback = None, 0, None
+        for group in groups:
+            for agent in group["agents"]:
+                if agent == "*":
+                    fallback = fallback or group
+                elif agent in self.agent_tokens and len(agent) > best_length:
+                    best, best_length = group, len(agent)
+        return best or fallback
+
+    def _compile(self, path: str):
+        """Translate a robots path pattern (* and $ wildcards) to a regex"""
+        anchored = path.endswith("$")
+        if anchored:
+            path = path[:-1]
+        pattern = ".*".join(re.escape(part) for part in path.split("*"))
+        return re.compile(pattern + ("$" if anchored else ""))
+
+    def _get_client(self):
+        """Pooled client for robots requests, created on first use"""
+        if self.client is None:
+            self.client = HttpClient(headers={"User-Agent": self.user_agent}, timeout=self.timeout)
+        return self.client
+
+
+_shared_policy = None
+_shared_lock = threading.Lock()
+
+
+def get_robots_policy(config_manager=None) -> RobotsPolicy:
+    """
+    Return the process-wide robots policy, creating it from config on first use,
+    so every tier shares one robots.txt fetch per host
+    """
+    global _shared_policy
+    with _shared_lock:
+        if _shared_policy is None:
+            get = config_manager.get if config_manager else (lambda key, default=None: default)
+            _shared_policy = RobotsPolicy(
+                user_agent=get("user_agent", "Mozilla/5.0"),
+                ttl=get("robots_cache_ttl", 86400),
+                negative_ttl=get("robots_negative_ttl", 3600),
+                respect_robots=get("respect_robots", True),
+                timeout=get("request_timeout", 10)
+            )
+        return _shared_policy
@@ -0,0 +1,47 @@
+from web_scraper import WebScraper
+from config_manager import ConfigManager
+from resilience import get_resilience_layer
+from robots_policy import get_robots_policy
+from search_backends import build_search_manager
+
+def get_web_scraper(config_manager: ConfigManager):
+    """Factory function to get the HTTP fetch engine based on configuration"""
+    
+    engine = config_manager.get("http_engine", "sync").lower()
+    
+    if engine == "async":
+        try:
+            from async_web_scraper import AsyncWebScraperFacade
+            scraper = AsyncWebScraperFacade(
+                user_agent=config_manager.get("user_agent", "Mozilla/5.0"),
+                timeout=config_manager.get("request_timeout", 10),
+                delay=config_manager.get("request_delay", 1),
+                max_in_flight=config_manager.get("max_in_flight", 200),
+                per_host_connections=config_manager.get("per_host_connections", 4),
+                http2=config_manager.get("http2", True),
+                max_bytes=config_manager.get("max_response_bytes", 2000000),
+                robots=get_robots_policy(config_manager),
+                resilience=get_resilience_layer(config_manager)
+            )
+            scraper.search_manager = build_search_manager(config_manager, scraper)
+            return scraper
+        except RuntimeError as e:
+            print(f"Warning: {e}. Falling back to the synchronous scraper")
+    elif engine != "sync":
+        print(f"Warning: Unknown HTTP engine '{engine}', defaulting to sync")
+    
+    scraper = WebScraper(
+        user_agent=config_manager.get("user_agent", "Mozilla/5.0"),
+        timeout=config_manager.get("request_timeout", 10),
+        delay=config_manager.get("request_delay", 1),
+        per_host_concurrency=config_manager.get("per_host_concurrency", 1),
+        max_workers=config_manager.get("fetch_workers", 8),
+        per_host_connections=config_manager.get("per_host_connections", 4),
+        http2=config_manager.get("http2", True),
+        dns_cache_ttl=config_manager.get("dns_cache_ttl", 300),
+        resilience=get_resilience_layer(config_manager),
+        max_bytes=config_manager.get("max_response_bytes", 2000000),
+        robots=get_robots_policy(config_manager)
+    )
+    scraper.search_manager = build_search_manager(config_manager, scraper)
+    return scraper
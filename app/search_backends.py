@@ -0,0 +1,629 @@
+import json
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs, quote_plus
+from bs4 import BeautifulSoup
+from domain_utils import DomainSet, canonicalize_url, registrable_domain
+from singleflight import get_singleflight
+
+# Domains that never count as a business's own result
+EXCLUDED_DOMAINS = [
+    'google.com', 'google.co.uk', 'gstatic.com', 'googleapis.com',
+    'bing.com', 'microsoft.com', 'msn.com', 'live.com',
+    'youtube.com', 'facebook.com', 'twitter.com', 'instagram.com',
+    'linkedin.com', 'pinterest.com', 'reddit.com', 'amazon.com',
+    'wikipedia.org', 'wikimedia.org', 'apple.com', 'github.com',
+    'adobe.com', 'netflix.com', 'duckduckgo.com', 'mojeek.com'
+]
+
+# Search-engine navigation links rather than results
+EXCLUDED_PATTERNS = ['/search?', '/intl/', '/accounts/', '/policies/', '/preferences']
+
+EXCLUDED_DOMAIN_SET = DomainSet(EXCLUDED_DOMAINS)
+
+# Throttle, CAPTCHA and consent interstitials served instead of results
+BLOCK_URL_MARKERS = ('/sorry/', 'consent.google.', 'consent.yahoo.', '/captcha', '/challenge')
+BLOCK_PAGE_MARKERS = (
+    'unusual traffic from your computer network', 'our systems have detected unusual traffic',
+    'before you continue to google', 'g-recaptcha', 'id="captcha', 'class="captcha',
+    'anomaly-modal', 'bots use duckduckgo too', 'please solve the challenge',
+    'verify you are a human', 'cf-challenge'
+)
+
+# (final_url, html) fetcher used by the HTML SERP backends
+HtmlFetcher = Callable[[str], Tuple[str, str]]
+
+
+class SearchBackend:
+    """
+    Interface for search backends.
+
+    search() returns a dict with the backend name, a status ("ok", "error", or
+    "blocked" for throttle/CAPTCHA/consent pages), the result URLs in engine
+    order, and the raw SERP HTML when there is one.
+    """
+
+    name = "base"
+
+    def search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _response(self, status: str, urls: Optional[List[str]] = None, html: str = "",
+                  error: str = "") -> Dict[str, Any]:
+        response = {"backend": self.name, "status": status, "urls": urls or [], "html": html}
+        if error:
+            response["error"] = error
+        return response
+
+
+class HtmlSerpBackend(SearchBackend):
+    """
+    Base class for engines whose result pages are scraped as HTML.
+
+    Subclasses set the search URL template, the engine's own domains and the
+    CSS selector for result links; links are decoded from the engine's redirect
+    wrappers where needed.
+    """
+
+    name = "html"
+    search_url_template = ""
+    engine_domains: Tuple[str, ...] = ()
+    result_selector = ""
+
+    def __init__(self, fetch_html: HtmlFetcher, search_url_template: Optional[str] = None,
+                 name: Optional[str] = None):
+        """
+        Args:
+            fetch_html: Callable returning (final_url, html) for a URL, ("", "") style on failure
+            search_url_template (str): Override the engine URL; "{query}" is replaced,
+                otherwise the encoded query is appended
+            name (str): Override the backend name
+        """
+        self.fetch_html = fetch_html
+        self.engine_hosts = DomainSet(self.engine_domains)
+        if search_url_template:
+            self.search_url_template = search_url_template
+        if name:
+            self.name = name
+
+    def build_url(self, query: str) -> str:
+        if "{query}" in self.search_url_template:
+            return self.search_url_template.replace("{query}", quote_plus(query))
+        return self.search_url_template + quote_plus(query)
+
+    def search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+        search_url = self.build_url(query)
+        print(f"Searching with URL: {search_url}")
+        try:
+            final_url, html = self.fetch_html(search_url)
+        except Exception as e:
+            return self._response("error", error=str(e))
+
+        if self.is_blocked(final_url, html):
+            return self._response("blocked", error="Throttle, CAPTCHA or consent page instead of results")
+
+        if not html:
+            return self._response("error", error="Empty search page")
+
+        return self._response("ok", self.extract_urls(html)[:max_results * 3], html)
+
+    def extract_urls(self, html: str) -> List[str]:
+        """Result links in page order, falling back to every external link"""
+        soup = BeautifulSoup(html, "html.parser")
+        anchors = soup.select(self.result_selector) if self.result_selector else []
+        if not anchors:
+            anchors = soup.find_all("a", href=True)
+
+        urls = []
+        seen = set()
+        for anchor in anchors:
+            url = self.decode_link(anchor.get("href") or "")
+            if url and url.startswith("http") and not self._is_engine_link(url) and url not in seen:
+                seen.add(url)
+                urls.append(url)
+        return urls
+
+    def is_blocked(self, final_url: str, html: str) -> bool:
+        """Whether the engine answered with an interstitial rather than results"""
+        if final_url and any(marker in final_url.lower() for marker in BLOCK_URL_MARKERS):
+            return True
+        if not html:
+            return False
+        lower_html = html.lower()
+        return any(marker in lower_html for marker in BLOCK_PAGE_MARKERS)
+
+    def decode_link(self, href: str) -> str:
+        """Unwrap engine redirect links; plain links pass through"""
+        return href
+
+    def _is_engine_link(self, url: str) -> bool:
+        return url in self.engine_hosts
+
+
+class GoogleBackend(HtmlSerpBackend):
+    name = "google"
+    search_url_template = "https://www.google.com/search?q={query}"
+    engine_domains = ("google.com", "google.co.uk", "gstatic.com", "googleapis.com", "googleusercontent.com")
+    result_selector = "div#search a[href]"
+
+    def decode_link(self, href: str) -> str:
+        # Non-JS result pages wrap links as /url?q=<target>
+        if href.startswith("/url?"):
+            return parse_qs(urlparse(href).query).get("q", [""])[0]
+        return href
+
+
+class BingBackend(HtmlSerpBackend):
+    name = "bing"
+    search_url_template = "https://www.bing.com/search?q={query}"
+    engine_domains = ("bing.com", "microsoft.com", "msn.com", "live.com")
+    result_selector = "li.b_algo h2 a[href]"
+
+
+class DuckDuckGoBackend(HtmlSerpBackend):
+    name = "duckduckgo"
+    search_url_template = "https://html.duckduckgo.com/html/?q={query}"
+    engine_domains = ("duckduckgo.com",)
+    result_selector = "a.result__a[href]"
+
+    def decode_link(self, href: str) -> str:
+        # Results go through //duckduckgo.com/l/?uddg=<target>
+        if "uddg=" in href:
+            return parse_qs(urlparse(href).query).get("uddg", [""])[0]
+        return href
+
+
+class MojeekBackend(HtmlSerpBackend):
+    name = "mojeek"
+    search_url_template = "https://www.mojeek.com/search?q={query}"
+    engine_domains = ("mojeek.com",)
+    result_selector = "ul.results-standard a.title[href]"
+
+
+class LocalSearchBackend(SearchBackend):
+    """
+    Offline stand-in backend for tests and demos.
+
+    Results come from a dict (or JSON file) mapping queries to URL lists;
+    a query matches an entry when the entry's key appears in it, case-insensitively.
+    An optional delay simulates a slow engine.
+    """
+
+    name = "local"
+
+    def __init__(self, results: Optional[Dict[str, List[str]]] = None, fixtures_path: Optional[str] = None,
+                 delay: float = 0.0, name: Optional[str] = None):
+        self.results = {key.lower(): urls for key, urls in (results or {}).items()}
+        if fixtures_path and os.path.exists(fixtures_path):
+            with open(fixtures_path, "r") as f:
+                self.results.update({key.lower(): urls for key, urls in json.load(f).items()})
+        self.delay = delay
+        if name:
+            self.name = name
+
+    def search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+        if self.delay:
+            time.sleep(self.delay)
+
+        query = query.lower()
+        urls = []
+        for key, candidates in self.results.items():
+            if key in query:
+                urls.extend(url for url in candidates if url not in urls)
+        return self._response("ok", urls[:max_results * 3])
+
+
+class SearchCooldowns:
+    """
+    Process-wide cooldowns for search backends that served throttle pages.
+
+    Each consecutive block doubles the backend's cooldown (from base_delay up
+    to max_delay); a successful search resets it.
+    """
+
+    def __init__(self, base_delay: float = 60, max_delay: float = 3600):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._state: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def remaining(self, name: str) -> float:
+        """Seconds until backend name may be used again (0 when available)"""
+        with self._lock:
+            state = self._state.get(name)
+            return max(0.0, state["until"] - time.monotonic()) if state else 0.0
+
+    def available(self, name: str) -> bool:
+        return self.remaining(name) == 0
+
+    def record_blocked(self, name: str) -> float:
+        """Start (or extend) a backend's cooldown and return its length"""
+        with self._lock:
+            state = self._state.setdefault(name, {"strikes": 0, "until": 0.0})
+            state["strikes"] += 1
+            delay = min(self.max_delay, self.base_delay * (2 ** (state["strikes"] - 1)))
+            state["until"] = time.monotonic() + delay
+        print(f"Search backend {name} is blocking requests, cooling down for {delay:.0f}s")
+        return delay
+
+    def record_ok(self, name: str) -> None:
+        with self._lock:
+            self._state.pop(name, None)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Strikes and remaining cooldown per throttled backend"""
+        now = time.monotonic()
+        with self._lock:
+            return {name: {"strikes": int(state["strikes"]), "cooldown_remaining": round(max(0.0, state["until"] - now), 1)}
+                    for name, state in self._state.items()}
+
+
+class SearchResultCache:
+    """Recent successful result lists, served while every backend is blocked or failing"""
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[List[str]]:
+        key = query.strip().lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            stored_at, urls = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            return list(urls)
+
+    def put(self, query: str, urls: List[str]) -> None:
+        key = query.strip().lower()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), list(urls))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_shared_cooldowns: Optional[SearchCooldowns] = None
+_shared_result_cache: Optional[SearchResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_search_cooldowns(config_manager=None) -> SearchCooldowns:
+    """Return the process-wide backend cooldowns, creating them from config on first use"""
+    global _shared_cooldowns
+    with _shared_lock:
+        if _shared_cooldowns is None:
+            get = config_manager.get if config_manager else (lambda key, default=None: default)
+            _shared_cooldowns = SearchCooldowns(
+                base_delay=get("search_cooldown_base", 60),
+                max_delay=get("search_cooldown_max", 3600)
+            )
+        return _shared_cooldowns
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """Return the process-wide cache of recent search results"""
+    global _shared_result_cache
+    with _shared_lock:
+        if _shared_result_cache is None:
+            _shared_result_cache = SearchResultCache()
+        return _shared_result_cache
+
+
+class _ResultMerger:
+    """Filters, dedups and orders URLs as they arrive from backends"""
+
+    def __init__(self):
+        self.result_urls: List[str] = []
+        self.seen_urls = set()     # canonical URLs
+        self.seen_domains = set()  # registrable domains
+
+    def add_all(self, urls: List[str], max_results: int) -> None:
+        for href in urls:
+            if len(self.result_urls) >= max_results:
+                return
+            self.add(href)
+
+    def add(self, href: str) -> bool:
+        # Skip URLs we've already processed
+        if not href or not href.startswith('http'):
+            return False
+        canonical = canonicalize_url(href)
+        if canonical in self.seen_urls:
+            return False
+
+        # Skip URLs with specific patterns or from excluded domains
+        if href in EXCLUDED_DOMAIN_SET or any(pattern in href for pattern in EXCLUDED_PATTERNS):
+            return False
+
+        # Skip if we already have a URL from this site, unless it's a contact page
+        domain = registrable_domain(href)
+        if domain in self.seen_domains and 'contact' not in href.lower():
+            return False
+
+        self.seen_urls.add(canonical)
+        self.seen_domains.add(domain)
+
+        # Prioritize contact pages
+        if 'contact' in href.lower():
+            self.result_urls.insert(0, href)
+            print(f"Added priority result URL: {href}")
+        else:
+            self.result_urls.append(href)
+            print(f"Added result URL: {href}")
+        return True
+
+
+def prioritise_results(result_urls: List[str], query: str, max_results: int) -> List[str]:
+    """Dedup by base URL and order contact pages, then the target domain, then the rest"""
+    if not result_urls:
+        print("WARNING: Could not get any search results")
+
+        # Try directly accessing the website if it's in the query
+        website_hints = [x for x in query.split() if '.com' in x or '.org' in x or '.co.uk' in x or '.nhs.uk' in x]
+        hinted = []
+        for hint in website_hints:
+            if not hint.startswith('http'):
+                hint = 'https://' + hint
+            hinted.append(hint)
+            print(f"Added direct website URL from query: {hint}")
+        return hinted
+
+    # Remove duplicates while preserving order
+    unique_results = []
+    seen = set()
+    for url in result_urls:
+        canonical = canonicalize_url(url)
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        unique_results.append(url)
+
+    # Re-sort URLs to prioritize contact pages and the target domain
+    contact_urls = []
+    target_domain_urls = []
+    other_urls = []
+
+    target_domains = {registrable_domain(part) for part in query.split() if '.' in part}
+
+    for url in unique_results:
+        if '/contact' in url.lower():
+            contact_urls.append(url)
+        elif registrable_domain(url) in target_domains:
+            target_domain_urls.append(url)
+        else:
+            other_urls.append(url)
+
+    return (contact_urls + target_domain_urls + other_urls)[:max_results]
+
+
+class SearchManager:
+    """
+    Runs a query against one or more search backends.
+
+    In fan-out mode every backend is queried in parallel and results are merged
+    as they arrive; the search returns as soon as enough good URLs are in, so one
+    slow or blocked engine doesn't hold up the rest. In sequential mode backends
+    are tried in order until enough URLs are found.
+
+    Backends that serve throttle or CAPTCHA pages are put on a shared cooldown
+    and skipped; while every backend is cooling down, recent cached results are
+    used, or the search waits (up to max_block_wait) for the first backend to
+    come back rather than returning nothing.
+    """
+
+    def __init__(self, backends: List[SearchBackend], mode: str = "sequential", timeout: float = 30,
+                 cooldowns: Optional[SearchCooldowns] = None, result_cache: Optional[SearchResultCache] = None,
+                 max_block_wait: float = 0):
+        """
+        Args:
+            backends (list): SearchBackend instances, in preference order
+            mode (str): "sequential" (default) or "fanout"
+            timeout (float): Overall seconds to wait for backends in fan-out mode
+            cooldowns (SearchCooldowns): Shared backend cooldowns, a private set if None
+            result_cache (SearchResultCache): Shared recent results, a private cache if None
+            max_block_wait (float): Longest wait for a cooling-down backend when none is available
+        """
+        self.backends = backends
+        self.mode = mode
+        self.timeout = timeout
+        self.cooldowns = cooldowns or SearchCooldowns()
+        self.result_cache = result_cache or SearchResultCache()
+        self.max_block_wait = max_block_wait
+
+    def search(self, query: str, max_results: int = 5) -> List[str]:
+        """Return up to max_results URLs for query"""
+        return self.search_detailed(query, max_results)["urls"]
+
+    def search_detailed(self, query: str, max_results: int = 5, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Search and also return each backend's response (status and SERP HTML)
+
+        Args:
+            query (str): Search query
+            max_results (int): Result URLs wanted
+            timeout (float): Seconds the whole search may take, e.g. what is left of a
+                company's budget (fan-out never waits longer than the manager's timeout)
+
+        Returns:
+            dict: {"urls": [...], "responses": [...], "status": "ok"|"cached"|"blocked"|"error"}
+            "ok" means at least one backend answered; "error" means none did
+            (network failures, open breakers, timeouts), so an empty result
+            says nothing about the query.
+        """
+        # Identical searches running at the same time share one set of backend requests
+        key = (query.strip().lower(), max_results, tuple(backend.name for backend in self.backends))
+        return get_singleflight("search").do(key, lambda: self._search_detailed(query, max_results, timeout))
+
+    def _search_detailed(self, query: str, max_results: int, timeout: Optional[float] = None) -> Dict[str, Any]:
+        backends = self._available_backends()
+        if not backends:
+            cached = self.result_cache.get(query)
+            if cached is not None:
+                print("All search backends are cooling down, using cached results")
+                return {"urls": cached[:max_results], "responses": [], "status": "cached"}
+            backends = self._wait_for_backend(timeout)
+            if not backends:
+                print("All search backends are blocked")
+                return {"urls": [], "responses": [], "status": "blocked"}
+
+        merger = _ResultMerger()
+        if self.mode == "fanout" and len(backends) > 1:
+            responses = self._fan_out(backends, query, max_results, merger, timeout)
+        else:
+            responses = self._sequential(backends, query, max_results, merger, timeout)
+
+        urls = prioritise_results(merger.result_urls, query, max_results)
+        if merger.result_urls:
+            self.result_cache.put(query, urls)
+        elif any(response["status"] == "blocked" for response in responses):
+            cached = self.result_cache.get(query)
+            if cached is not None:
+                print("Search was blocked, using cached results")
+                return {"urls": cached[:max_results], "responses": responses, "status": "cached"}
+            return {"urls": urls, "responses": responses, "status": "blocked"}
+        elif not any(response["status"] == "ok" for response in responses):
+            cached = self.result_cache.get(query)
+            if cached is not None:
+                print("Search backends failed, using cached results")
+                return {"urls": cached[:max_results], "responses": responses, "status": "cached"}
+            print("No search backend answered")
+            return {"urls": urls, "responses": responses, "status": "error"}
+
+        return {"urls": urls, "responses": responses, "status": "ok"}
+
+    def _available_backends(self) -> List[SearchBackend]:
+        available = [backend for backend in self.backends if self.cooldowns.available(backend.name)]
+        skipped = len(self.backends) - len(available)
+        if skipped and available:
+            print(f"Skipping {skipped} search backend(s) on cooldown")
+        return available
+
+    def _wait_for_backend(self, timeout: Optional[float] = None) -> List[SearchBackend]:
+        """Sleep until the first backend's cooldown ends, if that's within max_block_wait (and timeout)"""
+        if not self.backends:
+            return []
+        wait = min(self.cooldowns.remaining(backend.name) for backend in self.backends)
+        limit = self.max_block_wait if timeout is None else min(self.max_block_wait, timeout)
+        if wait > limit:
+            return []
+        print(f"All search backends are cooling down, waiting {wait:.0f}s")
+        time.sleep(wait)
+        return self._available_backends()
+
+    def _sequential(self, backends: List[SearchBackend], query: str, max_results: int,
+                    merger: _ResultMerger, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        responses = []
+        started = time.monotonic()
+        for backend in backends:
+            if len(merger.result_urls) >= max_results:
+                break  # If we already have enough results, don't try other engines
+            if timeout is not None and responses and time.monotonic() - started >= timeout:
+                print(f"Search ran past {timeout:.0f}s; using results so far")
+                break
+            response = self._run_backend(backend, query, max_results)
+            responses.append(response)
+            merger.add_all(response["urls"], max_results)
+        return responses
+
+    def _fan_out(self, backends: List[SearchBackend], query: str, max_results: int,
+                 merger: _ResultMerger, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        responses = []
+        executor = ThreadPoolExecutor(max_workers=len(backends), thread_name_prefix="search")
+        futures = {executor.submit(self._run_backend, backend, query, max_results): backend
+                   for backend in backends}
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                response = future.result()
+                responses.append(response)
+                merger.add_all(response["urls"], max_results)
+                if len(merger.result_urls) >= max_results:
+                    print(f"Enough results from {len(responses)} of {len(futures)} search backends")
+                    break
+        except FuturesTimeoutError:
+            print(f"Search backends timed out after {timeout:.0f}s; using results so far")
+        finally:
+            # Slow engines finish in the background but are no longer waited on
+            executor.shutdown(wait=False, cancel_futures=True)
+        return responses
+
+    def _run_backend(self, backend: SearchBackend, query: str, max_results: int) -> Dict[str, Any]:
+        try:
+            response = backend.search(query, max_results)
+        except Exception as e:
+            print(f"Search error with {backend.name}: {e}")
+            return {"backend": backend.name, "status": "error", "urls": [], "html": "", "error": str(e)}
+
+        if response["status"] == "blocked":
+            self.cooldowns.record_blocked(backend.name)
+        elif response["status"] == "ok":
+            self.cooldowns.record_ok(backend.name)
+        return response
+
+
+BACKEND_CLASSES = {
+    "google": GoogleBackend,
+    "bing": BingBackend,
+    "duckduckgo": DuckDuckGoBackend,
+    "mojeek": MojeekBackend,
+}
+
+
+def build_search_manager(config_manager, web_scraper=None, browser=None) -> SearchManager:
+    """
+    Build the search layer from configuration
+
+    Args:
+        config_manager: ConfigManager with search_backends, search_mode etc.
+        web_scraper: HTTP-tier scraper used to fetch result pages
+        browser: Optional SeleniumScraper; Google is fetched through it when given,
+            as Google rarely serves results to plain HTTP clients
+
+    Returns:
+        SearchManager
+    """
+    names = config_manager.get("search_backends", ["google", "bing", "duckduckgo"])
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",") if name.strip()]
+
+    def http_fetch(url):
+        return web_scraper.fetch_html(url, check_robots=False)
+
+    backends = []
+    for name in names:
+        name = name.lower()
+        if name == "local":
+            backends.append(LocalSearchBackend(fixtures_path=config_manager.get("search_fixtures_path")))
+        elif name == "custom":
+            template = config_manager.get("search_engine")
+            if template and web_scraper is not None:
+                backends.append(HtmlSerpBackend(http_fetch, search_url_template=template, name="custom"))
+        elif name in BACKEND_CLASSES:
+            if name == "google" and browser is not None:
+                backends.append(GoogleBackend(browser.fetch_page_source))
+            elif web_scraper is not None:
+                backends.append(BACKEND_CLASSES[name](http_fetch))
+        else:
+            print(f"Warning: Unknown search backend '{name}', skipping")
+
+    if not backends and browser is not None:
+        backends.append(GoogleBackend(browser.fetch_page_source))
+
+    return SearchManager(
+        backends,
+        mode=config_manager.get("search_mode", "sequential"),
+        timeout=config_manager.get("search_timeout", 30),
+        cooldowns=get_search_cooldowns(config_manager),
+        result_cache=get_search_result_cache(),
+        max_block_wait=config_manager.get("search_block_max_wait", 300)
+    )
@@ -252,12 +252,18 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 import time
+import threading
 from bs4 import BeautifulSoup
+from resilience import CircuitOpenError, get_resilience_layer
+from robots_policy import get_robots_policy
+from search_backends import SearchManager, GoogleBackend
+from singleflight import get_singleflight
 
 class SeleniumScraper:
     """Selenium-based scraper with improved error handling"""
     
-    def __init__(self, headless=True, timeout=30):
+    def __init__(self, headless=True, timeout=30, resilience=None, http_scraper=None, robots=None,
+                 search_manager=None):
         # Configure Chrome options
         self.options = Options()
         if headless:
@@ -277,6 +283,22 @@ class SeleniumScraper:
         self.timeout = timeout
         self.service = Service(ChromeDriverManager().install())
         self.driver = None
+        
+        # Retries and per-domain circuit breakers are shared with the HTTP tier
+        self.resilience = resilience or get_resilience_layer()
+        
+        # Optional HTTP-tier scraper used to probe URLs before spending a browser on them
+        self.http_scraper = http_scraper
+        
+        # Same robots.txt cache as the HTTP tier, so each host's file is fetched once
+        self.robots = robots or get_robots_policy()
+        
+        # One page at a time per browser; cancel() can abort it from another thread
+        self._scrape_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        
+        # Search backends (see search_backends.build_search_manager); Google via this browser if unset
+        self.search_manager = search_manager
     
     def _create_driver(self):
         """Create a new WebDriver instance"""
@@ -327,175 +349,96 @@ class SeleniumScraper:
     
     def search(self, query, max_results=5):
         """
-        Perform a search with improved error handling and better filtering
-        of irrelevant domains and search engine results
+        Search for a query and return up to max_results result URLs.
+        Uses the configured search backends when a search manager is set,
+        otherwise Google through this browser.
         """
-        # Prepare multiple search engines in case one fails
-        search_engines = [
-            f"https://www.google.com/search?q={query.replace(' ', '+')}",
-        ]
-        
-        result_urls = []
-        # Track URLs we've already seen to prevent duplicates
-        seen_urls = set()
-        
-        for search_url in search_engines:
-            if len(result_urls) >= max_results:
-                break  # If we already have enough results, don't try other engines
-                
+        if self.search_manager is None:
+            self.search_manager = SearchManager([GoogleBackend(self.fetch_page_source)])
+        return self.search_manager.search(query, max_results)
+    
+    def search_detailed(self, query, max_results=5, timeout=None):
+        """
+        Like search(), but also returns each backend's response including the SERP HTML.
+        timeout caps the whole search, e.g. to what is left of a company's budget.
+        """
+        if self.search_manager is None:
+            self.search_manager = SearchManager([GoogleBackend(self.fetch_page_source)])
+        return self.search_manager.search_detailed(query, max_results, timeout)
+    
+    def fetch_page_source(self, url):
+        """
+        Load a page (e.g. a search results page) in the browser and return
+        (final_url, page_source), or (url, "") on failure
+        """
+        with self._scrape_lock:
             try:
-                print(f"Searching with URL: {search_url}")
                 self._create_driver()
-                self.driver.get(search_url)
+                self.driver.get(url)
                 time.sleep(3)  # Wait for page to load
                 
                 # Handle cookies banner if present
                 self._handle_cookies_popup()
                 
-                # Wait for search results to load
+                # Wait for links to load
                 WebDriverWait(self.driver, 10).until(
                     EC.presence_of_element_located((By.TAG_NAME, "a"))
                 )
-                
-                # Find all links
-                links = self.driver.find_elements(By.TAG_NAME, 'a')
-                print(f"Found {len(links)} links on search page")
-                
-                # Comprehensive list of domains to exclude
-                excluded_domains = [
-                    'google.com', 'google.co.uk', 'gstatic.com', 'googleapis.com',
-                    'bing.com', 'microsoft.com', 'msn.com', 'live.com',
-                    'youtube.com', 'facebook.com', 'twitter.com', 'instagram.com',
-                    'linkedin.com', 'pinterest.com', 'reddit.com', 'amazon.com',
-                    'wikipedia.org', 'wikimedia.org', 'apple.com', 'github.com',
-                    'adobe.com', 'netflix.com'
-                ]
-                
-                # Extract result URLs with better filtering
-                for link in links:
-                    try:
-                        href = link.get_attribute("href")
-                        
-                        # Skip URLs we've already processed
-                        if href in seen_urls:
-                            continue
-                        
-                        # Process and filter URLs
-                        if href and href.startswith('http'):
-                            # Extract the base domain for duplicate checking
-                            base_domain = None
-                            if '://' in href:
-                                try:
-                                    domain_part = href.split('://', 1)[1].split('/', 1)[0]
-                                    base_domain = '.'.join(domain_part.split('.')[-2:])
-                                except IndexError:
-                                    pass
-                            
-                            # Skip URLs with specific patterns or from excluded domains
-                            if (not any(domain in href.lower() for domain in excluded_domains) and
-                                not any(pattern in href for pattern in ['/search?', '/intl/', '/accounts/', '/policies/', '/preferences'])):
-                                
-                                # Skip if we already have a URL from this domain
-                                domain_exists = False
-                                if base_domain:
-                                    domain_exists = any(base_domain in existing_url for existing_url in result_urls)
-                                
-                                # Only add if we don't already have this domain, unless it's a contact page
-                                if 'contact' in href.lower() or not domain_exists:
-                                    # Mark as seen
-                                    seen_urls.add(href)
-                                    
-                                    # Prioritize contact pages
-                                    if 'contact' in href.lower():
-                                        result_urls.insert(0, href)
-                                        print(f"Added priority result URL: {href}")
-                                    else:
-                                        result_urls.append(href)
-                                        print(f"Added result URL: {href}")
-                                    
-                                    if len(result_urls) >= max_results:
-                                        break
-                    except Exception as link_err:
-                        print(f"Error processing link: {link_err}")
-                        continue
-                
+                return self.driver.current_url, self.driver.page_source
             except Exception as e:
-                print(f"Search error with {search_url}: {e}")
-        
-        # If we found URLs, make sure contact pages are prioritized
-        if result_urls:
-            # Remove duplicates while preserving order
-            unique_results = []
-            seen = set()
-            for url in result_urls:
-                base_url = url.split('#')[0].split('?')[0]  # Remove fragments and query params
-                
-                # Skip duplicates of the same base URL
-                if base_url in seen:
-                    continue
-                seen.add(base_url)
-                unique_results.append(url)
-            
-            result_urls = unique_results
-            
-            # Re-sort URLs to prioritize contact pages and the target domain
-            contact_urls = []
-            target_domain_urls = []
-            other_urls = []
-            
-            target_parts = [part.lower() for part in query.split() if '.' in part]
-            
-            for url in result_urls:
-                if '/contact' in url.lower():
-                    contact_urls.append(url)
-                elif any(part in url.lower() for part in target_parts):
-                    target_domain_urls.append(url)
-                else:
-                    other_urls.append(url)
-            
-            # Rebuild the results list in priority order
-            result_urls = contact_urls + target_domain_urls + other_urls
-            
-            # Limit to max_results
-            result_urls = result_urls[:max_results]
-        else:
-            print("WARNING: Could not get any search results")
-            
-            # Try directly accessing the website if it's in the query
-            website_hints = [x for x in query.split() if '.com' in x or '.org' in x or '.co.uk' in x or '.nhs.uk' in x]
-            for hint in website_hints:
-                if not hint.startswith('http'):
-                    hint = 'https://' + hint
-                result_urls.append(hint)
-                print(f"Added direct website URL from query: {hint}")
-        
-        return result_urls
+                print(f"Error loading {url} in browser: {e}")
+                return url, ""
     
     def scrape_url(self, url):
         """
-        Scrape a URL with extensive error handling and content extraction
+        Scrape a URL with extensive error handling and content extraction.
+        If another browser is already rendering the same URL, its result is shared
+        """
+        return get_singleflight("fetch").do(("browser", url), lambda: self._locked_scrape_url(url))
+    
+    def _locked_scrape_url(self, url):
+        with self._scrape_lock:
+            self._cancelled.clear()
+            return self._scrape_url(url)
+    
+    def cancel(self):
+        """
+        Abort an in-progress scrape_url from another thread (e.g. when a hedged
+        fetch has already won) by quitting the browser; the next call starts a new one
+        """
+        self._cancelled.set()
+        driver, self.driver = self.driver, None
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+    
+    def _scrape_url(self, url):
+        """
+        Body of scrape_url, run while holding the scrape lock
         """
         try:
             print(f"Scraping URL: {url}")
-            self._create_driver()
-            
-            # Set page load timeout
-            self.driver.set_page_load_timeout(20)
-            
-            # Load the URL
-            self.driver.get(url)
-            
-            # Wait for page to load content
-            print("Waiting for page to load...")
-            time.sleep(5)  # Initial wait
             
-            # Handle cookies banner if present
-            self._handle_cookies_popup()
-            
-            # Wait for the body to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
+            if not self.robots.allowed(url):
+                print(f"Skipping URL {url}: disallowed by robots.txt")
+                return {
+                    "url": url,
+                    "error": "Disallowed by robots.txt",
+                    "content": "",
+                    "skipped": True
+                }
+            
+            # PDFs and other non-HTML documents don't need a browser
+            if self.http_scraper is not None:
+                probe = self.http_scraper.probe_url(url)
+                if not probe.get("error") and probe.get("kind") not in (None, "html"):
+                    print(f"Not rendering {probe['kind']} content ({probe['content_type']}), using HTTP fetch")
+                    return self.http_scraper.scrape_url(url)
+            
+            # Page loads are retried on transient errors and skipped while the domain's breaker is open
+            self.resilience.call(url, lambda: self._load_page(url))
             
             # Get title
             title = self.driver.title
@@ -551,6 +494,13 @@ class SeleniumScraper:
                 "title": title,
                 "content": text  # Return the full text content
             }
+        except CircuitOpenError as e:
+            print(f"Skipping URL {url}: {e}")
+            return {
+                "url": url,
+                "error": str(e),
+                "content": "Error: Could not retrieve content from this website."
+            }
         except Exception as e:
             print(f"Error scraping URL {url}: {e}")
             import traceback
@@ -561,6 +511,33 @@ class SeleniumScraper:
                 "content": "Error: Could not retrieve content from this website."
             }
     
+    def _load_page(self, url):
+        """
+        Load a URL and wait for the body to render (one attempt)
+        """
+        if self._cancelled.is_set():
+            raise RuntimeError("Scrape cancelled")
+        
+        self._create_driver()
+        
+        # Set page load timeout
+        self.driver.set_page_load_timeout(20)
+        
+        # Load the URL
+        self.driver.get(url)
+        
+        # Wait for page to load content
+        print("Waiting for page to load...")
+        time.sleep(5)  # Initial wait
+        
+        # Handle cookies banner if present
+        self._handle_cookies_popup()
+        
+        # Wait for the body to load
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+    
     def close(self):
         """Close the browser"""
         if self.driver:
@@ -0,0 +1,216 @@
+import re
+from typing import Dict, List, Any, Optional
+from bs4 import BeautifulSoup
+from contact_signals import find_contact_signals
+from domain_utils import DomainSet, site_root
+from result_ranker import DIRECTORY_DOMAINS
+
+# Result blocks per engine: (block selector, link selector, snippet selector)
+RESULT_BLOCKS = {
+    "google": ("div.g", "a[href]", "div.VwiC3b, span.aCOpRe, div[data-sncf]"),
+    "bing": ("li.b_algo", "h2 a[href]", ".b_caption p, .b_lineclamp2, .b_lineclamp3"),
+    "duckduckgo": ("div.result", "a.result__a[href]", ".result__snippet"),
+    "mojeek": ("ul.results-standard li", "a.title[href]", "p.s"),
+}
+
+# Knowledge/local panel attributes (Google marks them with data-attrid)
+PANEL_ADDRESS_SELECTOR = "[data-attrid*='address']"
+PANEL_PHONE_SELECTOR = "[data-attrid*='phone']"
+PANEL_TITLE_SELECTOR = "[data-attrid='title']"
+
+# Words that don't identify a business on their own
+NAME_STOPWORDS = {"the", "and", "ltd", "limited", "plc", "llp", "inc", "co", "company", "group", "uk", "services"}
+
+# Kinds of organisation shared by many names ("Bolton Council" and "Boston Council")
+GENERIC_NAME_WORDS = {
+    "council", "borough", "city", "county", "district", "parish", "town", "school", "primary",
+    "secondary", "infant", "junior", "academy", "college", "university", "nursery", "church",
+    "club", "centre", "center", "trust", "hospital", "surgery", "practice", "medical", "health",
+    "hotel", "restaurant", "cafe", "shop", "store", "garage", "associates", "solicitors",
+}
+
+_directories = DomainSet(DIRECTORY_DOMAINS)
+
+# Fields that must be present for SERP data to stand in for page scraping
+DEFAULT_REQUIRED_FIELDS = ("phones", "address", "website")
+
+
+def extract_serp_candidate(responses: List[Dict[str, Any]], business_name: str,
+                           result_urls: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Turn search result pages into a structured contact candidate
+
+    Local/knowledge panel data is taken as-is unless the panel is titled with
+    another business; snippet data only counts when the snippet's result
+    mentions every distinctive word of the business name, so other companies'
+    numbers on the same page aren't picked up.
+
+    Only a website from the panel is "verified_website" and counts towards
+    completeness. Otherwise the first result that isn't a directory is given
+    as the website, unverified.
+
+    Args:
+        responses (list): Search backend responses (with "backend" and "html")
+        business_name (str): Business being searched for
+        result_urls (list): Ranked result URLs, used for the website when no panel link is shown
+
+    Returns:
+        dict: Contact info in the bulk result shape plus "sources" (backends used)
+              and "verified_website"
+    """
+    name_tokens = _name_tokens(business_name)
+    phones: List[str] = []
+    emails: List[str] = []
+    address = ""
+    website = ""
+    panel_name = ""
+    sources = []
+
+    for response in responses:
+        html = response.get("html")
+        if not html:
+            continue
+
+        soup = BeautifulSoup(html, "html.parser")
+        found_any = False
+
+        # Local/knowledge panel, unless it is about someone else
+        panel = _panel_data(soup)
+        if panel["name"] and not _mentions(panel["name"], name_tokens):
+            panel = {"address": "", "phones": [], "website": "", "name": ""}
+        if panel["address"] and not address:
+            address = panel["address"]
+            found_any = True
+        for phone in panel["phones"]:
+            if phone not in phones:
+                phones.append(phone)
+                found_any = True
+        if panel["website"] and not website and panel["website"] not in _directories:
+            website = panel["website"]
+            found_any = True
+        panel_name = panel_name or panel["name"]
+
+        # Snippets of results that mention the business
+        for snippet in _snippets(soup, response.get("backend", "")):
+            if not _mentions(snippet["text"], name_tokens):
+                continue
+            signals = find_contact_signals(snippet["text"])
+            for phone in signals["phones"]:
+                if phone not in phones:
+                    phones.append(phone)
+                    found_any = True
+            for email in signals["emails"]:
+                if email not in emails:
+                    emails.append(email)
+                    found_any = True
+            if signals["address"] and not address:
+                address = signals["address"]
+                found_any = True
+
+        if found_any:
+            sources.append(response.get("backend", "unknown"))
+
+    verified_website = bool(website)
+    if not website:
+        website = next((site_root(url) for url in result_urls or [] if url not in _directories), "")
+
+    return {
+        "business_name": panel_name or business_name,
+        "phones": [{"number": phone, "description": "Main"} for phone in phones],
+        "emails": [{"address": email, "description": "General"} for email in emails],
+        "website": website,
+        "address": address,
+        "additional_locations": [],
+        "sources": sources,
+        "verified_website": verified_website
+    }
+
+
+def missing_serp_fields(candidate: Dict[str, Any], required=DEFAULT_REQUIRED_FIELDS) -> List[str]:
+    """Required fields the candidate doesn't have; a website only counts when verified"""
+    return [field for field in required if not candidate.get(field)
+            or (field == "website" and not candidate.get("verified_website"))]
+
+
+def is_serp_complete(candidate: Optional[Dict[str, Any]], required=DEFAULT_REQUIRED_FIELDS) -> bool:
+    """Whether the SERP data is good enough to skip visiting pages"""
+    return bool(candidate and candidate.get("sources") and not missing_serp_fields(candidate, required))
+
+
+def format_serp_candidate(candidate: Dict[str, Any]) -> str:
+    """Readable summary of a SERP candidate, used in place of scraped page text"""
+    lines = [f"CONTACT DETAILS FROM SEARCH RESULTS ({', '.join(candidate.get('sources', []))}):",
+             f"Business: {candidate.get('business_name', '')}"]
+    for phone in candidate.get("phones", []):
+        lines.append(f"Phone: {phone['number']}")
+    for email in candidate.get("emails", []):
+        lines.append(f"Email: {email['address']}")
+    if candidate.get("address"):
+        lines.append(f"Address: {candidate['address']}")
+    if candidate.get("website"):
+        lines.append(f"Website: {candidate['website']}")
+    return "\n".join(lines)
+
+
+def _panel_data(soup: BeautifulSoup) -> Dict[str, Any]:
+    """Address, phones, website and name from a local/knowledge panel"""
+    address = ""
+    element = soup.select_one(PANEL_ADDRESS_SELECTOR)
+    if element:
+        address = re.sub(r'^\s*Address\s*:\s*', '', element.get_text(" ", strip=True), flags=re.I)
+
+    phones = []
+    for element in soup.select(PANEL_PHONE_SELECTOR):
+        phones.extend(find_contact_signals(element.get_text(" ", strip=True))["phones"])
+
+    website = ""
+    official = soup.select_one("[data-attrid='visit_official_site'] a[href]")
+    if official:
+        website = site_root(official["href"])
+    else:
+        for anchor in soup.find_all("a", href=True):
+            if anchor.get_text(strip=True).lower() == "website" and anchor["href"].startswith("http"):
+                website = site_root(anchor["href"])
+                break
+
+    name = ""
+    element = soup.select_one(PANEL_TITLE_SELECTOR)
+    if element:
+        name = element.get_text(" ", strip=True)
+
+    return {"address": address, "phones": phones, "website": website, "name": name}
+
+
+def _snippets(soup: BeautifulSoup, backend: str) -> List[Dict[str, str]]:
+    """Title + snippet text for each result block on the page"""
+    block_selector, link_selector, snippet_selector = RESULT_BLOCKS.get(backend, RESULT_BLOCKS["google"])
+    snippets = []
+    for block in soup.select(block_selector):
+        link = block.select_one(link_selector)
+        snippet = block.select_one(snippet_selector)
+        text = block.get_text(" ", strip=True) if snippet is None else (
+            (link.get_text(" ", strip=True) + " " if link else "") + snippet.get_text(" ", strip=True)
+        )
+        snippets.append({"url": link["href"] if link else "", "text": text})
+    return snippets
+
+
+def _words(text: str) -> List[str]:
+    """Lower-case words with possessives dropped ("Mary's" -> "mary")"""
+    words = re.findall(r"[a-z0-9']+", text.lower().replace("\u2019", "'"))
+    return [word.removesuffix("'s").strip("'") for word in words]
+
+
+def _name_tokens(business_name: str) -> List[str]:
+    tokens = _words(business_name)
+    return [token for token in tokens
+            if len(token) > 2 and token not in NAME_STOPWORDS and token not in GENERIC_NAME_WORDS]
+
+
+def _mentions(text: str, name_tokens: List[str]) -> bool:
+    """True when every distinctive word of the business name appears in text"""
+    if not name_tokens:
+        return False
+    words = set(_words(text))
+    return all(token in words for token in name_tokens)
+
@@ -0,0 +1,186 @@
+import heapq
+import hashlib
+from typing import Dict, List, Any
+from urllib.parse import urlparse, urljoin, urlunparse
+from bs4 import BeautifulSoup
+from contact_signals import find_contact_signals, merge_contact_signals, missing_contact_fields
+
+# Anchor text / URL keywords that lead towards contact details, with weights
+LINK_KEYWORDS = {
+    "contact": 10,
+    "get in touch": 9,
+    "get-in-touch": 9,
+    "find us": 8,
+    "find-us": 8,
+    "locations": 7,
+    "location": 6,
+    "offices": 6,
+    "branches": 6,
+    "visit": 5,
+    "enquir": 5,
+    "about": 4,
+    "directions": 4,
+    "team": 2,
+    "help": 1,
+}
+
+# Links that are never worth fetching while looking for contact details
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.doc', '.docx',
+    '.xls', '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi', '.mov', '.css', '.js', '.xml'
+)
+SKIPPED_KEYWORDS = ('login', 'signin', 'sign-in', 'basket', 'cart', 'checkout', 'account', 'privacy', 'cookie', 'terms')
+
+
+class SiteCrawler:
+    """
+    Small bounded crawler that follows the most contact-relevant links on a site.
+
+    Links are kept in a priority frontier scored by their anchor text and URL, so
+    "Contact" and "About -> Locations" style pages are fetched before anything else.
+    Crawling stops at max_depth, after max_pages fetches, or as soon as a phone
+    number, email address and postal address have all been found.
+    """
+
+    def __init__(self, web_scraper, max_depth: int = 2, max_pages: int = 8, verbose: bool = False):
+        """
+        Initialise the crawler
+
+        Args:
+            web_scraper: WebScraper used to fetch pages over HTTP
+            max_depth (int): Maximum number of clicks away from the start URL
+            max_pages (int): Page budget per site
+            verbose (bool): Print progress information
+        """
+        self.web_scraper = web_scraper
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.verbose = verbose
+
+    def crawl(self, start_url: str, budget=None) -> Dict[str, Any]:
+        """
+        Crawl a site from start_url looking for contact details
+
+        Args:
+            start_url (str): Page to start from, usually the homepage
+            budget (CompanyBudget): Optional per-company budget; the crawl stops with
+                what it has found once its pages or time run out
+
+        Returns:
+            dict: {"pages": [page dicts], "signals": merged contact signals,
+                   "pages_fetched": int, "complete": bool}
+        """
+        site_host = self._host(start_url)
+        frontier = []
+        seen = set()
+        counter = 0
+
+        heapq.heappush(frontier, (0.0, counter, start_url, 0))
+        seen.add(self._fingerprint(start_url))
+
+        pages = []
+        signals = {"phones": [], "emails": [], "address": ""}
+        pages_fetched = 0
+
+        while frontier and pages_fetched < self.max_pages:
+            if budget is not None and not budget.take_page():
+                break
+            _, _, url, depth = heapq.heappop(frontier)
+
+            if self.verbose:
+                print(f"Crawling (depth {depth}): {url}")
+
+            final_url, html = self.web_scraper.fetch_html(url)
+            pages_fetched += 1
+            if not html:
+                continue
+
+            soup = BeautifulSoup(html, "html.parser")
+            title = soup.title.string.strip() if soup.title and soup.title.string else ""
+
+            # Collect links before stripping anything from the tree
+            links = self._extract_links(soup, final_url or url, site_host) if depth < self.max_depth else []
+
+            for element in soup(["script", "style", "noscript"]):
+                element.extract()
+            text = soup.get_text(separator="\n", strip=True)
+
+            page_signals = find_contact_signals(text)
+            if any(page_signals.values()):
+                pages.append({
+                    "url": final_url or url,
+                    "title": title,
+                    "content": text,
+                    "depth": depth,
+                    "signals": page_signals
+                })
+                signals = merge_contact_signals(signals, page_signals)
+
+            if not missing_contact_fields(signals):
+                if self.verbose:
+                    print(f"All contact fields found after {pages_fetched} pages, stopping crawl")
+                break
+
+            for link, score in links:
+                fingerprint = self._fingerprint(link)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+
+                counter += 1
+                # heapq is a min-heap, so negate the score; deeper links cost a little more
+                heapq.heappush(frontier, (-score + depth, counter, link, depth + 1))
+
+        return {
+            "pages": pages,
+            "signals": signals,
+            "pages_fetched": pages_fetched,
+            "complete": not missing_contact_fields(signals)
+        }
+
+    def _extract_links(self, soup, base_url: str, site_host: str) -> List[tuple]:
+        """Return (url, score) pairs for same-site links worth following"""
+        links = []
+        for anchor in soup.find_all('a', href=True):
+            href = anchor.get('href', '').strip()
+            if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+                continue
+
+            absolute = urljoin(base_url, href).split('#')[0]
+            parsed = urlparse(absolute)
+            if parsed.scheme not in ('http', 'https') or self._host(absolute) != site_host:
+                continue
+
+            path = parsed.path.lower()
+            if path.endswith(SKIPPED_EXTENSIONS) or any(keyword in path for keyword in SKIPPED_KEYWORDS):
+                continue
+
+            score = self._score_link(anchor.get_text(" ", strip=True).lower(), path)
+            if score > 0:
+                links.append((absolute, score))
+
+        return links
+
+    def _score_link(self, anchor_text: str, path: str) -> float:
+        """Contact relevance of a link from its anchor text and URL path"""
+        text_score = max((w for k, w in LINK_KEYWORDS.items() if k in anchor_text), default=0)
+        path_score = max((w for k, w in LINK_KEYWORDS.items() if k in path), default=0)
+        return text_score + path_score * 0.5
+
+    def _host(self, url: str) -> str:
+        """Host without a leading www. so both variants count as the same site"""
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _fingerprint(self, url: str) -> bytes:
+        """Compact 8-byte digest of a normalised URL for the seen set"""
+        parsed = urlparse(url)
+        normalised = urlunparse((
+            parsed.scheme.lower(),
+            self._host(url),
+            parsed.path.rstrip('/') or '/',
+            '',
+            parsed.query,
+            ''
+        ))
+        return hashlib.blake2b(normalised.encode('utf-8'), digest_size=8).digest()
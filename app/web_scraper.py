@@ -223,82 +223,231 @@
         
 #         return digits_only
 
-import time
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+from fetch_scheduler import FetchScheduler
+from http_client import HttpClient
+from resilience import get_resilience_layer
+from robots_policy import get_robots_policy
+from content_extractors import body_to_page, classify_content, decode_body
+from search_backends import SearchManager, BingBackend, DuckDuckGoBackend
+from singleflight import get_singleflight
+
+ROBOTS_DISALLOWED = "Disallowed by robots.txt"
 
 class WebScraper:
     """Simple web scraper to fetch content for LLM processing"""
     
-    def __init__(self, user_agent="Mozilla/5.0", timeout=30, delay=1):
+    def __init__(self, user_agent="Mozilla/5.0", timeout=30, delay=1, per_host_concurrency=1,
+                 max_workers=8, scheduler=None, per_host_connections=4, http2=True, dns_cache_ttl=300,
+                 client=None, resilience=None, max_bytes=2000000, robots=None, search_manager=None):
         self.headers = {"User-Agent": user_agent}
         self.timeout = timeout
         self.delay = delay
+        
+        # Bodies are streamed and cut off here so huge downloads can't stall a job
+        self.max_bytes = max_bytes
+        
+        # One long-lived pooled client so pages on the same site reuse connections
+        self.client = client or HttpClient(
+            headers=self.headers,
+            timeout=timeout,
+            per_host_connections=per_host_connections,
+            http2=http2,
+            dns_cache_ttl=dns_cache_ttl
+        )
+        
+        # robots.txt is fetched once per host and shared with the Selenium tier
+        self.robots = robots or get_robots_policy()
+        if self.robots.client is None:
+            self.robots.client = self.client
+        
+        # Politeness is enforced per host, so different sites can be fetched concurrently
+        self.scheduler = scheduler or FetchScheduler(
+            delay=delay,
+            per_host_concurrency=per_host_concurrency,
+            max_workers=max_workers,
+            crawl_delay_provider=self.robots.crawl_delay_for_host
+        )
+        
+        # Search backends (see search_backends.build_search_manager)
+        self.search_manager = search_manager
+        
+        # Retries and per-domain circuit breakers are shared with the Selenium tier
+        self.resilience = resilience or get_resilience_layer()
     
     def search(self, query, max_results=5):
         """
-        Simple search function to find relevant URLs for a query
+        Find relevant URLs for a query through the search backends
         Returns a list of URLs
         """
-        search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+        if self.search_manager is None:
+            self.search_manager = SearchManager([
+                BingBackend(self._fetch_search_page),
+                DuckDuckGoBackend(self._fetch_search_page)
+            ])
+        return self.search_manager.search(query, max_results)
+    
+    def fetch_html(self, url, check_robots=True):
+        """
+        Fetch the raw HTML of a URL without any parsing
+        Returns a (final_url, html) tuple, or (url, "") on failure or non-HTML content
+        """
+        return self._fetch_raw(url, ("html",), check_robots)
+    
+    def fetch_text(self, url, check_robots=True):
+        """
+        Fetch a textual document such as a sitemap (HTML, XML or plain text) without any parsing
+        Returns a (final_url, text) tuple, or (url, "") on failure or binary content
+        """
+        return self._fetch_raw(url, ("html", "text"), check_robots)
+    
+    def _fetch_raw(self, url, kinds, check_robots=True):
+        """
+        Fetch and decode a URL whose content is one of the given kinds (see classify_content)
+        """
+        if check_robots and not self.robots.allowed(url):
+            print(f"Skipping URL {url}: disallowed by robots.txt")
+            return url, ""
         
         try:
-            response = requests.get(search_url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Find all links
-            links = soup.find_all('a')
-            
-            # Extract result URLs
-            result_urls = []
-            for link in links:
-                href = link.get('href')
-                if href and href.startswith('http') and 'google.com' not in href:
-                    result_urls.append(href)
-                    if len(result_urls) >= max_results:
-                        break
-            
-            return result_urls
+            response = self._get(url, allowed=lambda content_type: classify_content(content_type, url) in kinds)
+            return str(response.url), decode_body(response.content, response.content_type)
         except Exception as e:
-            print(f"Search error: {e}")
-            return []
+            print(f"Error fetching URL {url}: {e}")
+            return url, ""
     
-    def scrape_url(self, url):
+    def probe_url(self, url):
         """
-        Simply fetch and return the full content of a URL
+        Cheaply check whether a URL exists using a HEAD request,
+        falling back to a streamed GET for servers that reject HEAD
         """
-        try:
-            # Add delay to be respectful to websites
-            time.sleep(self.delay)
-            
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Get title
-            title = soup.title.string if soup.title else "No title"
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.extract()
+        result = {
+            "url": url,
+            "final_url": url,
+            "status": None,
+            "content_type": "",
+            "kind": None,
+            "ok": False
+        }
+        
+        if not self.robots.allowed(url):
+            result["error"] = ROBOTS_DISALLOWED
+            return result
+        
+        def attempt():
+            with self.scheduler.slot(url):
+                response = self.client.head(url)
             
-            # Get text content
-            text = soup.get_text(separator="\n", strip=True)
+            # Some servers don't implement HEAD properly, so only read the headers of a GET
+            if response.status_code in (403, 405, 501):
+                with self.scheduler.slot(url):
+                    response = self.client.get_headers_only(url)
+            return response
+        
+        try:
+            # Probes are cheap checks, so they respect open breakers but aren't retried
+            response = self.resilience.call(url, attempt, max_attempts=1)
             
+            content_type = response.headers.get("Content-Type", "").lower()
+            kind = classify_content(content_type, str(response.url))
+            result.update({
+                "final_url": str(response.url),
+                "status": response.status_code,
+                "content_type": content_type,
+                "kind": kind,
+                "ok": response.status_code < 400 and kind == "html"
+            })
+        except Exception as e:
+            result["error"] = str(e)
+        
+        return result
+    
+    def scrape_url(self, url, scheduled=True):
+        """
+        Fetch a URL and return its text content.
+        HTML and PDFs are extracted, other binaries are skipped without downloading.
+        Concurrent calls for the same URL share one request
+        """
+        # scheduled is part of the key: a caller already holding the host's slot
+        # must never wait on one that is queued for it
+        return get_singleflight("fetch").do(
+            ("http", url, scheduled), lambda: self._scrape_url(url, scheduled)
+        )
+    
+    def _scrape_url(self, url, scheduled=True):
+        """
+        Body of scrape_url, run once per in-flight URL
+        """
+        if not self.robots.allowed(url):
+            print(f"Skipping URL {url}: disallowed by robots.txt")
             return {
                 "url": url,
-                "title": title,
-                "content": text  # Return the full text content
+                "error": ROBOTS_DISALLOWED,
+                "content": "",
+                "skipped": True
             }
+        
+        try:
+            response = self._get(
+                url, scheduled=scheduled,
+                allowed=lambda content_type: classify_content(content_type, url) != "binary"
+            )
+            return body_to_page(url, response.content, response.content_type, response.truncated)
         except Exception as e:
             print(f"Error scraping URL {url}: {e}")
             return {
                 "url": url,
                 "error": str(e),
                 "content": ""
-            }
\ No newline at end of file
+            }
+    
+    def scrape_many(self, urls):
+        """
+        Scrape several URLs concurrently, interleaving hosts so each site
+        still only sees one request per politeness interval.
+        Results are returned in the same order as urls.
+        """
+        # map() already holds the host's slot while each URL is fetched
+        return self.scheduler.map(lambda url: self.scrape_url(url, scheduled=False), urls)
+    
+    def resilience_metrics(self):
+        """
+        Retry counts and per-domain circuit breaker state
+        """
+        return self.resilience.metrics()
+    
+    def robots_stats(self):
+        """
+        robots.txt cache counters and per-host status
+        """
+        return self.robots.stats()
+    
+    def connection_stats(self):
+        """
+        Connection reuse statistics for the pooled HTTP client
+        """
+        return self.client.stats()
+    
+    def close(self):
+        """Close pooled connections"""
+        self.client.close()
+    
+    def _fetch_search_page(self, url):
+        """
+        Fetch a search results page (engines' robots rules are aimed at crawlers, not single queries)
+        """
+        return self.fetch_html(url, check_robots=False)
+    
+    def _get(self, url, scheduled=True, allowed=None):
+        """
+        Stream a URL through the retry/circuit-breaker layer, raising on HTTP errors.
+        The body is capped at max_bytes and skipped if allowed(content_type) is False.
+        Each attempt waits for the host's politeness interval unless the caller
+        already holds the host's slot.
+        """
+        def attempt():
+            if scheduled:
+                with self.scheduler.slot(url):
+                    return self.client.stream_get(url, self.max_bytes, allowed=allowed)
+            return self.client.stream_get(url, self.max_bytes, allowed=allowed)
+        
+        return self.resilience.call(url, attempt)
@@ -0,0 +1,332 @@
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    names TEXT NOT NULL,        -- JSON list of every input name, in input order
+    groups TEXT NOT NULL,       -- JSON list of duplicate-name index groups
+    evaluate INTEGER NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,  -- index into the job's names; fixes the output order
+    priority INTEGER NOT NULL,  -- processing order, cheapest first
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,       -- pending, leased, done or failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL,
+    PRIMARY KEY (job_id, position)
+);
+CREATE INDEX IF NOT EXISTS tasks_claimable ON tasks (status, lease_expires);
+"""
+
+
+def open_work_queue(config_manager, path: Optional[str] = None) -> "WorkQueue":
+    """The work queue configured by work_queue_path (or at path), with the configured lease and retries"""
+    return WorkQueue(
+        path or config_manager.get("work_queue_path", "bulk_queue.sqlite"),
+        lease_seconds=config_manager.get("work_queue_lease_seconds", 300),
+        max_attempts=config_manager.get("work_queue_max_attempts", 3)
+    )
+
+
+def default_worker_id() -> str:
+    """host-pid, unique across the machines sharing a queue"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Bulk job queue stored in SQLite, shareable between processes and machines
+    (e.g. on a shared volume).
+
+    A job is a list of company names; each unique name is a task. Workers
+    lease tasks for lease_seconds and extend the lease with heartbeats while
+    they work. A task whose lease runs out (its worker died or lost the
+    volume) becomes claimable again, and failed tasks are retried until
+    max_attempts. Each task has a fixed position, so however many workers
+    took part, results are merged in input order.
+    """
+
+    def __init__(self, path: str = "bulk_queue.sqlite", lease_seconds: float = 300, max_attempts: int = 3):
+        """
+        Open (and if needed create) the queue
+
+        Args:
+            path (str): SQLite database file
+            lease_seconds (float): How long a lease lasts without a heartbeat
+            max_attempts (int): Leases a task gets before it is marked failed
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            db.executescript(SCHEMA)  # idempotent, and runs in its own transaction
+        finally:
+            db.close()
+
+    def create_job(self, names: List[str], query: str, groups: List[List[int]], order: List[int],
+                   evaluate: bool = True, job_id: Optional[str] = None) -> str:
+        """
+        Add a job
+
+        Args:
+            names (list): Every input name, in input order
+            query (str): User's search query
+            groups (list): Duplicate-name index groups; one task is made per group
+            order (list): Group numbers in the order they should be processed
+            evaluate (bool): Whether workers evaluate their results
+            job_id (str): Id to use, generated if not given
+
+        Returns:
+            str: The job id
+        """
+        job_id = job_id or datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        priority = {group_number: rank for rank, group_number in enumerate(order)}
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO jobs (id, query, names, groups, evaluate, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, query, json.dumps(names), json.dumps(groups), int(evaluate), datetime.now().isoformat())
+            )
+            db.executemany(
+                "INSERT INTO tasks (job_id, position, priority, name, status, updated) VALUES (?, ?, ?, ?, 'pending', ?)",
+                [(job_id, group[0], priority.get(number, len(order) + number), names[group[0]].strip(), now)
+                 for number, group in enumerate(groups)]
+            )
+        print(f"Queued job {job_id}: {len(groups)} companies ({len(names)} names) in {self.path}")
+        return job_id
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Claim the next task: a pending one, or one whose lease has expired
+
+        Returns:
+            dict: {"job_id", "position", "name", "query", "evaluate", "attempts"}, or None if nothing is claimable
+        """
+        now = time.time()
+        with self._transaction() as db:
+            # Tasks whose lease ran out on their last attempt have failed for good
+            db.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'Lease expired'), updated = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = db.execute(
+                "SELECT t.job_id, t.position, t.name, t.attempts, j.query, j.evaluate "
+                "FROM tasks t JOIN jobs j ON j.id = t.job_id "
+                "WHERE t.status = 'pending' OR (t.status = 'leased' AND t.lease_expires < ?) "
+                "ORDER BY j.created, t.priority LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, position, name, attempts, query, evaluate = row
+            db.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                "WHERE job_id = ? AND position = ?",
+                (worker_id, now + self.lease_seconds, now, job_id, position)
+            )
+        return {"job_id": job_id, "position": position, "name": name, "query": query,
+                "evaluate": bool(evaluate), "attempts": attempts + 1}
+
+    def heartbeat(self, worker_id: str, task: Dict[str, Any]) -> bool:
+        """Extend the lease on a task; False if the worker no longer holds it"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET lease_expires = ?, updated = ? "
+                "WHERE job_id = ? AND position = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, task["job_id"], task["position"], worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, worker_id: str, task: Dict[str, Any], result: Dict[str, Any]) -> bool:
+        """Store a task's result; False (result discarded) if the lease was lost to another worker"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated = ? "
+                "WHERE job_id = ? AND position = ? AND worker = ? AND status = 'leased'",
+                (json.dumps(result), time.time(), task["job_id"], task["position"], worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, worker_id: str, task: Dict[str, Any], error: str, result: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Record a failed attempt: the task goes back to pending, or is marked
+        failed (keeping result as its final row) once it has used max_attempts
+
+        Returns:
+            str: The task's new status ("pending", "failed"), or "" if the lease was lost
+        """
+        status = "failed" if task["attempts"] >= self.max_attempts else "pending"
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE tasks SET status = ?, error = ?, result = ?, worker = NULL, lease_expires = NULL, updated = ? "
+                "WHERE job_id = ? AND position = ? AND worker = ? AND status = 'leased'",
+                (status, error, json.dumps(result) if result else None, time.time(),
+                 task["job_id"], task["position"], worker_id)
+            )
+            return status if cursor.rowcount == 1 else ""
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's query, names, groups and evaluate flag"""
+        with self._transaction() as db:
+            row = db.execute("SELECT query, names, groups, evaluate, created FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        query, names, groups, evaluate, created = row
+        return {"id": job_id, "query": query, "names": json.loads(names), "groups": json.loads(groups),
+                "evaluate": bool(evaluate), "created": created}
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Every job with its task counts per status"""
+        with self._transaction() as db:
+            ids = [row[0] for row in db.execute("SELECT id FROM jobs ORDER BY created")]
+        return [dict(self.job(job_id), status=self.status(job_id)) for job_id in ids]
+
+    def status(self, job_id: str) -> Dict[str, int]:
+        """Task counts per status for a job"""
+        with self._transaction() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)).fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def results(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        Result entries of a finished job's tasks, in input order
+
+        Failed tasks without a stored row get an error row.
+        """
+        job = self.job(job_id)
+        if job is None:
+            raise ValueError(f"No job {job_id} in {self.path}")
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT position, name, status, result, error FROM tasks WHERE job_id = ? ORDER BY position",
+                (job_id,)
+            ).fetchall()
+
+        results = []
+        for position, name, status, result, error in rows:
+            if status not in ("done", "failed"):
+                raise ValueError(f"Job {job_id} is not finished: {name} is {status}")
+            if result:
+                results.append(json.loads(result))
+            else:
+                results.append({
+                    "Name": name,
+                    "Query": job["query"],
+                    "MilesAI_Response": f"Error: {error}",
+                    "Sources": [],
+                    "Error": error or "Failed"
+                })
+        return results
+
+    @contextmanager
+    def _transaction(self):
+        """A short-lived connection holding the write lock for one transaction"""
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+
+class _Heartbeat:
+    """Background thread keeping a worker's current lease alive"""
+
+    def __init__(self, queue: WorkQueue, worker_id: str, task: Dict[str, Any]):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.task = task
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-heartbeat", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            try:
+                if not self.queue.heartbeat(self.worker_id, self.task):
+                    print(f"Lost the lease on {self.task['name']}; another worker may pick it up")
+                    return
+            except sqlite3.Error as e:
+                print(f"Warning: Heartbeat failed for {self.task['name']}: {e}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+
+def run_worker(finder, queue: WorkQueue, worker_id: Optional[str] = None, exit_when_idle: bool = False,
+               poll_interval: float = 5.0) -> int:
+    """
+    Process queued companies until stopped (or, with exit_when_idle, until nothing is claimable)
+
+    Args:
+        finder: BulkContactFinder used to process each company
+        queue (WorkQueue): Queue to take tasks from
+        worker_id (str): Name recorded on leases, defaults to host-pid
+        exit_when_idle (bool): Return once no task can be claimed
+        poll_interval (float): Seconds to wait before polling an empty queue again
+
+    Returns:
+        int: Number of tasks this worker completed
+    """
+    worker_id = worker_id or default_worker_id()
+    completed = 0
+    print(f"Worker {worker_id} polling {queue.path}")
+
+    while True:
+        task = queue.lease(worker_id)
+        if task is None:
+            if exit_when_idle:
+                break
+            finder.browser_pool.close()  # no Chrome left running while idle
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[{task['job_id']}] {task['name']} (attempt {task['attempts']})")
+        heartbeat = _Heartbeat(queue, worker_id, task)
+        try:
+            evaluator = finder.evaluator if task["evaluate"] else None
+            entry = finder._run_company(task["name"], task["query"], evaluator)
+        finally:
+            heartbeat.stop()
+
+        if entry.get("Error"):
+            status = queue.fail(worker_id, task, entry["Error"], entry)
+            if status == "pending":
+                print(f"{task['name']} failed ({entry['Error']}), will be retried")
+        elif queue.complete(worker_id, task, entry):
+            completed += 1
+        else:
+            print(f"Discarding result for {task['name']}: its lease was taken over")
+
+    finder.browser_pool.close()
+    print(f"Worker {worker_id} finished {completed} task(s)")
+    return completed
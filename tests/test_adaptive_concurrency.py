@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from adaptive_concurrency import AdaptiveLimiter
+from browser_pool import BrowserPool
+
+
+def idle_host():
+    return {"cpu": 0.1, "memory": 0.1}
+
+
+def limiter(**kwargs):
+    options = dict(floor=1, ceiling=4, initial=2, window=4, load_probe=idle_host)
+    options.update(kwargs)
+    return AdaptiveLimiter("test", **options)
+
+
+def test_decide_grows_by_one_when_saturated_and_healthy():
+    stage = limiter()
+    assert stage._decide([(1.0, True)] * 4, saturated=True)[0] == 3
+
+
+def test_decide_holds_when_nobody_queued():
+    stage = limiter()
+    assert stage._decide([(1.0, True)] * 4, saturated=False) == (2, "")
+
+
+def test_decide_halves_on_errors_latency_and_host_load():
+    assert limiter(initial=4)._decide([(1.0, False)] * 2 + [(1.0, True)] * 2, True)[0] == 2
+    assert limiter(initial=4, load_probe=lambda: {"cpu": 0.95, "memory": 0.1})._decide([(1.0, True)] * 4, True)[0] == 2
+
+    stage = limiter(initial=4)
+    stage._decide([(1.0, True)] * 4, False)  # learn a 1s baseline
+    new, reason = stage._decide([(3.0, True)] * 4, True)
+    assert new == 2 and "latency" in reason
+
+
+def test_decide_never_leaves_its_bounds():
+    assert limiter(initial=1)._decide([(1.0, False)] * 4, True)[0] == 1
+    assert limiter(initial=4)._decide([(1.0, True)] * 4, True)[0] == 4
+
+
+def test_reaching_the_limit_without_waiting_is_not_saturation():
+    stage = limiter(initial=1, window=1)
+    for _ in range(5):
+        stage.call(lambda: None)  # one call at a time: never queues
+    assert stage.limit == 1
+
+
+def test_slot_wait_times_out():
+    stage = limiter(initial=1)
+    with stage.slot():
+        with pytest.raises(TimeoutError):
+            with stage.slot(timeout=0.05):
+                pass
+    assert stage.in_flight == 0
+
+
+class FakeBrowser:
+    alive = 0
+    most_alive = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with FakeBrowser.lock:
+            FakeBrowser.alive += 1
+            FakeBrowser.most_alive = max(FakeBrowser.most_alive, FakeBrowser.alive)
+
+    def fetch_page_source(self, url):
+        time.sleep(0.01)
+        return url, "<html></html>"
+
+    def close(self):
+        with FakeBrowser.lock:
+            FakeBrowser.alive -= 1
+
+
+def test_browser_pool_never_runs_more_browsers_than_the_fetch_limit():
+    stage = limiter(initial=2, ceiling=2)
+    pool = BrowserPool(FakeBrowser, stage)
+    threads = [threading.Thread(target=lambda: [pool.fetch_page_source("https://example.com") for _ in range(5)])
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert FakeBrowser.most_alive <= 2
+    pool.close()
+    assert FakeBrowser.alive == 0
@@ -0,0 +1,27 @@
+from company_budget import CompanyBudget
+
+
+class Config:
+    def __init__(self, **values):
+        self.values = values
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def test_bulk_budget_uses_the_company_deadline():
+    budget = CompanyBudget.from_config(Config(), "Acme")
+    assert budget.deadline_seconds == 180
+    assert budget.timeout(300) <= 180
+
+
+def test_single_company_lookup_keeps_the_full_model_timeout():
+    budget = CompanyBudget.from_config(Config(company_deadline_seconds=180), "Acme", interactive=True)
+    assert budget.deadline_seconds is None
+    assert budget.timeout(300) == 300
+    assert budget.max_pages == 8 and budget.max_llm_calls == 2
+
+
+def test_single_company_deadline_can_be_configured():
+    budget = CompanyBudget.from_config(Config(interactive_deadline_seconds=600), "Acme", interactive=True)
+    assert budget.deadline_seconds == 600
@@ -0,0 +1,62 @@
+from contact_page_discovery import ContactPageDiscovery
+from http_client import StreamedResponse
+from resilience import ResilienceLayer
+from web_scraper import WebScraper
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://ex.com/</loc></url>
+  <url><loc>https://ex.com/contact-us</loc></url>
+  <url><loc>https://ex.com/blog/first-post</loc></url>
+</urlset>
+"""
+
+
+class StubClient:
+    """Serves fixed bodies in place of HttpClient, honouring the allowed(content_type) check"""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def stream_get(self, url, max_bytes, timeout=None, allowed=None):
+        content_type, body = self.pages[url]
+        if allowed is not None and not allowed(content_type):
+            body = ""
+        return StreamedResponse(url, 200, {"Content-Type": content_type}, body.encode("utf-8"), False, "HTTP/1.1")
+
+
+class AllowAll:
+    client = None
+
+    def allowed(self, url):
+        return True
+
+    def crawl_delay_for_host(self, host):
+        return None
+
+
+def make_scraper(pages):
+    return WebScraper(
+        delay=0,
+        client=StubClient(pages),
+        resilience=ResilienceLayer(max_attempts=1, base_delay=0),
+        robots=AllowAll()
+    )
+
+
+def test_fetch_text_keeps_xml_that_fetch_html_skips():
+    scraper = make_scraper({"https://ex.com/sitemap.xml": ("application/xml", SITEMAP)})
+
+    assert scraper.fetch_html("https://ex.com/sitemap.xml") == ("https://ex.com/sitemap.xml", "")
+    final_url, text = scraper.fetch_text("https://ex.com/sitemap.xml")
+    assert final_url == "https://ex.com/sitemap.xml"
+    assert "<loc>https://ex.com/contact-us</loc>" in text
+
+
+def test_sitemap_served_as_xml_yields_contact_candidates(tmp_path):
+    scraper = make_scraper({
+        "https://ex.com/sitemap.xml": ("application/xml; charset=utf-8", SITEMAP)
+    })
+    discovery = ContactPageDiscovery(scraper, stats_path=str(tmp_path / "stats.json"))
+
+    assert discovery._sitemap_candidates("https://ex.com") == ["https://ex.com/contact-us"]
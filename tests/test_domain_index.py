@@ -0,0 +1,40 @@
+import pytest
+
+from domain_index import DomainIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DomainIndex(path=str(tmp_path / "domain_index.json"), min_confidence=0.9)
+    index.record("Bolton Council", "https://www.bolton.gov.uk/contact")
+    index.record("St Mary's Primary School", "https://stmarys.example.sch.uk")
+    return index
+
+
+def test_exact_normalised_match_resolves(index):
+    assert index.resolve("bolton council") == "https://www.bolton.gov.uk"
+    assert index.lookup("The Bolton Council")[1] == 1.0
+
+
+@pytest.mark.parametrize("name", ["Boston Council", "St Mark's Primary School"])
+def test_similar_name_does_not_resolve(index, name):
+    entry, confidence = index.lookup(name)
+    assert entry is not None and confidence < 1.0
+    assert index.resolve(name) is None
+
+
+def test_similar_name_is_only_a_hint(index):
+    assert index.hint("Boston Council") == "https://www.bolton.gov.uk"
+    assert index.hint("Bolton Council") is None  # exact matches resolve instead
+    assert index.hint("Wigan Youth Zone") is None
+
+
+def test_directory_sites_are_not_recorded(index):
+    assert not index.record("Wigan Youth Zone", "https://www.yell.com/biz/wigan-youth-zone-123")
+    assert not index.record("Wigan Youth Zone", "https://uk.trustpilot.com/review/wiganyouthzone.org")
+    assert index.resolve("Wigan Youth Zone") is None
+
+
+def test_index_is_persisted(index):
+    reloaded = DomainIndex(path=index.path)
+    assert reloaded.resolve("Bolton Council") == "https://www.bolton.gov.uk"
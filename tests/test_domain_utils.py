@@ -0,0 +1,48 @@
+import pytest
+
+from domain_utils import DomainSet, PublicSuffixList, canonicalize_url, registrable_domain, site_root
+
+
+@pytest.mark.parametrize("host, domain", [
+    ("www.example.co.uk", "example.co.uk"),
+    ("shop.example.com", "example.com"),
+    ("a.co.uk", "a.co.uk"),
+    ("www.bolton.gov.uk", "bolton.gov.uk"),
+    ("myname.github.io", "myname.github.io"),
+    ("co.uk", "co.uk"),
+    ("192.168.0.1", "192.168.0.1"),
+])
+def test_registrable_domain_with_builtin_suffixes(host, domain):
+    assert PublicSuffixList().registrable_domain(host) == domain
+
+
+def test_sites_under_the_same_multi_label_suffix_are_different():
+    assert registrable_domain("https://a.co.uk/contact") != registrable_domain("https://b.co.uk/contact")
+
+
+def test_wildcard_and_exception_rules():
+    psl = PublicSuffixList(rules=["ck", "*.ck", "!www.ck"])
+    assert psl.registrable_domain("shop.example.ck") == "shop.example.ck"
+    assert psl.registrable_domain("www.ck") == "www.ck"
+    assert psl.public_suffix("a.www.ck") == "ck"
+
+
+@pytest.mark.parametrize("url, canonical", [
+    ("HTTPS://WWW.Example.com:443/Contact/", "https://example.com/Contact"),
+    ("https://example.com/contact?utm_source=x&b=2&a=1#map", "https://example.com/contact?a=1&b=2"),
+    ("https://example.com/?gclid=abc", "https://example.com"),
+    ("http://example.com:8080/", "http://example.com:8080"),
+])
+def test_canonicalize_url(url, canonical):
+    assert canonicalize_url(url) == canonical
+
+
+def test_site_root():
+    assert site_root("https://WWW.Example.com/contact?x=1") == "https://www.example.com"
+    assert site_root("example.com/contact") == ""
+
+
+def test_domain_set_matches_subdomains_only():
+    directories = DomainSet(["yell.com"])
+    assert "https://www.yell.com/biz/123" in directories
+    assert "https://notyell.com/" not in directories
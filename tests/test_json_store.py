@@ -0,0 +1,46 @@
+import json
+
+from domain_index import DomainIndex
+from json_store import load_json, update_json
+from negative_cache import NegativeCache
+from result_ranker import ResultRanker
+
+
+def test_update_merges_with_what_is_on_disk(tmp_path):
+    path = str(tmp_path / "store.json")
+    update_json(path, lambda current: dict(current or {}, a=1))
+    update_json(path, lambda current: dict(current or {}, b=2))
+    assert load_json(path) == {"a": 1, "b": 2}
+
+
+def test_corrupt_file_is_kept_aside(tmp_path):
+    path = tmp_path / "store.json"
+    path.write_text('{"a": 1')
+    assert update_json(str(path), lambda current: {"recovered": current is None}) == {"recovered": True}
+    assert (tmp_path / "store.json.corrupt").read_text() == '{"a": 1'
+
+
+def test_two_domain_indexes_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "domain_index.json")
+    first, second = DomainIndex(path=path), DomainIndex(path=path)
+    first.record("Bolton Council", "https://www.bolton.gov.uk")
+    second.record("Wigan Youth Zone", "https://www.wiganyouthzone.org")
+    assert set(json.loads(open(path).read())) == {"bolton council", "wigan youth zone"}
+    assert second.resolve("Bolton Council") == "https://www.bolton.gov.uk"
+
+
+def test_two_negative_caches_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "negative_cache.json")
+    first, second = NegativeCache(path=path), NegativeCache(path=path)
+    first.record_empty_search("bolton council contact")
+    second.record_fetch_error("https://dead.example.com/", "getaddrinfo failed")
+    assert NegativeCache(path=path).check_query("bolton council contact") == "empty_serp"
+    assert NegativeCache(path=path).check_url("https://dead.example.com/contact") == "dns"
+
+
+def test_two_rankers_sharing_a_file_add_up_their_outcomes(tmp_path):
+    path = str(tmp_path / "ranker.json")
+    first, second = ResultRanker(stats_path=path), ResultRanker(stats_path=path)
+    first.record_outcome("https://www.bolton.gov.uk/contact", "Bolton Council", True)
+    second.record_outcome("https://www.bolton.gov.uk/contact", "Bolton Council", False)
+    assert ResultRanker(stats_path=path).stats["domains"]["bolton.gov.uk"] == {"hits": 1, "tries": 2}
@@ -0,0 +1,39 @@
+import pytest
+
+from name_matching import group_duplicate_names, name_key, normalize_name
+
+
+def test_normalize_name_drops_case_punctuation_and_legal_suffixes():
+    assert normalize_name("The Wigan Youth Zone Ltd.") == "wigan youth zone"
+    assert normalize_name("Smith & Jones Limited") == "smith and jones"
+    assert normalize_name("J. Smith & Co.") == "j smith and"
+
+
+def test_hyphenated_words_keep_their_legal_suffix_lookalikes():
+    assert normalize_name("Co-op Funeralcare") == "co op funeralcare"
+    assert group_duplicate_names(["Co-op Funeralcare", "Op Funeralcare", "Funeralcare Co"]) == [[0], [1], [2]]
+
+
+def test_name_key_ignores_word_order_and_legal_suffixes():
+    assert name_key("Wigan Youth Zone Ltd") == name_key("The Wigan Youth Zone")
+    assert name_key("Smith & Jones") == name_key("Jones and Smith Ltd")
+
+
+@pytest.mark.parametrize("a, b", [
+    ("St Mary's Primary School", "St Mark's Primary School"),
+    ("Bolton Council", "Boston Council"),
+    ("Oldham Athletic", "Oldham Athletics"),
+    ("Unit 1 Gym", "Unit 2 Gym"),
+    ("Wigan Youth Zone", "Wigan Youth Zone Trust"),
+])
+def test_different_organisations_are_not_grouped(a, b):
+    assert group_duplicate_names([a, b]) == [[0], [1]]
+
+
+def test_same_organisation_is_grouped_in_input_order():
+    names = ["Wigan Youth Zone", "Bolton Council", "wigan youth zone ltd", "The Wigan Youth Zone", "Boston Council"]
+    assert group_duplicate_names(names) == [[0, 2, 3], [1], [4]]
+
+
+def test_names_that_normalise_to_nothing_stay_separate():
+    assert group_duplicate_names(["Ltd", "The"]) == [[0], [1]]
@@ -0,0 +1,36 @@
+import pytest
+
+from negative_cache import NegativeCache, classify_failure, is_site_root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return NegativeCache(path=str(tmp_path / "negative_cache.json"))
+
+
+@pytest.mark.parametrize("url", ["https://example.com", "https://example.com/", "https://www.example.co.uk/index.php"])
+def test_homepages_are_never_cached_as_having_no_contacts(cache, url):
+    assert is_site_root(url)
+    cache.record_no_contacts(url)
+    assert cache.check_url(url) is None
+
+
+def test_inner_pages_without_contacts_are_cached(cache):
+    cache.record_no_contacts("https://example.com/news/2024")
+    assert cache.check_url("https://example.com/news/2024") == "no_contacts"
+    assert cache.check_url("https://example.com/contact") is None
+
+
+def test_dns_failures_condemn_the_whole_host(cache):
+    cache.record_fetch_error("https://dead.example.com/about", "getaddrinfo failed")
+    assert cache.check_url("https://dead.example.com/") == "dns"
+
+
+@pytest.mark.parametrize("error, failure", [
+    ("HTTPSConnectionPool: Read timed out", "timeout"),
+    ("404 Client Error: Not Found for url", "http_4xx"),
+    ("503 Server Error", "http_5xx"),
+    ("Connection reset by peer", None),
+])
+def test_classify_failure(error, failure):
+    assert classify_failure(error) == failure
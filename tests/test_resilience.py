@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from resilience import CircuitOpenError, ResilienceLayer
+
+
+class TimeoutException(Exception):
+    """Stand-in for selenium.common.exceptions.TimeoutException"""
+
+
+TimeoutException.__module__ = "selenium.common.exceptions"
+
+
+class ReadTimeout(Exception):
+    """Stand-in for an HTTP client's read timeout"""
+
+
+def failing(error):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise error
+
+    return fn, calls
+
+
+def test_browser_timeout_is_not_retried_but_counts_towards_the_breaker():
+    layer = ResilienceLayer(max_attempts=3, base_delay=0, failure_threshold=2)
+    fn, calls = failing(TimeoutException("Timed out receiving message from renderer: 20.000"))
+
+    with pytest.raises(TimeoutException):
+        layer.call("https://dead.example.com/", fn)
+    assert len(calls) == 1
+
+    with pytest.raises(TimeoutException):
+        layer.call("https://dead.example.com/contact", fn)
+    with pytest.raises(CircuitOpenError):
+        layer.call("https://dead.example.com/about", fn)
+    assert len(calls) == 2
+
+
+def test_http_timeout_is_retried():
+    layer = ResilienceLayer(max_attempts=3, base_delay=0, failure_threshold=5)
+    fn, calls = failing(ReadTimeout("read timed out"))
+    with pytest.raises(ReadTimeout):
+        layer.call("https://slow.example.com/", fn)
+    assert len(calls) == 3
+
+
+def test_async_calls_share_retries_and_breakers():
+    layer = ResilienceLayer(max_attempts=3, base_delay=0, failure_threshold=3)
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        raise ReadTimeout("read timed out")
+
+    with pytest.raises(ReadTimeout):
+        asyncio.run(layer.call_async("https://slow.example.com/", attempt))
+    assert len(calls) == 3
+    assert layer.metrics()["retries"] == 2
+
+    # The async failures opened the same breaker the synchronous tier uses
+    fn, sync_calls = failing(ReadTimeout("read timed out"))
+    with pytest.raises(CircuitOpenError):
+        layer.call("https://slow.example.com/contact", fn)
+    assert sync_calls == []
+
+
+def test_cancelled_async_trial_frees_the_half_open_breaker():
+    layer = ResilienceLayer(max_attempts=1, base_delay=0, failure_threshold=1, reset_timeout=0)
+    fn, _ = failing(ReadTimeout("read timed out"))
+    with pytest.raises(ReadTimeout):
+        layer.call("https://flaky.example.com/", fn)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def cancelled_trial():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(layer.call_async("https://flaky.example.com/", hang), 0.01)
+
+    asyncio.run(cancelled_trial())
+
+    # Another trial is let through rather than short-circuited forever
+    assert layer.call("https://flaky.example.com/", lambda: "ok") == "ok"
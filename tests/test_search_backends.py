@@ -0,0 +1,34 @@
+from search_backends import BingBackend, DuckDuckGoBackend, SearchManager
+
+
+def unreachable(url):
+    raise ConnectionError("Name or service not known")
+
+
+def no_results(url):
+    return url, "<html><body><p>No results found</p></body></html>"
+
+
+def test_every_backend_erroring_is_an_error_not_an_empty_search():
+    manager = SearchManager([BingBackend(unreachable), DuckDuckGoBackend(lambda url: (url, ""))])
+
+    search = manager.search_detailed("Acme Plumbing Leeds")
+
+    assert search["status"] == "error"
+    assert search["urls"] == []
+    assert [response["status"] for response in search["responses"]] == ["error", "error"]
+
+
+def test_fan_out_with_every_backend_erroring_is_an_error():
+    manager = SearchManager([BingBackend(unreachable), DuckDuckGoBackend(unreachable)], mode="fanout")
+
+    assert manager.search_detailed("Acme Plumbing Leeds")["status"] == "error"
+
+
+def test_a_backend_answering_with_no_results_is_an_empty_search():
+    manager = SearchManager([BingBackend(unreachable), DuckDuckGoBackend(no_results)])
+
+    search = manager.search_detailed("Acme Plumbing Leeds")
+
+    assert search["status"] == "ok"
+    assert search["urls"] == []
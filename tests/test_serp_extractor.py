@@ -0,0 +1,67 @@
+from serp_extractor import extract_serp_candidate, is_serp_complete
+
+
+def google_page(results, panel=""):
+    blocks = "".join(
+        f'<div class="g"><a href="{url}">{title}</a><div class="VwiC3b">{snippet}</div></div>'
+        for url, title, snippet in results
+    )
+    return {"backend": "google", "html": f"<html><body>{panel}{blocks}</body></html>"}
+
+
+PANEL = (
+    '<div data-attrid="title">Bolton Council</div>'
+    '<div data-attrid="kc:/location/location:address">Address: Town Hall, Victoria Square, Bolton BL1 1RU</div>'
+    '<div data-attrid="kc:/local:phone">01204 333333</div>'
+    '<div data-attrid="visit_official_site"><a href="https://www.bolton.gov.uk/contact">Website</a></div>'
+)
+
+
+def test_panel_candidate_is_complete():
+    candidate = extract_serp_candidate([google_page([], PANEL)], "Bolton Council")
+    assert candidate["phones"] == [{"number": "01204 333333", "description": "Main"}]
+    assert candidate["website"] == "https://www.bolton.gov.uk"
+    assert candidate["verified_website"]
+    assert is_serp_complete(candidate)
+
+
+def test_generic_word_alone_does_not_count_as_a_mention():
+    page = google_page([(
+        "https://www.boston.gov.uk/contact",
+        "Contact Boston Borough Council",
+        "Call the council on 01205 314200. Municipal Buildings, West Street, Boston PE21 8QR",
+    )])
+    candidate = extract_serp_candidate([page], "Bolton Council")
+    assert candidate["phones"] == []
+    assert candidate["address"] == ""
+
+
+def test_snippet_mentioning_every_distinctive_word_is_used():
+    page = google_page([(
+        "https://www.stmarys.example.sch.uk/contact",
+        "Contact - St Mary’s Primary School",
+        "Call St Mary's on 01942 111222. Church Lane, Wigan WN1 2AB",
+    )])
+    assert extract_serp_candidate([page], "St Mary's Primary School")["phones"][0]["number"] == "01942 111222"
+    assert extract_serp_candidate([page], "St Mark's Primary School")["phones"] == []
+
+
+def test_panel_about_another_business_is_ignored():
+    candidate = extract_serp_candidate([google_page([], PANEL)], "Boston Council")
+    assert candidate["phones"] == [] and candidate["address"] == "" and not candidate["verified_website"]
+
+
+def test_result_website_is_unverified_and_never_a_directory():
+    page = google_page([
+        ("https://www.yell.com/biz/wigan-youth-zone-123", "Wigan Youth Zone - Yell",
+         "Wigan Youth Zone, Parsons Walk, Wigan WN1 1RU. Call 01942 824030"),
+        ("https://www.wiganyouthzone.org/about", "About Wigan Youth Zone", "Open to young people aged 8-19"),
+    ])
+    candidate = extract_serp_candidate([page], "Wigan Youth Zone", [
+        "https://www.yell.com/biz/wigan-youth-zone-123", "https://www.wiganyouthzone.org/about"
+    ])
+    assert candidate["phones"] and candidate["address"]
+    assert candidate["website"] == "https://www.wiganyouthzone.org"
+    assert not candidate["verified_website"]
+    assert not is_serp_complete(candidate)
+    assert is_serp_complete(candidate, ("phones", "address"))
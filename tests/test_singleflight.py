@@ -0,0 +1,43 @@
+import threading
+import time
+
+from singleflight import SingleFlight
+
+
+def test_joined_callers_get_their_own_copy_of_the_result():
+    flight = SingleFlight("fetch")
+    started = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return {"url": "https://ex.com/", "content": "Call us", "phones": ["0113 496 0000"]}
+
+    def leader():
+        results["leader"] = flight.do("https://ex.com/", fetch)
+        # Modified in place straight away, as the crawl and bulk code do
+        results["leader"]["phones"].append("leader's number")
+
+    def follower(name):
+        results[name] = flight.do("https://ex.com/", fetch)
+
+    threads = [threading.Thread(target=leader)]
+    threads[0].start()
+    assert started.wait(5)
+    threads += [threading.Thread(target=follower, args=(name,)) for name in ("a", "b")]
+    for thread in threads[1:]:
+        thread.start()
+    while flight.stats()["shared"] < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert flight.stats() == {"executed": 1, "shared": 2, "in_flight": 0}
+    results["a"]["phones"].append("a's number")
+    assert results["b"]["phones"] == ["0113 496 0000"]
+    assert results["leader"]["phones"] == ["0113 496 0000", "leader's number"]
+    assert results["a"] is not results["b"] is not results["leader"]
+